@@ -11,9 +11,11 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 import pymysql
+from django.core.exceptions import ImproperlyConfigured
 
 pymysql.install_as_MySQLdb()
 
@@ -58,12 +60,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
 ]
 
 CORS_ORIGIN_ALLOW_ALL = True
@@ -91,18 +95,108 @@ WSGI_APPLICATION = "app.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
+# DB_POOL=1이면 process의 thread들이 connection pool을 공유 (core.db.backends.mysql),
+# 요청이 끝나면 pool에 반납하도록 CONN_MAX_AGE=0. 최대 connection 수는 worker 수 * DB_POOL_SIZE.
+# 아니면 thread별 connection을 DB_CONN_MAX_AGE초 동안 유지하고 재사용 전에 health check.
+
+DB_POOL = os.getenv("DB_POOL") == "1"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": "core.db.backends.mysql" if DB_POOL else "django.db.backends.mysql",
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASS"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE") or 60),
+        "CONN_HEALTH_CHECKS": (os.getenv("DB_CONN_HEALTH_CHECKS") or "1") == "1",
+        "POOL": {
+            "SIZE": int(os.getenv("DB_POOL_SIZE") or 10),
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT") or 10),
+            "MAX_AGE": int(os.getenv("DB_POOL_MAX_AGE") or 60 * 30),
+            "HEALTH_CHECK": (os.getenv("DB_CONN_HEALTH_CHECKS") or "1") == "1",
+        },
     }
 }
 
+# read replica: DB_REPLICA_HOSTS=host1,host2이면 replica_0, replica_1 alias 추가 (core.db.routers)
+# 안전한 method의 요청은 replica에서 읽고, 쓰기 후 DB_REPLICA_PIN_SECONDS 동안은 primary에서 읽는다.
+# 테스트에서는 replica가 primary test DB를 그대로 사용 (MIRROR)
+
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(filter(None, (os.getenv("DB_REPLICA_HOSTS") or "").split(","))):
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{_index}")
+
+# sharding: DB_SHARD_HOSTS=host1,host2이면 shard_0, shard_1 alias를 추가하고 camping/recipe data를
+# user별로 나눠 저장 (core.sharding). shard를 추가/제거한 뒤에는 move_user_shard로 data를 옮긴다.
+# 여러 shard의 id가 겹치지 않도록 shard마다 auto_increment_offset을 다르게 설정해야 한다.
+
+DATABASE_SHARDS = []
+for _index, _host in enumerate(filter(None, (os.getenv("DB_SHARD_HOSTS") or "").split(","))):
+    DATABASES[f"shard_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_SHARDS.append(f"shard_{_index}")
+
+SHARD_CACHE_TIMEOUT = 60 * 5
+
+DATABASE_ROUTERS = ["core.db.routers.ShardRouter", "core.db.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS") or 5)
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# list 응답 cache의 generation과 shard mapping을 worker간 공유해야 하므로 운영(SERVER_MODE=prod)이나
+# replica/shard를 쓰는 구성에서는 LocMemCache로 기동하지 않는다 (docker-compose의 redis 사용).
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND") or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith(".LocMemCache") and (
+    os.getenv("SERVER_MODE") == "prod" or DATABASE_REPLICAS or DATABASE_SHARDS
+):
+    raise ImproperlyConfigured(
+        "LocMemCache is per process; set CACHE_BACKEND/CACHE_LOCATION to a shared cache "
+        "(e.g. django.core.cache.backends.redis.RedisCache, redis://redis:6379/0)"
+    )
+
+# list action을 values() 기반으로 serialize (core.mixins.FastListMixin)
+API_FAST_LIST = (os.getenv("API_FAST_LIST") or "1") == "1"
+
+# 검색 (core.search): "index"는 SearchTerm inverted index, "fulltext"는 MySQL FULLTEXT(ngram) index
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND") or "index"
+
+# list 응답 cache (core.cache)
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 300))
+
+# 응답 압축 (core.middleware.CompressionMiddleware): COMPRESSION_MIN_SIZE byte 미만은 압축하지 않음
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE") or 1024)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+# token 만료 (core.tokens): 마지막 사용 후 AUTH_TOKEN_TTL초가 지나면 만료, 0이면 만료 없음
+AUTH_TOKEN_TTL = int(os.getenv("AUTH_TOKEN_TTL", 60 * 60 * 24 * 14))
+AUTH_TOKEN_TOUCH_INTERVAL = int(os.getenv("AUTH_TOKEN_TOUCH_INTERVAL", 60 * 5))
+
+# token 인증 cache (core.authentication.CachedTokenAuthentication)
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 30))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+
+# tag autocomplete prefix index (core.autocomplete): process local, TTL초 후 DB에서 다시 만든다
+TAG_AUTOCOMPLETE_TTL = int(os.getenv("TAG_AUTOCOMPLETE_TTL", 60))
+TAG_AUTOCOMPLETE_SIZE = int(os.getenv("TAG_AUTOCOMPLETE_SIZE", 1000))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -148,6 +242,21 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson이 없으면 DRF JSONRenderer/JSONParser와 같이 동작 (core.renderers)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# msgpack이 설치되어 있으면 application/msgpack 요청/응답 지원
+if find_spec("msgpack"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].insert(1, "core.renderers.MessagePackRenderer")
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].insert(1, "core.renderers.MessagePackParser")
+
 AUTH_USER_MODEL = "core.User"
@@ -7,6 +7,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from core.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
@@ -14,6 +16,7 @@ urlpatterns = [
     path('camping/', include('camping.urls')),
     path('user/', include('user.urls')),
     path('recipe/', include('recipe.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
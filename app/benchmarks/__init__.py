@@ -0,0 +1,5 @@
+"""
+Local benchmarks
+
+app 디렉토리에서 module로 실행한다. e.g. ``python -m benchmarks.load --help``
+"""
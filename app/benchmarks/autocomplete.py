@@ -0,0 +1,105 @@
+"""
+tag autocomplete benchmark (core.autocomplete prefix index vs DB istartswith + COUNT)
+
+    python -m benchmarks.autocomplete --tags 1000 5000
+
+임시 SQLite DB에 user마다 tag를 tags개, camping을 tag 수의 4배 만들고 camping마다 tag 3개를
+사용 횟수가 치우치도록 붙인다 (usage_count는 repair_tag_counts로 계산). 길이가 다른 prefix로
+상위 10개를 조회하여 prefix index와 name__istartswith + Count 정렬 query의 시간을 비교하고,
+결과가 같은지도 확인한다.
+"""
+import argparse
+import io
+import os
+import random
+import string
+import tempfile
+import time
+
+from benchmarks.fastpath import setup
+
+
+def populate(user, tags, generator):
+    from django.core.management import call_command
+
+    from core.models import Camping, CampingTag
+
+    names = set()
+    while len(names) < tags:
+        names.add("".join(generator.choices(string.ascii_lowercase[:12], k=generator.randint(4, 10))))
+    objs = CampingTag.objects.bulk_create([CampingTag(user=user, name=name) for name in sorted(names)])
+    campings = Camping.objects.bulk_create(
+        [
+            Camping(user=user, title=f"Camping {index}", visited_dt="2022-12-03", review="review", price=index)
+            for index in range(tags * 4)
+        ],
+        batch_size=1000,
+    )
+    through = Camping.camping_tags.through
+    weights = [1 / (rank + 1) for rank in range(len(objs))]
+    links = []
+    for camping in campings:
+        for tag in set(generator.choices(objs, weights=weights, k=3)):
+            links.append(through(camping_id=camping.id, campingtag_id=tag.id))
+    through.objects.bulk_create(links, batch_size=5000)
+    call_command("repair_tag_counts", stdout=io.StringIO())
+    return sorted(names)
+
+
+def query(user, prefix, limit):
+    from django.db.models import Count
+
+    from core.models import CampingTag
+
+    tags = (
+        CampingTag.objects.filter(user=user, name__istartswith=prefix)
+        .order_by()
+        .annotate(linked=Count("camping"))
+        .order_by("-linked", "name", "id")
+        .values_list("id", "name", "linked")
+    )
+    return list(tags[:limit])
+
+
+def timeit(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tags", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        from core.autocomplete import build_index
+        from core.models import CampingTag
+        from utils.functools import create_user
+
+        generator = random.Random(0)
+        for index, tags in enumerate(args.tags):
+            user = create_user(email=f"bench{index}@example.com")
+            names = populate(user, tags, generator)
+
+            started = time.perf_counter()
+            prefix_index = build_index(CampingTag, user.pk)
+            print(f"{tags:>6} tags  build {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+            sample = names[len(names) // 2]
+            for prefix in ("", sample[:1], sample[:2], sample[:3]):
+                elapsed, found = timeit(lambda: prefix_index.search(prefix, args.limit), args.repeat)
+                db_elapsed, expected = timeit(lambda: query(user, prefix, args.limit), max(args.repeat // 20, 1))
+                assert found == expected, prefix
+                print(
+                    f"{tags:>6} tags  prefix {prefix!r:<6} index {elapsed * 1e6:8.1f} us"
+                    f"  query {db_elapsed * 1000:8.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+DB connection reuse benchmark
+
+    python -m benchmarks.db_pool --threads 8 --requests 500 --connect-latency 5
+
+SQLite file을 MySQL 대신 사용하고, --connect-latency로 TCP/인증 handshake 시간을 흉내낸다.
+thread마다 "요청"(query 몇 개 실행 후 request_finished 처리)을 반복하면서
+매 요청마다 연결(CONN_MAX_AGE=0), thread별 persistent 연결(CONN_MAX_AGE>0), pool 공유를 비교한다.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import django
+from django.conf import settings
+
+MODES = {
+    "per-request": {"ENGINE": "django.db.backends.sqlite3", "CONN_MAX_AGE": 0},
+    "persistent": {"ENGINE": "django.db.backends.sqlite3", "CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+    "pooled": {"ENGINE": "core.db.backends.sqlite3", "CONN_MAX_AGE": 0},
+}
+
+
+def setup(name, pool_size):
+    databases = {
+        alias: {**options, "NAME": name, "POOL": {"SIZE": pool_size, "TIMEOUT": 30}}
+        for alias, options in MODES.items()
+    }
+    settings.configure(DATABASES={"default": databases["per-request"], **databases}, INSTALLED_APPS=[])
+    django.setup()
+
+
+def slow_connect(latency):
+    """connection 생성마다 latency초 지연 (network handshake 흉내)"""
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    original = DatabaseWrapper.get_new_connection
+    connects = [0]
+    lock = threading.Lock()
+
+    def get_new_connection(self, conn_params):
+        with lock:
+            connects[0] += 1
+        time.sleep(latency)
+        return original(self, conn_params)
+
+    DatabaseWrapper.get_new_connection = get_new_connection
+    return connects
+
+
+def worker(alias, requests, queries):
+    from django.db import connections
+
+    conn = connections[alias]
+    for _ in range(requests):
+        with conn.cursor() as cursor:
+            for _ in range(queries):
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+        # django.db.close_old_connections (request_finished)와 같은 처리
+        conn.close_if_unusable_or_obsolete()
+    conn.close()
+
+
+def run(alias, threads, requests, queries, connects):
+    before = connects[0]
+    workers = [threading.Thread(target=worker, args=(alias, requests, queries)) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    total = threads * requests
+    print(
+        f"{alias:<12} {total / elapsed:>9.0f} req/s  {elapsed * 1000 / total:>7.2f} ms/req"
+        f"  connects={connects[0] - before}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="thread당 요청 수")
+    parser.add_argument("--queries", type=int, default=3, help="요청당 query 수")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--connect-latency", type=float, default=5.0, help="connection 생성 지연 (ms)")
+    args = parser.parse_args()
+
+    fd, name = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    try:
+        setup(name, args.pool_size)
+        connects = slow_connect(args.connect_latency / 1000)
+        for alias in MODES:
+            run(alias, args.threads, args.requests, args.queries, connects)
+
+        from core.db import pool
+
+        for key, value in sorted(pool.stats().items()):
+            print(f"{key} = {value}")
+    finally:
+        os.remove(name)
+
+
+if __name__ == "__main__":
+    main()
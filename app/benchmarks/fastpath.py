@@ -0,0 +1,113 @@
+"""
+list serialization benchmark (ModelSerializer vs core.fastpath.ValuesSerializer)
+
+    python -m benchmarks.fastpath --rows 1000 10000 100000
+
+임시 SQLite DB에 camping을 rows개(각각 tag 2개) 만들고, list API와 같은 queryset을
+page 단위로 나누어 CampingSerializer(prefetch_related) 와 values() fast path로 serialize하여
+시간을 비교한다. 두 결과가 같은지도 확인한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def setup(name):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    import django
+    from django.conf import settings
+
+    settings.DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": name}}
+    settings.DATABASE_SHARDS = []
+    settings.DATABASE_REPLICAS = []
+    settings.MIGRATION_MODULES = {
+        app: None for app in ("core", "authtoken", "admin", "auth", "contenttypes", "sessions")
+    }
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def populate(user, rows):
+    from core.models import Camping, CampingTag
+
+    tags = CampingTag.objects.bulk_create([CampingTag(user=user, name=f"tag {index}") for index in range(50)])
+    Camping.objects.bulk_create(
+        [
+            Camping(user=user, title=f"Camping {index}", visited_dt="2022-12-03", review="review " * 20, price=index)
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+    through = Camping.camping_tags.through
+    links = [
+        through(camping_id=camping_id, campingtag_id=tags[(camping_id + offset) % len(tags)].id)
+        for camping_id in Camping.objects.values_list("id", flat=True)
+        for offset in (0, 7)
+    ]
+    through.objects.bulk_create(links, batch_size=1000)
+
+
+def pages(queryset, page_size):
+    """keyset pagination처럼 id 범위로 page를 나눈다"""
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(id__lt=last)
+        yield page[:page_size]
+        ids = list(page.values_list("id", flat=True)[page_size - 1:page_size])
+        if not ids:
+            return
+        last = ids[0]
+
+
+def run_serializer(queryset, page_size):
+    from camping.serializers import CampingSerializer
+
+    data = []
+    for page in pages(queryset.prefetch_related("camping_tags"), page_size):
+        data.extend(CampingSerializer(page, many=True).data)
+    return data
+
+
+def run_fastpath(queryset, page_size):
+    from camping.serializers import CampingSerializer
+    from core.fastpath import ValuesSerializer
+
+    builder = ValuesSerializer(CampingSerializer())
+    data = []
+    for page in pages(queryset, page_size):
+        data.extend(builder.serialize(builder.values(page)))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        from core.models import Camping
+        from utils.functools import create_user
+
+        for index, rows in enumerate(args.rows):
+            Camping.objects.all().delete()
+            user = create_user(email=f"bench{index}@example.com")
+            populate(user, rows)
+            queryset = Camping.objects.filter(user=user).order_by("-id")
+
+            results = {}
+            for label, func in (("serializer", run_serializer), ("fastpath", run_fastpath)):
+                started = time.perf_counter()
+                results[label] = func(queryset, args.page_size)
+                elapsed = time.perf_counter() - started
+                print(f"{rows:>7} rows  {label:<10} {elapsed * 1000:9.1f} ms  {rows / elapsed:>9.0f} rows/s")
+            assert results["serializer"] == results["fastpath"], "fast path output differs"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+NDJSON/CSV import benchmark
+
+    python -m benchmarks.importer --rows 100000
+
+임시 SQLite DB에 camping rows개(각각 tag 2개, 전체 tag 50종)를 NDJSON, CSV 파일에서 core.importer.Importer로
+import하고 rows/s를 출력한다. 비교를 위해 --naive-rows개는 row마다 CampingDetailSerializer.save()로 저장한다.
+--no-returning은 MySQL처럼 bulk insert 후 pk를 돌려주지 않는 backend의 경로(core.bulk.insert_instances)로 실행한다.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.fastpath import setup
+
+
+def make_items(count):
+    for index in range(count):
+        yield {
+            "title": f"깊은 숲 캠핑장 {index}",
+            "visited_dt": "2022-12-03T10:30:00",
+            "review": "계곡 옆 사이트라 시원하고 조용했어요. " * 2,
+            "price": 50000 + index,
+            "camping_tags": [{"name": f"tag {index % 50}"}, {"name": f"tag {(index + 7) % 50}"}],
+        }
+
+
+def write_files(directory, count):
+    ndjson_path = os.path.join(directory, "campings.ndjson")
+    with open(ndjson_path, "w", encoding="utf-8") as f:
+        for item in make_items(count):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    csv_path = os.path.join(directory, "campings.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "visited_dt", "review", "price", "camping_tags"])
+        for item in make_items(count):
+            tags = "|".join(tag["name"] for tag in item["camping_tags"])
+            writer.writerow([item["title"], item["visited_dt"], item["review"], item["price"], tags])
+    return {"ndjson": ndjson_path, "csv": csv_path}
+
+
+def run_naive(user, count):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from camping.serializers import CampingDetailSerializer
+
+    request = Request(APIRequestFactory().post("/"))
+    request.user = user
+    for item in make_items(count):
+        serializer = CampingDetailSerializer(data=item, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=user)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--naive-rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-returning", action="store_true", help="pretend the backend cannot return bulk pks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        if args.no_returning:
+            from django.db import connection
+
+            mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False).start()
+        from camping.serializers import CampingDetailSerializer
+        from core.importer import Importer
+        from core.models import Camping
+        from utils.functools import create_user
+
+        paths = write_files(directory, args.rows)
+        for index, (import_type, path) in enumerate(paths.items()):
+            user = create_user(email=f"bench{index}@example.com")
+            importer = Importer(CampingDetailSerializer(), "camping_tags", user, batch_size=args.batch_size)
+            started = time.perf_counter()
+            with open(path, "rb") as stream:
+                result = importer.run(stream, import_type)
+            elapsed = time.perf_counter() - started
+            assert result["created"] == args.rows and not result["failed"], result["errors"][:3]
+            assert Camping.objects.filter(user=user).count() == args.rows
+            print(f"importer {import_type:<7} {args.rows:>7} rows  {elapsed:7.2f} s  {args.rows / elapsed:>8.0f} rows/s")
+
+        if args.naive_rows:
+            user = create_user(email="naive@example.com")
+            started = time.perf_counter()
+            run_naive(user, args.naive_rows)
+            elapsed = time.perf_counter() - started
+            print(
+                f"per-row save   {args.naive_rows:>7} rows  {elapsed:7.2f} s  {args.naive_rows / elapsed:>8.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
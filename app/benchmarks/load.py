@@ -0,0 +1,86 @@
+"""
+HTTP load generator for comparing serving setups
+
+    # runserver (SERVER_MODE=dev)와 gunicorn (SERVER_MODE=prod)을 각각 띄운 뒤
+    python -m benchmarks.load http://localhost:8000/camping/campings/ --token <token> -c 32 -d 20
+
+표준 라이브러리만 사용하며 지정한 시간 동안 동시 요청을 보내고 requests/sec와 latency를 출력한다.
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def worker(url, headers, deadline, latencies, errors, lock):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = connection_class(parts.netloc, timeout=30)
+    local_latencies, local_errors = [], 0
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            res = conn.getresponse()
+            res.read()
+            if res.status >= 400:
+                local_errors += 1
+            local_latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            conn.close()
+            conn = connection_class(parts.netloc, timeout=30)
+
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run(url, token=None, concurrency=16, duration=10.0):
+    headers = {"Accept": "application/json", "Connection": "keep-alive"}
+    if token:
+        headers["Authorization"] = f"Token {token}"
+
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(url, headers, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) >= 100 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("--token", help="API token (Authorization: Token ...)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    args = parser.parse_args()
+
+    result = run(args.url, args.token, args.concurrency, args.duration)
+    print(f"{args.url}  concurrency={args.concurrency}  duration={args.duration}s")
+    for key, value in result.items():
+        print(f"  {key:>8}: {value:.2f}" if isinstance(value, float) else f"  {key:>8}: {value}")
+
+
+if __name__ == "__main__":
+    main()
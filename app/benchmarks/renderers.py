@@ -0,0 +1,84 @@
+"""
+JSON renderer/parser benchmark
+
+    python -m benchmarks.renderers --rows 10000
+
+camping list 응답과 같은 모양의 payload(serializer 출력: 문자열 datetime)와 datetime 객체를 그대로
+담은 payload를 DRF JSONRenderer, core.renderers.ORJSONRenderer, MessagePackRenderer(msgpack이 있으면)로
+encode하여 시간과 크기(gzip 후 크기 포함)를 비교한다.
+"""
+import argparse
+import datetime
+import gzip
+import os
+import time
+from io import BytesIO
+
+
+def make_rows(count, raw_datetimes=False):
+    base = datetime.datetime(2022, 12, 3, 10, 30)
+    rows = []
+    for index in range(count):
+        visited = base + datetime.timedelta(days=index % 365)
+        rows.append({
+            "id": index + 1,
+            "title": f"깊은 숲 캠핑장 {index}",
+            "visited_dt": visited if raw_datetimes else visited.isoformat(),
+            "review": "계곡 옆 사이트라 시원하고 조용했어요. 다음에도 방문 예정 " * 2,
+            "price": 50000 + index,
+            "camping_tags": [{"id": index % 50, "name": "계곡"}, {"id": 50 + index % 7, "name": "forest"}],
+        })
+    return {"next": None, "previous": None, "results": rows}
+
+
+def timeit(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    import django
+
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core import renderers
+
+    renderer_classes = [JSONRenderer, renderers.ORJSONRenderer]
+    parser_classes = [(JSONParser, JSONRenderer), (renderers.ORJSONParser, JSONRenderer)]
+    if renderers.msgpack is not None:
+        renderer_classes.append(renderers.MessagePackRenderer)
+        parser_classes.append((renderers.MessagePackParser, renderers.MessagePackRenderer))
+
+    for label, raw in (("serialized", False), ("raw datetime", True)):
+        data = make_rows(args.rows, raw_datetimes=raw)
+        print(f"{label} payload, {args.rows} rows")
+        for renderer_class in renderer_classes:
+            renderer = renderer_class()
+            elapsed, body = timeit(lambda: renderer.render(data), args.repeat)
+            print(
+                f"  render {renderer_class.__name__:<20} {elapsed * 1000:8.1f} ms  {len(body):>9} bytes"
+                f"  {len(gzip.compress(body, 6)):>8} gzipped"
+            )
+
+    data = make_rows(args.rows)
+    print(f"parse, {args.rows} rows")
+    for parser_class, renderer_class in parser_classes:
+        body = renderer_class().render(data)
+        elapsed, _ = timeit(lambda: parser_class().parse(BytesIO(body)), args.repeat)
+        print(f"  parse  {parser_class.__name__:<20} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
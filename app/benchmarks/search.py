@@ -0,0 +1,89 @@
+"""
+?q= search benchmark (SearchTerm index vs icontains scan)
+
+    python -m benchmarks.search --rows 1000 10000 100000
+
+임시 SQLite DB에 user 한 명의 camping을 rows개 만들고(검색어는 --matches개의 row에만 포함),
+core.search.search와 index 없이 icontains만 쓰는 검색의 평균 시간을 비교한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fastpath import setup
+
+REVIEW = "주차장이 넓고 화장실이 깨끗한 오토캠핑장 입니다 "
+
+
+def populate(user, rows, matches):
+    from django.db import connection
+
+    from core import search
+    from core.models import Camping
+
+    step = max(rows // matches, 1)
+    campings = Camping.objects.bulk_create(
+        [
+            Camping(
+                user=user,
+                title=f"캠핑장 {index}",
+                visited_dt="2022-12-03",
+                review=REVIEW + ("계곡 물놀이" if index % step == 0 else "바다 전망"),
+                price=index,
+            )
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+    for start in range(0, len(campings), 1000):
+        search.index_instances(Camping, campings[start:start + 1000])
+    # MySQL(InnoDB persistent statistics)처럼 planner가 통계를 사용하도록
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def timeit(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        from django.db.models import Q
+
+        from core import search
+        from core.models import Camping
+        from utils.functools import create_user
+
+        for index, rows in enumerate(args.rows):
+            user = create_user(email=f"bench{index}@example.com")
+            populate(user, rows, args.matches)
+            queryset = Camping.objects.filter(user=user)
+
+            indexed, found = timeit(lambda: list(search.search(queryset, "계곡 물놀이", user)[:50]), args.repeat)
+            scanned, expected = timeit(
+                lambda: list(
+                    queryset.filter(Q(title__icontains="계곡") | Q(review__icontains="계곡"))
+                    .filter(Q(title__icontains="물놀이") | Q(review__icontains="물놀이"))[:50]
+                ),
+                args.repeat,
+            )
+            assert {row.pk for row in found} == {row.pk for row in expected}
+            print(
+                f"{rows:>7} rows  {len(found):>3} hits  index {indexed * 1000:8.2f} ms"
+                f"  icontains {scanned * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
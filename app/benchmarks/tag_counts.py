@@ -0,0 +1,54 @@
+"""
+tag usage count benchmark (usage_count column vs COUNT over the through table)
+
+    python -m benchmarks.tag_counts --tags 1000 5000
+
+benchmarks.autocomplete와 같은 data를 만들고, tag 목록을 사용 횟수와 함께 조회할 때
+usage_count를 읽는 경우와 through 테이블을 join하여 Count하는 경우의 시간을 비교한다.
+repair_tag_counts로 전체 count를 다시 계산하는 시간도 출력한다.
+"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.autocomplete import populate, timeit
+from benchmarks.fastpath import setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tags", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        from django.core.management import call_command
+        from django.db.models import Count
+
+        from core.models import CampingTag
+        from utils.functools import create_user
+
+        generator = random.Random(0)
+        for index, tags in enumerate(args.tags):
+            user = create_user(email=f"bench{index}@example.com")
+            populate(user, tags, generator)
+            queryset = CampingTag.objects.filter(user=user)
+
+            stored, expected = timeit(lambda: list(queryset.values_list("id", "usage_count")), args.repeat)
+            counted, found = timeit(
+                lambda: list(queryset.annotate(linked=Count("camping")).values_list("id", "linked")), args.repeat
+            )
+            assert sorted(found) == sorted(expected)
+            print(f"{tags:>6} tags  list  usage_count {stored * 1000:8.2f} ms  Count {counted * 1000:8.2f} ms")
+
+            started = time.perf_counter()
+            call_command("repair_tag_counts", "--user", str(user.pk), stdout=io.StringIO())
+            print(f"{tags:>6} tags  repair_tag_counts {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+?tags= filter benchmark (grouped through query vs chained joins)
+
+    python -m benchmarks.tags --rows 100000
+
+임시 SQLite DB에 user 한 명의 camping을 rows개 만들고 각 camping에 50개 중 3개의 tag를 붙인다
+(rare tag 2개는 --rare개의 camping에만). list API처럼 (update_dt, id) 순서의 첫 page를 조회하여
+core.filters.tagged_pks(HAVING COUNT = n)와 tag마다 join하는 .filter(camping_tags=...) chain,
+through 테이블 index(tag_id, camping_id)가 없을 때의 grouped query 시간을 비교한다.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.fastpath import setup
+
+
+def populate(user, rows, rare):
+    from django.db import connection
+
+    from core.models import Camping, CampingTag
+
+    tags = CampingTag.objects.bulk_create([CampingTag(user=user, name=f"tag {index}") for index in range(52)])
+    common, rare_tags = tags[:50], tags[50:]
+    campings = Camping.objects.bulk_create(
+        [
+            Camping(user=user, title=f"Camping {index}", visited_dt="2022-12-03", review="review", price=index)
+            for index in range(rows)
+        ],
+        batch_size=1000,
+    )
+    through = Camping.camping_tags.through
+    generator = random.Random(0)
+    links = [
+        through(camping_id=camping.id, campingtag_id=tag.id)
+        for camping in campings
+        for tag in generator.sample(common, 3)
+    ]
+    links += [
+        through(camping_id=camping.id, campingtag_id=tag.id)
+        for camping in generator.sample(campings, rare)
+        for tag in rare_tags
+    ]
+    through.objects.bulk_create(links, batch_size=5000)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return common, rare_tags
+
+
+def timeit(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--rare", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup(os.path.join(directory, "db.sqlite3"))
+        from django.db import connection, models
+
+        from core import filters
+        from core.db.indexes import THROUGH_INDEXES
+        from core.models import Camping
+        from utils.functools import create_user
+
+        user = create_user()
+        common, rare = populate(user, args.rows, args.rare)
+        queryset = Camping.objects.filter(user=user).order_by("-update_dt", "-id")
+        descriptor = Camping.camping_tags
+
+        def grouped(tags, match):
+            pks = filters.tagged_pks(descriptor, [tag.id for tag in tags], match)
+            return [row.id for row in queryset.filter(pk__in=pks)[:51]]
+
+        def chained(tags):
+            result = queryset
+            for tag in tags:
+                result = result.filter(camping_tags=tag)
+            return [row.id for row in result[:51]]
+
+        cases = [
+            ("all of 2 common tags", common[:2], "all"),
+            ("all of 3 common tags", common[:3], "all"),
+            ("all of 2 rare tags", rare, "all"),
+            ("any of 2 common tags", common[:2], "any"),
+        ]
+        for label, tags, match in cases:
+            elapsed, found = timeit(lambda: grouped(tags, match), args.repeat)
+            line = f"{label:<22} grouped {elapsed * 1000:8.2f} ms"
+            if match == "all":
+                elapsed, expected = timeit(lambda: chained(tags), args.repeat)
+                assert found == expected
+                line += f"  chained joins {elapsed * 1000:8.2f} ms"
+            print(line)
+
+        through = descriptor.through
+        name = dict((item.field.name, index_name) for item, index_name in THROUGH_INDEXES)["camping_tags"]
+        with connection.schema_editor() as editor:
+            editor.remove_index(through, models.Index(fields=["campingtag", "camping"], name=name))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        print("without (tag_id, camping_id) index")
+        for label, tags, match in cases:
+            elapsed, _ = timeit(lambda: grouped(tags, match), args.repeat)
+            print(f"{label:<22} grouped {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
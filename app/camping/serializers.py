@@ -5,7 +5,9 @@ import datetime
 
 from rest_framework import serializers
 
+from core import sharding
 from core.models import Camping, CampingTag
+from core.tags import add_tags, get_or_create_tags, sync_tags, update_tag
 
 
 def transform_str_to_datetime(date):
@@ -18,8 +20,11 @@ class CampingTagSerialzier(serializers.ModelSerializer):
 
     class Meta:
         model = CampingTag
-        fields = ["id", "name"]
-        read_only_fields = ["id"]
+        fields = ["id", "name", "usage_count"]
+        read_only_fields = ["id", "usage_count"]
+
+    def update(self, instance, validated_data):
+        return update_tag(instance, validated_data)
 
 
 class CampingSerializer(serializers.ModelSerializer):
@@ -44,10 +49,18 @@ class CampingSerializer(serializers.ModelSerializer):
         tags 객체를 불러와서 camping object에 add
         """
         auth_user = self.context.get("request").user
-        for camping_tag in tags:
-            tag_obj, created = CampingTag.objects.get_or_create(user=auth_user, **camping_tag)
-            instance.camping_tags.add(tag_obj)
+        tag_objs = get_or_create_tags(CampingTag, auth_user, tags)
+        add_tags(Camping.camping_tags, [(instance, tag_objs.values())])
+
+    def _update_tags(self, tags, instance):
+        """
+        기존 tag 연결과 비교하여 바뀐 tag만 반영
+        """
+        auth_user = self.context.get("request").user
+        tag_objs = get_or_create_tags(CampingTag, auth_user, tags)
+        sync_tags(Camping.camping_tags, [(instance, tag_objs.values())])
 
+    @sharding.atomic(Camping)
     def create(self, validated_data):
         """Create a recipe"""
         camping_tags = validated_data.pop("camping_tags", [])  # [(TagObject1), (TagObject2), ...]
@@ -57,16 +70,17 @@ class CampingSerializer(serializers.ModelSerializer):
 
         return camping
 
+    @sharding.atomic(Camping)
     def update(self, instance, validated_data):
         """
         instance : <Camping Object>
         validated_data: request로 넘어온 dictionary 데이터
         """
 
-        camping_tags = validated_data.pop("camping_tags", [])
+        # tag가 없는 PATCH는 tag를 건드리지 않고, tag가 없는 PUT은 모든 tag를 지운다
+        camping_tags = validated_data.pop("camping_tags", None if self.partial else [])
         if camping_tags is not None:
-            instance.camping_tags.clear()
-            self._get_or_create_tags(camping_tags, instance)
+            self._update_tags(camping_tags, instance)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
@@ -1,10 +1,15 @@
 """
 test camping api
 """
+import json
+from base64 import b64encode
 from datetime import datetime
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -76,7 +81,7 @@ class PrivateRecipeAPITests(TestCase):
         campings = Camping.objects.all()
         serialzier = CampingSerializer(campings, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serialzier.data)
+        self.assertEqual(res.data["results"], serialzier.data)
 
     def test_recipe_list_ilmited_user(self):
         """Test list of campings is limited to authenticated user."""
@@ -93,7 +98,7 @@ class PrivateRecipeAPITests(TestCase):
         campings = Camping.objects.filter(user=self.user)
         serializer = CampingSerializer(campings, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_camping(self):
         """Test camping create and return camping"""
@@ -266,3 +271,307 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(camping.camping_tags.count(), 0)
+
+    def test_list_query_count_independent_of_rows(self):
+        """Test: 캠핑 개수와 무관하게 리스트 조회 쿼리 수가 고정"""
+        for i in range(5):
+            camping = create_camping(user=self.user, title=f"camping{i}")
+            camping.camping_tags.add(CampingTag.objects.create(user=self.user, name=f"tag{i}"))
+
+        # validator(MAX(update_dt)) + page + tag prefetch
+        with self.assertNumQueries(3):
+            res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 5)
+
+    def test_detail_query_count(self):
+        """Test: 캠핑 상세 조회는 태그 개수와 무관하게 쿼리 2번"""
+        camping = create_camping(user=self.user)
+        for i in range(3):
+            camping.camping_tags.add(CampingTag.objects.create(user=self.user, name=f"tag{i}"))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(camping.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["camping_tags"]), 3)
+
+    def test_list_paginated_by_cursor(self):
+        """Test: cursor를 따라가면 중복/누락 없이 전체 캠핑을 순회"""
+        campings = [create_camping(user=self.user, title=f"camping{i}") for i in range(7)]
+        # update_dt가 같은 row가 있어도 id로 순서가 결정되어야 함
+        Camping.objects.filter(id__in=[c.id for c in campings[:4]]).update(update_dt=campings[0].update_dt)
+        expected = list(Camping.objects.filter(user=self.user).order_by("-update_dt", "-id").values_list("id", flat=True))
+
+        seen = []
+        url = f"{CAMPING_URL}?page_size=3"
+        pages = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append(res.data)
+            seen.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        res = self.client.get(pages[-1]["previous"])
+        self.assertEqual([item["id"] for item in res.data["results"]], expected[3:6])
+
+    def test_list_pagination_skips_count(self):
+        """Test: 페이지 이동 시 COUNT 쿼리를 실행하지 않음"""
+        for i in range(4):
+            create_camping(user=self.user, title=f"camping{i}")
+        first = self.client.get(f"{CAMPING_URL}?page_size=2")
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(first.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries.captured_queries))
+
+    def test_list_invalid_cursor(self):
+        """Test: 잘못된 cursor는 404"""
+        res = self.client.get(f"{CAMPING_URL}?cursor=invalid")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_cursor_with_non_string_position(self):
+        """Test: position 값의 형식이 다른 변조된 cursor도 500이 아닌 404"""
+        create_camping(user=self.user)
+        for position in ([{"a": 1}, 1], ["2022-12-03T00:00:00", [1]]):
+            cursor = b64encode(json.dumps({"r": 0, "p": position}).encode()).decode()
+
+            res = self.client.get(CAMPING_URL, {"cursor": cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND, position)
+
+    def test_create_query_count_independent_of_tags(self):
+        """Test: 태그 개수와 무관하게 캠핑 생성 쿼리 수가 고정"""
+        CampingTag.objects.create(user=self.user, name="existing")
+
+        def create_with_tags(count):
+            payload = dict(
+                title="DeepForest",
+                visited_dt="2022-12-03",
+                review="Some review",
+                price=50000,
+                camping_tags=[dict(name="existing")] + [dict(name=f"tag{count}-{i}") for i in range(count)],
+            )
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(CAMPING_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(res.data["camping_tags"]), count + 1)
+            return len(queries)
+
+        self.assertEqual(create_with_tags(2), create_with_tags(20))
+        self.assertEqual(CampingTag.objects.filter(user=self.user, name="existing").count(), 1)
+
+    def test_create_tag_name_case_insensitive(self):
+        """Test: 대소문자만 다른 tag 이름은 기존 tag를 재사용"""
+        tag = CampingTag.objects.create(user=self.user, name="forest")
+        payload = dict(
+            title="DeepForest",
+            visited_dt="2022-12-03",
+            review="Some review",
+            price=50000,
+            camping_tags=[dict(name="Forest"), dict(name="FOREST"), dict(name="Lake"), dict(name="lake")],
+        )
+
+        res = self.client.post(CAMPING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        camping = Camping.objects.get(id=res.data["id"])
+        self.assertEqual(sorted(tag.name for tag in camping.camping_tags.all()), ["Lake", "forest"])
+        self.assertEqual(CampingTag.objects.filter(user=self.user).count(), 2)
+        tag.refresh_from_db()
+        self.assertEqual(tag.usage_count, 1)
+
+    def test_create_tags_without_returning_skips_existing(self):
+        """Test: bulk insert가 pk를 돌려주지 않아도 이번에 만든 tag만 다시 조회"""
+        tag = CampingTag.objects.create(user=self.user, name="forest")
+        payload = dict(
+            title="DeepForest",
+            visited_dt="2022-12-03",
+            review="Some review",
+            price=50000,
+            camping_tags=[dict(name="forest"), dict(name="lake")],
+        )
+
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            with mock.patch("core.tags.tag_index.update") as update:
+                res = self.client.post(CAMPING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        lake = CampingTag.objects.get(user=self.user, name="lake")
+        put = [c.args[3] for c in update.call_args_list if c.args[2] == "put"]
+        self.assertEqual(put, [lake.pk])
+        self.assertNotIn(tag.pk, put)
+
+    def test_partial_update_without_tags_keeps_tags(self):
+        """Test: tag 없이 PATCH하면 기존 tag 유지"""
+        tag = CampingTag.objects.create(user=self.user, name="tag1")
+        camping = create_camping(user=self.user)
+        camping.camping_tags.add(tag)
+
+        res = self.client.patch(detail_url(camping.id), {"title": "New Title"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(camping.camping_tags.all()), [tag])
+
+    def test_full_update_without_tags_clears_tags(self):
+        """Test: tag 없이 PUT하면 기존 tag 삭제"""
+        tag = CampingTag.objects.create(user=self.user, name="tag1")
+        camping = create_camping(user=self.user)
+        camping.camping_tags.add(tag)
+        payload = dict(title="New Title", visited_dt="2022-12-21", review="New review", price=10000)
+
+        res = self.client.put(detail_url(camping.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(camping.camping_tags.all()), [])
+        tag.refresh_from_db()
+        self.assertEqual(tag.usage_count, 0)
+
+    def test_update_tags_touches_only_changed_rows(self):
+        """Test: tag 업데이트 시 바뀐 through row만 insert/delete"""
+        keep = CampingTag.objects.create(user=self.user, name="keep")
+        drop = CampingTag.objects.create(user=self.user, name="drop")
+        camping = create_camping(user=self.user)
+        camping.camping_tags.add(keep, drop)
+        Through = Camping.camping_tags.through
+        keep_row = Through.objects.get(camping=camping, campingtag=keep)
+
+        payload = {"camping_tags": [{"name": "keep"}, {"name": "new"}]}
+        res = self.client.patch(detail_url(camping.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(tag["name"] for tag in res.data["camping_tags"]), ["keep", "new"])
+        self.assertTrue(Through.objects.filter(pk=keep_row.pk).exists())
+        self.assertFalse(Through.objects.filter(camping=camping, campingtag=drop).exists())
+
+    def test_update_same_tags_writes_nothing(self):
+        """Test: 같은 tag로 PATCH하면 through 테이블에 쓰지 않음"""
+        camping = create_camping(user=self.user)
+        camping.camping_tags.add(CampingTag.objects.create(user=self.user, name="tag1"))
+        table = Camping.camping_tags.through._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(detail_url(camping.id), {"camping_tags": [{"name": "tag1"}]}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        writes = [
+            query["sql"] for query in queries.captured_queries
+            if table in query["sql"] and not query["sql"].upper().startswith("SELECT")
+        ]
+        self.assertEqual(writes, [])
+
+
+BULK_URL = reverse("camping:camping-bulk")
+
+
+class BulkCampingAPITests(TestCase):
+    """Test bulk create/update/delete API"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+
+    @staticmethod
+    def create_operation(index, tags=()):
+        return dict(op="create", data=dict(
+            title=f"camping{index}",
+            visited_dt="2022-12-03",
+            review="Some review",
+            price=50000,
+            camping_tags=[dict(name=name) for name in tags],
+        ))
+
+    def test_bulk_operations_return_per_item_results(self):
+        """Test: create/update/delete를 한번에 처리하고 item별 결과 반환"""
+        tag = CampingTag.objects.create(user=self.user, name="old")
+        updated = create_camping(user=self.user, title="before")
+        updated.camping_tags.add(tag)
+        deleted = create_camping(user=self.user)
+        other = create_camping(user=create_user(email="other@example.com"))
+
+        payload = [
+            self.create_operation(1, tags=["new", "old"]),
+            dict(op="update", id=updated.id, data=dict(title="after", camping_tags=[dict(name="new")])),
+            dict(op="delete", id=deleted.id),
+            dict(op="delete", id=other.id),
+            dict(op="create", data=dict(title="missing fields")),
+        ]
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = res.data["results"]
+        self.assertEqual([result["status"] for result in results], [201, 200, 204, 404, 400])
+        self.assertEqual(sorted(tag["name"] for tag in results[0]["data"]["camping_tags"]), ["new", "old"])
+        self.assertIn("review", results[4]["errors"])
+
+        updated.refresh_from_db()
+        self.assertEqual(updated.title, "after")
+        self.assertEqual([tag.name for tag in updated.camping_tags.all()], ["new"])
+        self.assertFalse(Camping.objects.filter(id=deleted.id).exists())
+        self.assertTrue(Camping.objects.filter(id=other.id).exists())
+        self.assertEqual(CampingTag.objects.filter(user=self.user).count(), 2)
+
+    def test_bulk_query_count_independent_of_items(self):
+        """Test: item 수와 무관하게 bulk 요청 쿼리 수 고정 (bulk insert 후 pk를 돌려주지 않는 backend 포함)"""
+        def run(count):
+            payload = [self.create_operation(i, tags=[f"tag{count}-{i % 3}"]) for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(BULK_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data["results"]), count)
+            # 검색 index insert는 SQLite의 query parameter 제한(999개)으로 term 수에 따라 나뉘므로 제외
+            return len([query for query in queries.captured_queries if "core_searchterm" not in query["sql"]])
+
+        for returns_rows in (True, False):
+            with self.subTest(returns_rows=returns_rows), mock.patch.object(
+                type(connection.features), "can_return_rows_from_bulk_insert", returns_rows
+            ):
+                self.assertEqual(run(5), run(50))
+        self.assertEqual(Camping.objects.filter(user=self.user).count(), 110)
+
+    def test_bulk_create_reads_back_pks(self):
+        """Test: bulk insert 후 pk를 돌려주지 않는 backend에서도 item마다 생성된 row를 반환"""
+        create_camping(user=self.user, title="existing")
+        payload = [self.create_operation(i, tags=[f"tag{i}"]) for i in range(3)]
+
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for index, result in enumerate(res.data["results"]):
+            camping = Camping.objects.get(id=result["data"]["id"])
+            self.assertEqual(camping.title, f"camping{index}")
+            self.assertEqual([tag.name for tag in camping.camping_tags.all()], [f"tag{index}"])
+
+    def test_bulk_create_duplicate_tag_names(self):
+        """Test: 한 item에 같은 tag 이름이 반복되어도 한번만 연결"""
+        payload = [self.create_operation(0, tags=["forest", "forest"])]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["status"], 201)
+        camping = Camping.objects.get(id=res.data["results"][0]["data"]["id"])
+        self.assertEqual([tag.name for tag in camping.camping_tags.all()], ["forest"])
+        self.assertEqual(CampingTag.objects.get(user=self.user, name="forest").usage_count, 1)
+
+    def test_bulk_rejects_too_many_operations(self):
+        """Test: 허용된 operation 수를 넘으면 item을 검증하기 전에 400"""
+        payload = [dict(op="delete", id=i) for i in range(1001)]
+
+        with mock.patch("core.mixins.BulkOperationSerializer") as serializer:
+            res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("At most 1000", res.data["detail"])
+        serializer.assert_not_called()
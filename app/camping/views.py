@@ -3,26 +3,61 @@ Views for the camping APIs
 """
 
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.mixins import ListModelMixin, UpdateModelMixin, DestroyModelMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 
 from camping.serializers import CampingSerializer, CampingTagSerialzier, CampingDetailSerializer
+from core.authentication import CachedTokenAuthentication
+from core.mixins import (
+    BulkOperationsMixin,
+    CachedListMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    FastListMixin,
+    ImportMixin,
+    OrderingMixin,
+    RangeFilterMixin,
+    SearchMixin,
+    ShardedViewSetMixin,
+    SparseFieldsMixin,
+    TagAutocompleteMixin,
+    TagFilterMixin,
+)
 from core.models import Camping, CampingTag
+from core.pagination import KeysetPagination
 
 
-class CampingViewSet(viewsets.ModelViewSet):
+class CampingViewSet(
+    ShardedViewSetMixin,
+    SparseFieldsMixin,
+    SearchMixin,
+    TagFilterMixin,
+    RangeFilterMixin,
+    OrderingMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    FastListMixin,
+    ExportMixin,
+    ImportMixin,
+    BulkOperationsMixin,
+    viewsets.ModelViewSet,
+):
     """View for mange camping APIs"""
 
     serializer_class = CampingDetailSerializer
     queryset = Camping.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    bulk_tag_field = "camping_tags"
+    tag_filter_field = "camping_tags"
+    range_filter_fields = ("visited_dt", "price")
+    ordering_fields = ("update_dt", "visited_dt", "price")
 
     def get_queryset(self):
         """Retrieve camping for authenticated user."""
-        return self.queryset.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user).prefetch_related("camping_tags")
 
     def get_serializer_class(self):
         """Return the serializer class for the request"""
@@ -36,12 +71,20 @@ class CampingViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TagViewSet(DestroyModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
+class TagViewSet(
+    ShardedViewSetMixin,
+    TagAutocompleteMixin,
+    CachedListMixin,
+    DestroyModelMixin,
+    UpdateModelMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
     """manage tags in the database"""
 
     serializer_class = CampingTagSerialzier
     queryset = CampingTag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -0,0 +1,99 @@
+"""
+Authentication classes for the APIs
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from core import tokens
+
+
+class TokenCache:
+    """
+    token key -> (user, token) LRU cache (process local)
+
+    TTL이 지나거나 max size를 넘으면 버린다. 다른 worker의 invalidation은 전달되지 않으므로
+    TTL은 비활성화/로그아웃이 다른 worker에 반영되기까지의 최대 지연 시간이다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        ttl = settings.AUTH_TOKEN_CACHE_TTL
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_TOKEN_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in [key for key, (_, (user, _)) in self._entries.items() if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication과 동일하지만 token -> user 조회 결과를 TokenCache에 보관하여
+    cache hit인 요청은 authtoken_token 조회 쿼리를 실행하지 않는다.
+
+    만료 여부는 메모리에 있는 last_seen으로 판단하고, last_seen 갱신은
+    AUTH_TOKEN_TOUCH_INTERVAL마다 한번만 DB에 쓴다.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user", "activity").get(key=key)
+            except model.DoesNotExist:
+                raise AuthenticationFailed(_("Invalid token."))
+            if not token.user.is_active:
+                raise AuthenticationFailed(_("User inactive or deleted."))
+            cached = (token.user, token)
+            token_cache.set(key, cached)
+
+        user, token = cached
+        if tokens.is_expired(token):
+            token_cache.invalidate(key)
+            raise AuthenticationFailed(_("Token has expired."))
+        tokens.touch(token)
+        # 요청마다 user 객체를 수정해도 cache된 객체에는 영향이 없도록 복사
+        return copy.copy(user), token
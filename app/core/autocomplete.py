@@ -0,0 +1,155 @@
+"""
+Tag autocomplete from a per-user prefix index (process local)
+
+user의 tag 이름을 casefold하여 정렬한 배열에서 bisect로 prefix 범위를 찾고, 사용 횟수가 많은 순으로
+limit개를 돌려준다. index는 처음 조회할 때 tag의 usage_count로 만들고, 이후 core.tags helper와
+core.signals가 tag 생성/이름 변경/삭제, 연결 추가/삭제를 그대로 반영한다. 변경은 쓰기 transaction이
+commit된 뒤에 반영하므로 rollback된 쓰기가 index에 남지 않는다.
+
+다른 worker의 변경은 전달되지 않으므로 TAG_AUTOCOMPLETE_TTL이 다른 worker에 반영되기까지의
+최대 지연 시간이다 (core.authentication.TokenCache와 같음).
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import islice
+
+from django.conf import settings
+from django.db import router, transaction
+
+
+class PrefixIndex:
+    """
+    한 user의 tag 목록
+
+    이름 순 배열과 사용 횟수 순 배열을 함께 정렬된 상태로 유지한다. prefix에 맞는 tag가 scan_limit개
+    이하면 이름 순 범위에서 상위 limit개를 고르고, 많으면(짧은 prefix) 사용 횟수 순 배열을 앞에서부터
+    읽다가 limit개가 차면 멈춘다.
+    """
+
+    scan_limit = 256
+
+    def __init__(self, tags=()):
+        self._tags = {}  # id -> (name, key, count)
+        for tag_id, name, count in tags:
+            self._tags[tag_id] = (name, self._key(name), count)
+        self._keys = sorted((key, tag_id) for tag_id, (_, key, _) in self._tags.items())
+        self._ranked = sorted(self._rank(tag_id) for tag_id in self._tags)
+
+    def __len__(self):
+        return len(self._tags)
+
+    def put(self, tag_id, name, count=None):
+        """tag 추가 또는 이름 변경, count가 None이면 기존 사용 횟수 유지"""
+        old = self._tags.get(tag_id)
+        if old is not None:
+            self._discard(tag_id)
+            if count is None:
+                count = old[2]
+        self._insert(tag_id, name, self._key(name), count or 0)
+
+    def remove(self, tag_id):
+        if tag_id in self._tags:
+            self._discard(tag_id)
+
+    def incr(self, tag_id, delta):
+        old = self._tags.get(tag_id)
+        if old is not None:
+            name, key, count = old
+            self._discard(tag_id)
+            self._insert(tag_id, name, key, max(count + delta, 0))
+
+    def search(self, prefix, limit):
+        """[(id, name, count), ...] 사용 횟수 내림차순, 같으면 이름 순"""
+        prefix = self._key(prefix)
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + "\U0010ffff",), lo)
+        if hi - lo <= self.scan_limit:
+            ranks = heapq.nsmallest(limit, (self._rank(tag_id) for _, tag_id in self._keys[lo:hi]))
+        else:
+            ranks = islice((rank for rank in self._ranked if rank[1].startswith(prefix)), limit)
+        return [(tag_id, self._tags[tag_id][0], -count) for count, _, tag_id in ranks]
+
+    def _rank(self, tag_id):
+        _, key, count = self._tags[tag_id]
+        return -count, key, tag_id
+
+    def _insert(self, tag_id, name, key, count):
+        self._tags[tag_id] = (name, key, count)
+        insort(self._keys, (key, tag_id))
+        insort(self._ranked, (-count, key, tag_id))
+
+    def _discard(self, tag_id):
+        rank = self._rank(tag_id)
+        for items, item in ((self._keys, (rank[1], tag_id)), (self._ranked, rank)):
+            del items[bisect_left(items, item)]
+        del self._tags[tag_id]
+
+    @staticmethod
+    def _key(name):
+        return name.casefold()
+
+
+def build_index(tag_model, user_id):
+    """user의 tag와 사용 횟수(usage_count)를 한번에 조회"""
+    return PrefixIndex(tag_model.objects.filter(user_id=user_id).order_by().values_list("id", "name", "usage_count"))
+
+
+class TagIndexCache:
+    """(tag model, user id) -> PrefixIndex LRU cache (process local)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def search(self, tag_model, user_id, prefix, limit):
+        key = (tag_model._meta.label, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1].search(prefix, limit)
+
+        index = build_index(tag_model, user_id)
+        ttl = settings.TAG_AUTOCOMPLETE_TTL
+        with self._lock:
+            if ttl > 0:
+                self._entries[key] = (time.monotonic() + ttl, index)
+                self._entries.move_to_end(key)
+                while len(self._entries) > settings.TAG_AUTOCOMPLETE_SIZE:
+                    self._entries.popitem(last=False)
+            return index.search(prefix, limit)
+
+    def update(self, tag_model, user_id, method, *args, using=None):
+        """
+        index가 cache되어 있으면 PrefixIndex.<method>(*args)로 갱신, 없으면 다음 조회 때 새로 만든다
+
+        using(기본은 tag_model을 쓰는 DB)의 transaction이 commit된 뒤에 실행한다.
+        """
+        def apply():
+            with self._lock:
+                entry = self._entries.get((tag_model._meta.label, user_id))
+                if entry is not None:
+                    getattr(entry[1], method)(*args)
+
+        transaction.on_commit(apply, using=using or router.db_for_write(tag_model))
+
+    def invalidate(self, tag_model, user_id, using=None):
+        """commit 뒤에 제거하여 transaction 중에 다른 요청이 commit 전 data로 만든 index도 버린다"""
+        def apply():
+            with self._lock:
+                self._entries.pop((tag_model._meta.label, user_id), None)
+
+        transaction.on_commit(apply, using=using or router.db_for_write(tag_model))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+tag_index = TagIndexCache()
@@ -0,0 +1,102 @@
+"""
+Bulk write helpers for the camping/recipe models
+
+serializer의 validated_data 목록을 bulk_create/bulk_update와 batch tag 처리로 저장한다.
+BulkOperationsMixin과 core.importer에서 사용한다.
+"""
+from django.db import DatabaseError, connections, router
+from django.db.models import Max
+
+from core import search
+from core.tags import add_tags, get_or_create_tags, sync_tags
+
+
+def bulk_create_instances(model, tag_field, user, items):
+    """
+    items: serializer의 validated_data 목록
+
+    instance는 bulk_create, tag는 전체 item에 대해 한번에 조회/생성 후 through 테이블에 bulk insert.
+    생성된 instance 목록을 items 순서대로 반환한다.
+    """
+    descriptor = getattr(model, tag_field)
+    tags = [item.pop(tag_field, None) or [] for item in items]
+    instances = [model(user=user, **item) for item in items]
+
+    insert_instances(model, user, instances)
+    # bulk_create는 post_save signal이 없으므로 검색 index를 직접 갱신
+    search.index_instances(model, instances)
+
+    resolved = get_or_create_tags(
+        descriptor.field.related_model, user, [tag for item_tags in tags for tag in item_tags]
+    )
+    add_tags(descriptor, [
+        # 같은 tag가 두번 오면 add_tags가 한번만 연결
+        (instance, [resolved[tag["name"]] for tag in item_tags])
+        for instance, item_tags in zip(instances, tags)
+    ])
+    return instances
+
+
+def insert_instances(model, user, instances):
+    """
+    user의 instances를 bulk_create하고 pk를 채운다
+
+    bulk insert 후 pk를 돌려주지 않는 backend(MySQL)에서는 insert 전 user의 마지막 pk보다 큰 row를
+    pk 순서로 한번 더 조회한다. 한 INSERT 안의 auto increment 값은 row 순서대로 커지므로, bulk_create가
+    instance에 채운 auto_now_add 값이 같은 row를 순서대로 짝짓고 그 사이에 끼어든 다른 요청의 row는 건너뛴다.
+    """
+    if not instances:
+        return
+    if connections[router.db_for_write(model)].features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(instances)
+        return
+
+    mine = model.objects.filter(user=user)
+    last = mine.aggregate(last=Max("pk"))["last"] or 0
+    model.objects.bulk_create(instances)
+
+    marker = next(field.attname for field in model._meta.concrete_fields if getattr(field, "auto_now_add", False))
+    pending = iter(instances)
+    instance = next(pending)
+    for pk, value in mine.filter(pk__gt=last).order_by("pk").values_list("pk", marker):
+        if value == getattr(instance, marker):
+            instance.pk = pk
+            instance = next(pending, None)
+            if instance is None:
+                return
+    raise DatabaseError(f"Could not read back the primary keys of {len(instances)} bulk inserted row(s)")
+
+
+def bulk_update_instances(model, tag_field, user, pairs):
+    """
+    pairs: [(instance, validated_data), ...]
+
+    변경된 column만 bulk_update하고, tag가 포함된 item은 diff로 tag 연결을 갱신한다.
+    """
+    descriptor = getattr(model, tag_field)
+    fields = set()
+    tag_links = []
+    for instance, data in pairs:
+        tags = data.pop(tag_field, None)
+        if tags is not None:
+            tag_links.append((instance, tags))
+        for attr, value in data.items():
+            setattr(instance, attr, value)
+            fields.add(attr)
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False):
+                field.pre_save(instance, add=False)
+                fields.add(field.name)
+
+    if pairs and fields:
+        model.objects.bulk_update([instance for instance, _ in pairs], sorted(fields))
+        if fields & set(search.SEARCH_FIELDS[model]):
+            search.index_instances(model, [instance for instance, _ in pairs])
+
+    if tag_links:
+        resolved = get_or_create_tags(
+            descriptor.field.related_model, user, [tag for _, tags in tag_links for tag in tags]
+        )
+        sync_tags(descriptor, [
+            (instance, [resolved[tag["name"]] for tag in tags]) for instance, tags in tag_links
+        ])
@@ -0,0 +1,59 @@
+"""
+Per-user versioned cache for serialized API payloads
+
+user마다 generation counter를 두고 cache key에 포함한다. 쓰기가 일어나면 counter만 올리면
+이전 generation의 key는 더 이상 조회되지 않으므로, 개별 key를 찾아 지울 필요가 없다.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core import metrics
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _generation_key(user_id):
+    return f"api:gen:{user_id}"
+
+
+def get_generation(user_id):
+    """user의 현재 generation. 없으면 시각 기반 값으로 시작하여 evict 후에도 재사용되지 않게 한다."""
+    cache = get_cache()
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(user_id):
+    """user의 cache된 payload를 모두 무효화"""
+    cache = get_cache()
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    metrics.incr("api_cache.invalidations")
+
+
+def payload_key(user_id, namespace, url):
+    """user, generation, 요청 url 기준 cache key"""
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f"api:{namespace}:{user_id}:{get_generation(user_id)}:{digest}"
+
+
+def get_payload(key):
+    payload = get_cache().get(key)
+    metrics.incr("api_cache.hits" if payload is not None else "api_cache.misses")
+    return payload
+
+
+def set_payload(key, payload):
+    get_cache().set(key, payload, settings.API_CACHE_TIMEOUT)
@@ -0,0 +1,12 @@
+"""
+Pooled MySQL backend
+
+    "ENGINE": "core.db.backends.mysql"
+"""
+from django.db.backends.mysql import base
+
+from core.db.backends.pooled import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
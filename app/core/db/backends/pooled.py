@@ -0,0 +1,34 @@
+"""
+Connection pooling for Django database backends
+"""
+from functools import partial
+
+from core.db import pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    DATABASES[alias]["POOL"] 설정으로 process 안의 thread끼리 connection을 재사용
+
+    connect()는 pool에서 connection을 빌리고 close()는 pool에 반납하므로, CONN_MAX_AGE=0이면
+    요청이 끝날 때마다 반납되어 gunicorn thread 수와 관계없이 SIZE개의 connection을 나눠 쓴다.
+
+        "POOL": {"SIZE": 10, "TIMEOUT": 10, "MAX_AGE": 1800, "HEALTH_CHECK": True}
+    """
+
+    def get_pool(self):
+        options = self.settings_dict.get("POOL") or {}
+        return pool.get_pool(self.alias, **{key.lower(): value for key, value in options.items()})
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self.get_pool().acquire(partial(super().get_new_connection, conn_params))
+        except pool.PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+
+    def _close(self):
+        if self.connection is None:
+            return
+        healthy = not self.errors_occurred or self.is_usable()
+        with self.wrap_database_errors:
+            self.get_pool().release(self.connection, healthy=healthy)
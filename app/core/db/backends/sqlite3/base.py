@@ -0,0 +1,12 @@
+"""
+Pooled SQLite backend
+
+    "ENGINE": "core.db.backends.sqlite3"
+"""
+from django.db.backends.sqlite3 import base
+
+from core.db.backends.pooled import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
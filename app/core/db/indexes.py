@@ -0,0 +1,33 @@
+"""
+Indexes on the auto-created M2M through tables
+
+자동 생성된 through 테이블에는 Meta.indexes를 지정할 수 없으므로 migrate가 끝나면(post_migrate)
+없는 index를 만든다. migrate를 실행할 때마다 확인하므로 DB(shard)별로 한번만 생성된다.
+"""
+from django.db import connections, models, router
+
+from core.models import Camping, Recipe
+
+THROUGH_INDEXES = [
+    # tag filter: WHERE campingtag_id IN (...) GROUP BY camping_id를 index만 읽고 처리
+    (Camping.camping_tags, "camping_tags_tag_camping_idx"),
+    (Recipe.recipe_tags, "recipe_tags_tag_recipe_idx"),
+]
+
+
+def ensure_through_indexes(using):
+    connection = connections[using]
+    for descriptor, name in THROUGH_INDEXES:
+        through = descriptor.through
+        if not router.allow_migrate_model(using, through):
+            continue
+        table = through._meta.db_table
+        with connection.cursor() as cursor:
+            if table not in connection.introspection.table_names(cursor):
+                continue
+            if name in connection.introspection.get_constraints(cursor, table):
+                continue
+        field = descriptor.field
+        index = models.Index(fields=[field.m2m_reverse_field_name(), field.m2m_field_name()], name=name)
+        with connection.schema_editor() as editor:
+            editor.add_index(through, index)
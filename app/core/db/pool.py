@@ -0,0 +1,194 @@
+"""
+Process-local DB connection pool
+"""
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """TIMEOUT 안에 connection을 빌리지 못함"""
+
+
+class ConnectionPool:
+    """
+    thread-safe DB-API connection pool
+
+    SIZE개까지 connection을 열고, 모두 사용 중이면 TIMEOUT초 동안 반납을 기다린다.
+    MAX_AGE초가 지난 connection은 다시 열고, HEALTH_CHECK이면 빌려줄 때 ping한다.
+    """
+
+    def __init__(self, size=10, timeout=10.0, max_age=None, health_check=True):
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.health_check = health_check
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._born = {}
+        self._total = 0
+        self._counters = dict.fromkeys(
+            ["connects", "waits", "timeouts", "recycled", "discarded"], 0
+        )
+
+    def acquire(self, connect):
+        """idle connection을 빌려주고, 없으면 connect()로 새로 연다"""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                while not self._idle and self._total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout}s (size={self.size})."
+                        )
+                    if not waited:
+                        self._counters["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, born = self._idle.pop()
+                else:
+                    conn, born = None, None
+                    self._total += 1
+
+            if conn is None:
+                try:
+                    conn = connect()
+                except Exception:
+                    self._forget()
+                    raise
+                born = time.monotonic()
+                with self._cond:
+                    self._counters["connects"] += 1
+            elif self._expired(born):
+                self._discard(conn, "recycled")
+                continue
+            elif self.health_check and not self._ping(conn):
+                self._discard(conn, "discarded")
+                continue
+
+            with self._cond:
+                self._born[id(conn)] = born
+            return conn
+
+    def release(self, conn, healthy=True):
+        """connection 반납, 끊어졌거나 오래된 connection은 닫는다"""
+        with self._cond:
+            born = self._born.pop(id(conn), None)
+        if born is None:
+            # 다른 process(fork 이전)에서 빌린 connection은 socket을 공유하므로 닫지 않고 버린다
+            return
+
+        if not healthy or not self._reset(conn):
+            self._discard(conn, "discarded")
+        elif self._expired(born):
+            self._discard(conn, "recycled")
+        else:
+            with self._cond:
+                self._idle.append((conn, born))
+                self._cond.notify()
+
+    def close(self):
+        """idle connection을 모두 닫는다"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "in_use": self._total - idle,
+                "idle": idle,
+                **self._counters,
+            }
+
+    def _expired(self, born):
+        return self.max_age is not None and time.monotonic() - born >= self.max_age
+
+    def _discard(self, conn, reason):
+        self._close(conn)
+        with self._cond:
+            self._counters[reason] += 1
+        self._forget()
+
+    def _forget(self):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _ping(conn):
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _reset(conn):
+        # 열린 transaction이 다음 사용자에게 넘어가지 않도록 rollback
+        try:
+            conn.rollback()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def get_pool(alias, **options):
+    """alias별 pool, fork된 process에서는 부모의 pool을 버리고 새로 만든다"""
+    global _pid
+    with _pools_lock:
+        if os.getpid() != _pid:
+            _pools.clear()
+            _pid = os.getpid()
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(**options)
+        return pool
+
+
+def stats():
+    """모든 pool의 상태를 metrics 형식(db_pool.<alias>.<name>)으로 반환"""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {
+        f"db_pool.{alias}.{name}": value
+        for alias, pool in pools
+        for name, value in pool.stats().items()
+    }
+
+
+def close_all():
+    """모든 pool의 idle connection을 닫는다"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,74 @@
+"""
+Database routers
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.sharding import get_current_shard
+
+# 현재 요청의 읽기를 replica로 보낼지 여부 (core.middleware.ReplicaRoutingMiddleware가 설정)
+_read_from_replica = contextvars.ContextVar("read_from_replica", default=False)
+
+# replica 지연으로 인증이 실패하지 않도록 항상 primary에서 읽는 model
+PRIMARY_ONLY_MODELS = {"authtoken.token", "authtoken.tokenproxy", "core.tokenactivity", "core.usershard"}
+
+# user별로 shard에 저장되는 model (core.sharding)
+SHARDED_MODELS = {
+    "core.camping",
+    "core.campingtag",
+    "core.camping_camping_tags",
+    "core.recipe",
+    "core.recipetag",
+    "core.recipe_recipe_tags",
+    "core.searchterm",
+}
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """block 안의 읽기를 replica로 보낸다 (enabled=False면 primary)"""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ShardRouter:
+    """core.sharding.use_shard() 안에서 SHARDED_MODELS의 읽기/쓰기를 현재 shard로"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in SHARDED_MODELS:
+            return get_current_shard()
+        return None
+
+    db_for_write = db_for_read
+
+
+class ReplicaRouter:
+    """
+    read_from_replica() 안의 읽기는 DATABASE_REPLICAS 중 하나로, 나머지는 모두 primary로
+
+    replica가 설정되지 않았거나 transaction 안이면 primary에서 읽는다.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not _read_from_replica.get():
+            return None
+        if model._meta.label_lower in PRIMARY_ONLY_MODELS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 primary의 복제본이므로 같은 DB로 취급
+        return True
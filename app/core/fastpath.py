@@ -0,0 +1,144 @@
+"""
+Read-only fast path for list serialization
+
+model instance를 만들고 serializer field를 row마다 거치는 대신, values() row와 tag를 묶어 조회한
+쿼리 한번의 결과로 ModelSerializer와 같은 list payload를 만든다. 각 값은 serializer field의
+to_representation으로 변환하므로 출력은 serializer와 같다.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+SCALAR, NESTED, MANY = range(3)
+
+
+class Unsupported(Exception):
+    """values()로 만들 수 없는 serializer field"""
+
+
+def _column(model, field):
+    """serializer field의 source에 해당하는 model field (relation이 아닌 column)"""
+    if len(field.source_attrs) != 1:
+        raise Unsupported(field.field_name)
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        raise Unsupported(field.field_name)
+    if model_field.is_relation or not model_field.concrete:
+        raise Unsupported(field.field_name)
+    return model_field.name
+
+
+def _scalar_fields(serializer, model):
+    """nested serializer의 [(name, field, column), ...], column이 아닌 field가 있으면 Unsupported"""
+    return [
+        (field.field_name, field, _column(model, field))
+        for field in serializer._readable_fields
+    ]
+
+
+class ValuesSerializer:
+    """
+    ModelSerializer(list의 child)와 같은 출력을 values() row로 만든다
+
+    column field, FK의 nested serializer(예: recipe의 user), forward M2M의 nested list
+    serializer(예: camping_tags)를 지원하고, 그 밖의 field가 있으면 Unsupported를 발생시킨다.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.pk = model._meta.pk.attname
+        self.entries = []
+        self.columns = {self.pk}
+
+        for field in serializer._readable_fields:
+            name = field.field_name
+            if isinstance(field, serializers.ListSerializer):
+                descriptor = getattr(model, field.source, None)
+                m2m = getattr(descriptor, "field", None)
+                if m2m is None or not m2m.many_to_many or descriptor.reverse:
+                    raise Unsupported(name)
+                children = _scalar_fields(field.child, m2m.related_model)
+                self.entries.append((MANY, name, children, descriptor))
+            elif isinstance(field, serializers.BaseSerializer):
+                try:
+                    fk = model._meta.get_field(field.source)
+                except FieldDoesNotExist:
+                    raise Unsupported(name)
+                if not fk.many_to_one:
+                    raise Unsupported(name)
+                children = [
+                    (child_name, child, f"{fk.name}__{column}")
+                    for child_name, child, column in _scalar_fields(field, fk.related_model)
+                ]
+                self.columns.update([fk.name, *(column for _, _, column in children)])
+                self.entries.append((NESTED, name, children, fk.name))
+            else:
+                column = _column(model, field)
+                self.columns.add(column)
+                self.entries.append((SCALAR, name, field, column))
+
+    def values(self, queryset, extra=()):
+        """serialize에 필요한 column과 extra(정렬 키 등)만 조회하는 values() queryset"""
+        return queryset.prefetch_related(None).select_related(None).values(*sorted(self.columns | set(extra)))
+
+    def serialize(self, rows, using=None):
+        """using을 지정하면 tag 등 M2M을 그 DB에서 조회 (없으면 router가 결정)"""
+        rows = list(rows)
+        ids = [row[self.pk] for row in rows]
+        groups = {
+            name: self.fetch_many(descriptor, children, ids, using)
+            for kind, name, children, descriptor in self.entries
+            if kind == MANY
+        }
+
+        data = []
+        for row in rows:
+            item = {}
+            for kind, name, field, column in self.entries:
+                if kind == SCALAR:
+                    value = row[column]
+                    item[name] = None if value is None else field.to_representation(value)
+                elif kind == NESTED:
+                    if row[column] is None:
+                        item[name] = None
+                        continue
+                    item[name] = {
+                        child_name: None if row[lookup] is None else child.to_representation(row[lookup])
+                        for child_name, child, lookup in field
+                    }
+                else:
+                    item[name] = groups[name].get(row[self.pk], [])
+            data.append(item)
+        return data
+
+    @staticmethod
+    def fetch_many(descriptor, children, ids, using=None):
+        """
+        through 테이블에서 ids의 연결된 object를 한번에 조회하여 {id: [serialized, ...]}로 묶는다
+
+        prefetch_related와 같은 순서가 되도록 related model의 Meta.ordering으로 정렬한다.
+        """
+        if not ids:
+            return {}
+        field = descriptor.field
+        source = f"{field.m2m_field_name()}_id"
+        target = field.m2m_reverse_field_name()
+        related = field.related_model
+        ordering = [
+            f"-{target}__{name[1:]}" if name.startswith("-") else f"{target}__{name}"
+            for name in related._meta.ordering
+        ]
+        rows = (
+            descriptor.through._default_manager.db_manager(using)
+            .filter(**{f"{source}__in": ids})
+            .order_by(*ordering, f"{target}__pk")
+            .values_list(source, *(f"{target}__{column}" for _, _, column in children))
+        )
+
+        groups = {}
+        for instance_pk, *values in rows:
+            groups.setdefault(instance_pk, []).append({
+                name: None if value is None else child.to_representation(value)
+                for (name, child, _), value in zip(children, values)
+            })
+        return groups
@@ -0,0 +1,39 @@
+"""
+Queryset filters shared by the list APIs (tag filter, search)
+"""
+from django.db.models import Count, F
+
+# 후보 row가 이보다 적으면 id 목록으로 조회, 많으면 정렬 index를 따라 읽다가 page가 차면 멈춘다
+MAX_CANDIDATES = 1000
+
+
+def candidate_pks(pks):
+    """
+    pks(pk의 values_list queryset)를 filter(pk__in=...)에 넘길 값으로 변환
+
+    IN subquery는 planner가 user의 정렬 index 전체를 읽으면서 row마다 확인하는 경우가 많으므로,
+    후보가 적으면 먼저 id 목록을 조회하여 primary key로 찾게 한다.
+    """
+    candidates = list(pks[:MAX_CANDIDATES + 1])
+    return candidates if len(candidates) <= MAX_CANDIDATES else pks
+
+
+def tagged_pks(descriptor, tag_ids, match="all"):
+    """
+    descriptor(M2M) tag를 모두(all) 또는 하나 이상(any) 가진 row의 pk (candidate_pks)
+
+    through 테이블에서 tag_id IN (...)인 row를 object별로 묶어 한번에 조회한다 (all은 HAVING COUNT = n).
+    object id 그대로 묶으면 planner가 GROUP BY 순서를 맞추려고 (object, tag) unique index 전체를 읽으므로,
+    "+ 0" expression으로 묶어서 (tag, object) index로 tag의 row만 읽게 한다.
+    """
+    field = descriptor.field
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    tag_ids = sorted(set(tag_ids))
+
+    pks = descriptor.through.objects.filter(**{f"{target}__in": tag_ids}).values(object_id=F(source) + 0)
+    if match == "all":
+        pks = pks.annotate(matches=Count(target)).filter(matches=len(tag_ids))
+    else:
+        pks = pks.distinct()
+    return candidate_pks(pks.values_list("object_id", flat=True))
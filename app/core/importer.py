@@ -0,0 +1,152 @@
+"""
+Streaming import of campings/recipes from NDJSON/CSV
+
+파일을 한 줄씩 읽으면서 serializer의 field 규칙으로 검증하고, batch_size개씩 core.bulk.bulk_create_instances로
+저장한다. 검증에 실패한 row는 건너뛰고 line 번호와 error를 기록하므로 일부 row가 잘못되어도 나머지는 저장된다.
+CSV는 ExportMixin의 CSV와 같은 형식(tag 이름은 "|"로 구분하고 이름 안의 "|"와 "\\"는 "\\"로 escape,
+"user.email" 같은 nested column은 무시)을 읽는다.
+"""
+import codecs
+import csv
+import json
+import re
+
+from django.db import DatabaseError, router, transaction
+from rest_framework import serializers
+
+from core import cache
+from core.bulk import bulk_create_instances
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_TAG_NAME = re.compile(r"(?:\\.|[^|\\])+", re.DOTALL)
+_TAG_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def join_tag_names(names):
+    """CSV의 tag column 값, 이름 안의 "|"와 "\\"는 "\\"로 escape"""
+    return "|".join(str(name).replace("\\", "\\\\").replace("|", "\\|") for name in names)
+
+
+def split_tag_names(value):
+    """join_tag_names의 역변환"""
+    return [_TAG_ESCAPE.sub(r"\1", name) for name in _TAG_NAME.findall(value or "")]
+
+
+def iter_ndjson(stream, serializer):
+    """한 줄에 JSON object 하나, (line, data, errors)를 yield"""
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            data = _loads(raw)
+        except ValueError as exc:
+            yield line, None, {"non_field_errors": [f"JSON parse error - {exc}"]}
+            continue
+        if not isinstance(data, dict):
+            yield line, None, {"non_field_errors": ["Expected a JSON object."]}
+            continue
+        yield line, data, None
+
+
+def iter_csv(stream, serializer):
+    """첫 줄은 header, (line, data, errors)를 yield"""
+    lists = {
+        name for name, field in serializer.fields.items() if isinstance(field, serializers.ListSerializer)
+    }
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    try:
+        for row in reader:
+            data = {}
+            for name, value in row.items():
+                if name is None or "." in name:
+                    continue
+                if name in lists:
+                    value = [{"name": tag} for tag in split_tag_names(value)]
+                data[name] = value
+            yield reader.line_num, data, None
+    except (csv.Error, UnicodeDecodeError) as exc:
+        yield reader.line_num, None, {"non_field_errors": [f"CSV parse error - {exc}"]}
+
+
+PARSERS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+
+class Importer:
+    """
+    serializer로 row를 검증하여 user의 instance로 bulk 생성
+
+    serializer instance 하나를 모든 row의 run_validation에 재사용하므로 row마다 field를 복사하지 않는다.
+    batch마다 transaction을 열고 tag는 batch 단위로 한번에 조회/생성한다.
+    """
+
+    def __init__(self, serializer, tag_field, user, batch_size=1000, max_errors=100):
+        self.serializer = serializer
+        self.model = serializer.Meta.model
+        self.tag_field = tag_field
+        self.user = user
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, stream, import_type="ndjson"):
+        batch = []
+        for line, data, errors in PARSERS[import_type](stream, self.serializer):
+            if errors is None:
+                try:
+                    batch.append((line, self.serializer.run_validation(data)))
+                except serializers.ValidationError as exc:
+                    errors = exc.detail
+            if errors is not None:
+                self.add_error(line, errors)
+                continue
+
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+
+        if self.created:
+            # bulk_create는 signal이 없으므로 list cache를 직접 무효화
+            cache.bump_generation(self.user.pk)
+        return self.result()
+
+    def write(self, batch):
+        """batch를 한번에 저장하고, DB 제약 조건 위반이 있으면 row별로 다시 저장하여 실패한 row만 기록"""
+        using = router.db_for_write(self.model)
+        try:
+            with transaction.atomic(using=using):
+                # bulk_create_instances가 item에서 tag를 꺼내므로 재시도에 쓸 수 있도록 복사본을 넘긴다
+                bulk_create_instances(self.model, self.tag_field, self.user, [dict(data) for _, data in batch])
+        except DatabaseError:
+            for line, data in batch:
+                try:
+                    with transaction.atomic(using=using):
+                        bulk_create_instances(self.model, self.tag_field, self.user, [dict(data)])
+                except DatabaseError as exc:
+                    self.add_error(line, {"non_field_errors": [str(exc)]})
+                else:
+                    self.created += 1
+        else:
+            self.created += len(batch)
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def result(self):
+        # DB 제약 조건 error는 batch를 저장할 때 기록되므로 line 순서로 정렬
+        errors = sorted(self.errors, key=lambda error: error["line"])
+        return {"created": self.created, "failed": self.failed, "errors": errors}
@@ -0,0 +1,35 @@
+"""
+activity row가 없는 token에 TokenActivity 생성
+
+만료 도입 전에 발급된 token은 activity row가 없어 purge_expired_tokens의 last_seen 조회에 잡히지 않으므로
+발급 시각을 마지막 사용 시각으로 채운다. 새 token은 발급할 때 만들어지므로(core.signals) 한번만 실행하면 된다.
+"""
+from django.core.management.base import BaseCommand
+from rest_framework.authtoken.models import Token
+
+from core.models import TokenActivity
+
+
+class Command(BaseCommand):
+    help = "Create missing TokenActivity rows for tokens issued before expiry tracking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="tokens checked per query")
+
+    def handle(self, *args, batch_size, **options):
+        created, last = 0, ""
+        while True:
+            # pk 순서로 나누어 읽어 LEFT JOIN으로 token 테이블 전체를 훑지 않는다
+            tokens = list(Token.objects.filter(pk__gt=last).order_by("pk").values_list("pk", "created")[:batch_size])
+            if not tokens:
+                break
+            existing = set(
+                TokenActivity.objects.filter(token_id__in=[key for key, _ in tokens]).values_list("token_id", flat=True)
+            )
+            missing = [TokenActivity(token_id=key, last_seen=issued) for key, issued in tokens if key not in existing]
+            # 그 사이 요청이 activity를 만든 token은 건너뛴다
+            TokenActivity.objects.bulk_create(missing, ignore_conflicts=True)
+            created += len(missing)
+            last = tokens[-1][0]
+
+        self.stdout.write(f"Created {created} token activity row(s)")
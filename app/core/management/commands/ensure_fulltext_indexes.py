@@ -0,0 +1,46 @@
+"""
+검색용 MySQL FULLTEXT(ngram parser) index 생성 (SEARCH_BACKEND=fulltext)
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.search import SEARCH_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Create the MySQL FULLTEXT indexes used by SEARCH_BACKEND=fulltext if they are missing"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="create the indexes even if SEARCH_BACKEND is not fulltext"
+        )
+
+    def handle(self, *args, force, **options):
+        if settings.SEARCH_BACKEND != "fulltext" and not force:
+            self.stdout.write("SEARCH_BACKEND is not fulltext, nothing to do")
+            return
+
+        # replica는 primary의 DDL이 복제되므로 primary와 shard만
+        for alias in [DEFAULT_DB_ALIAS, *settings.DATABASE_SHARDS]:
+            connection = connections[alias]
+            if connection.vendor != "mysql":
+                self.stdout.write(f"{alias}: {connection.vendor} does not support FULLTEXT, skipped")
+                continue
+            for model, fields in SEARCH_FIELDS.items():
+                self.ensure(connection, model._meta.db_table, f"{model._meta.model_name}_search_ft", fields)
+
+    def ensure(self, connection, table, name, fields):
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+                [table, name],
+            )
+            if cursor.fetchone():
+                self.stdout.write(f"{connection.alias}: {name} exists")
+                return
+            columns = ", ".join(quote(field) for field in fields)
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD FULLTEXT INDEX {quote(name)} ({columns}) WITH PARSER ngram")
+        self.stdout.write(f"{connection.alias}: created {name}")
@@ -0,0 +1,50 @@
+"""
+NDJSON/CSV 파일의 camping/recipe를 한 user의 data로 import
+"""
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from camping.serializers import CampingDetailSerializer
+from core import sharding
+from core.importer import PARSERS, Importer
+from recipe.serializers import RecipeDetailSerializer
+
+# kind: (serializer class, tag field)
+KINDS = {
+    "camping": (CampingDetailSerializer, "camping_tags"),
+    "recipe": (RecipeDetailSerializer, "recipe_tags"),
+}
+
+
+class Command(BaseCommand):
+    help = "Import campings or recipes for one user from an NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(KINDS))
+        parser.add_argument("email", help="email of the user who will own the rows")
+        parser.add_argument("path")
+        parser.add_argument("--type", choices=sorted(PARSERS), help="file format, guessed from the extension")
+        parser.add_argument("--batch-size", type=int, default=1000, help="rows inserted per transaction")
+        parser.add_argument("--max-errors", type=int, default=100, help="row errors to print")
+
+    def handle(self, *args, kind, email, path, type, batch_size, max_errors, **options):
+        import_type = type or os.path.splitext(path)[1].lstrip(".").lower()
+        if import_type not in PARSERS:
+            raise CommandError(f"Unknown file type {import_type!r}, use --type {'/'.join(PARSERS)}")
+        try:
+            user = get_user_model().objects.get(email=email)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {email} does not exist")
+
+        serializer_class, tag_field = KINDS[kind]
+        importer = Importer(serializer_class(), tag_field, user, batch_size=batch_size, max_errors=max_errors)
+        alias = sharding.shard_for_user(user.pk)
+        with sharding.use_shard(alias), open(path, "rb") as stream:
+            sharding.ensure_shadow_user(alias, user)
+            result = importer.run(stream, import_type)
+
+        for error in result["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(f"Imported {result['created']} {kind}(s), {result['failed']} row(s) failed")
@@ -0,0 +1,165 @@
+"""
+한 user의 camping/recipe data를 다른 shard로 이동
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Max
+
+from core import search, sharding
+from core.cache import bump_generation
+from core.models import Camping, CampingTag, Recipe, RecipeTag, UserShard
+
+# (tag model, model, M2M field)
+SHARDED_GROUPS = [
+    (CampingTag, Camping, Camping.camping_tags),
+    (RecipeTag, Recipe, Recipe.recipe_tags),
+]
+
+
+class Command(BaseCommand):
+    help = "Move one user's campings, recipes, tags and tag links to another shard"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int)
+        parser.add_argument("target", help="shard alias in DATABASE_SHARDS")
+        parser.add_argument("--batch-size", type=int, default=1000, help="rows inserted per statement")
+
+    def handle(self, *args, user_id, target, batch_size, **options):
+        if target not in settings.DATABASE_SHARDS:
+            raise CommandError(f"Unknown shard {target!r}, expected one of {settings.DATABASE_SHARDS}")
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {user_id} does not exist")
+
+        source = sharding.shard_for_user(user.pk)
+        if source == target:
+            self.stdout.write(f"User {user.pk} is already on {target}")
+            return
+
+        groups = [self.collect(source, user, *group) for group in SHARDED_GROUPS]
+        self.check_collisions(target, groups)
+
+        # mapping이 바뀌기 전에는 target을 읽지 않으므로 복사본을 먼저 commit
+        with transaction.atomic(using=target):
+            sharding.ensure_shadow_user(target, user)
+            for group in groups:
+                for model, rows in group:
+                    self.copy(model, rows, target, batch_size)
+                    if model in search.SEARCH_FIELDS:
+                        # 검색 index는 복사하지 않고 target에서 다시 만든다
+                        search.index_instances(model, rows, using=target)
+
+        switched = False
+        try:
+            with transaction.atomic(using=source):
+                # 확인부터 source 삭제까지 source의 쓰기를 막는다
+                # (shadow user row를 잠그면 MySQL은 FK 검사로 새 row의 insert도 기다린다)
+                self.lock(source, user)
+                if self.versions(source, user) != self.versions(target, user):
+                    raise CommandError(f"User {user.pk} changed on {source} during the move, try again")
+
+                with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                    # 같은 user를 옮기거나 삭제하는 다른 요청과 순서를 정한다
+                    list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list("pk"))
+                    if sharding.get_ring().get_node(user.pk) == target:
+                        UserShard.objects.filter(user=user).delete()
+                    else:
+                        UserShard.objects.update_or_create(user=user, defaults={"alias": target})
+                switched = True
+                # 매핑 cache는 worker간 공유되므로(settings에서 강제) 모든 worker가 다음 조회부터 target을 사용
+                sharding.forget_user(user.pk)
+                self.delete(source, user)
+        except BaseException:
+            if not switched:
+                self.delete(target, user)
+            raise
+        bump_generation(user.pk)
+
+        moved = sum(len(rows) for group in groups for _, rows in group)
+        self.stdout.write(f"Moved {moved} row(s) of user {user.pk} from {source} to {target}")
+
+    @staticmethod
+    def collect(alias, user, tag_model, model, descriptor):
+        """source shard에서 tag, object, through row를 조회"""
+        field = descriptor.field
+        return [
+            (tag_model, list(tag_model.objects.using(alias).filter(user=user))),
+            (model, list(model.objects.using(alias).filter(user=user))),
+            (descriptor.through, list(
+                descriptor.through.objects.using(alias).filter(**{f"{field.m2m_field_name()}__user": user})
+            )),
+        ]
+
+    @staticmethod
+    def delete(alias, user):
+        """alias shard에서 user의 data 삭제, tag 연결(through row)은 cascade로 함께 삭제"""
+        with transaction.atomic(using=alias):
+            for tag_model, model, _ in SHARDED_GROUPS:
+                model.objects.using(alias).filter(user=user).delete()
+                tag_model.objects.using(alias).filter(user=user).delete()
+
+    @staticmethod
+    def lock(alias, user):
+        """alias shard의 shadow user row와 user의 모든 row를 SELECT ... FOR UPDATE로 잠근다"""
+        list(get_user_model().objects.using(alias).select_for_update().filter(pk=user.pk).values_list("pk"))
+        for tag_model, model, descriptor in SHARDED_GROUPS:
+            for queryset in (
+                tag_model.objects.using(alias).filter(user=user),
+                model.objects.using(alias).filter(user=user),
+                descriptor.through.objects.using(alias).filter(
+                    **{f"{descriptor.field.m2m_field_name()}__user": user}
+                ),
+            ):
+                list(queryset.select_for_update().values_list("pk"))
+
+    def versions(self, alias, user):
+        return [self.version(alias, user, *group) for group in SHARDED_GROUPS]
+
+    @staticmethod
+    def version(alias, user, tag_model, model, descriptor):
+        """row 수와 마지막 수정 시각으로 data가 바뀌었는지 비교"""
+        return (
+            tag_model.objects.using(alias).filter(user=user).count(),
+            model.objects.using(alias).filter(user=user).aggregate(
+                count=Count("pk"), last_modified=Max("update_dt")
+            ),
+            descriptor.through.objects.using(alias).filter(
+                **{f"{descriptor.field.m2m_field_name()}__user": user}
+            ).count(),
+        )
+
+    @staticmethod
+    def check_collisions(target, groups):
+        """id를 유지하여 옮기므로 target shard에 같은 id가 있으면 중단"""
+        for group in groups:
+            for model, rows in group:
+                pks = [row.pk for row in rows]
+                for start in range(0, len(pks), 1000):
+                    taken = list(
+                        model.objects.using(target).filter(pk__in=pks[start:start + 1000])
+                        .values_list("pk", flat=True)[:10]
+                    )
+                    if taken:
+                        raise CommandError(
+                            f"{model._meta.label} id(s) {taken} already exist on {target}; "
+                            "shards must use disjoint auto-increment ranges"
+                        )
+
+    @staticmethod
+    def copy(model, rows, target, batch_size):
+        """id와 auto_now 시각을 유지하여 bulk insert"""
+        stamps = [
+            field.attname for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+        ]
+        original = [[getattr(row, name) for name in stamps] for row in rows]
+        model.objects.using(target).bulk_create(rows, batch_size=batch_size)
+        if stamps and rows:
+            # bulk_create가 auto_now 값을 현재 시각으로 바꾸므로 원래 값으로 되돌린다
+            for row, values in zip(rows, original):
+                for name, value in zip(stamps, values):
+                    setattr(row, name, value)
+            model.objects.using(target).bulk_update(rows, stamps, batch_size=batch_size)
@@ -0,0 +1,32 @@
+"""
+만료된 token을 batch 단위로 삭제
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.authtoken.models import Token
+
+from core.tokens import expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired auth tokens in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="rows deleted per statement")
+        parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between batches")
+
+    def handle(self, *args, batch_size, sleep, **options):
+        deleted = 0
+        queryset = expired_tokens()
+        while True:
+            # 한번에 batch_size개의 pk만 잠그도록 pk를 먼저 조회
+            keys = list(queryset[:batch_size])
+            if not keys:
+                break
+            Token.objects.filter(pk__in=keys).delete()
+            deleted += len(keys)
+            if sleep:
+                time.sleep(sleep)
+
+        self.stdout.write(f"Deleted {deleted} expired token(s)")
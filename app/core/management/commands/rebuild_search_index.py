@@ -0,0 +1,38 @@
+"""
+camping/recipe의 SearchTerm inverted index를 다시 생성
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SearchTerm index used by SEARCH_BACKEND=index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="only rebuild rows of this user id")
+        parser.add_argument("--batch-size", type=int, default=1000, help="rows indexed per transaction")
+
+    def handle(self, *args, user, batch_size, **options):
+        if not search.index_enabled():
+            raise CommandError("SEARCH_BACKEND is fulltext, the SearchTerm index is not used")
+
+        indexed = 0
+        for alias in settings.DATABASE_SHARDS or [DEFAULT_DB_ALIAS]:
+            for model in search.SEARCH_FIELDS:
+                queryset = model.objects.using(alias).order_by("pk")
+                if user is not None:
+                    queryset = queryset.filter(user_id=user)
+                last = 0
+                while True:
+                    rows = list(queryset.filter(pk__gt=last)[:batch_size])
+                    if not rows:
+                        break
+                    with transaction.atomic(using=alias):
+                        search.index_instances(model, rows, using=alias)
+                    indexed += len(rows)
+                    last = rows[-1].pk
+
+        self.stdout.write(f"Indexed {indexed} row(s)")
@@ -0,0 +1,68 @@
+"""
+camping/recipe tag의 usage_count를 through 테이블에서 다시 계산
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+
+from core.cache import bump_generation
+from core.models import Camping, CampingTag, Recipe, RecipeTag
+
+# tag model: tag를 연결하는 M2M
+TAG_FIELDS = {
+    CampingTag: Camping.camping_tags,
+    RecipeTag: Recipe.recipe_tags,
+}
+
+
+class Command(BaseCommand):
+    help = "Recompute CampingTag/RecipeTag usage_count from the through tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="only repair tags of this user id")
+        parser.add_argument("--batch-size", type=int, default=1000, help="tags counted per grouped query")
+
+    def handle(self, *args, user, batch_size, **options):
+        checked, repaired, users = 0, 0, set()
+        for alias in settings.DATABASE_SHARDS or [DEFAULT_DB_ALIAS]:
+            for tag_model, descriptor in TAG_FIELDS.items():
+                queryset = tag_model.objects.using(alias).order_by("pk")
+                if user is not None:
+                    queryset = queryset.filter(user_id=user)
+                last = 0
+                while True:
+                    tags = list(queryset.filter(pk__gt=last).values_list("pk", "user_id", "usage_count")[:batch_size])
+                    if not tags:
+                        break
+                    counts = self.count(alias, descriptor, [pk for pk, _, _ in tags])
+                    changed = [
+                        tag_model(pk=pk, usage_count=counts.get(pk, 0))
+                        for pk, _, usage_count in tags
+                        if counts.get(pk, 0) != usage_count
+                    ]
+                    if changed:
+                        tag_model.objects.using(alias).bulk_update(changed, ["usage_count"])
+                        changed_pks = {tag.pk for tag in changed}
+                        users.update(user_id for pk, user_id, _ in tags if pk in changed_pks)
+                    checked += len(tags)
+                    repaired += len(changed)
+                    last = tags[-1][0]
+
+        # cache된 tag 목록 응답에도 반영 (다른 worker의 autocomplete index는 TAG_AUTOCOMPLETE_TTL 후 반영)
+        for user_id in users:
+            bump_generation(user_id)
+        self.stdout.write(f"Repaired {repaired} of {checked} tag(s)")
+
+    @staticmethod
+    def count(alias, descriptor, tag_pks):
+        """tag_pks의 연결 수를 GROUP BY 한번으로 조회"""
+        target = f"{descriptor.field.m2m_reverse_field_name()}_id"
+        rows = (
+            descriptor.through.objects.using(alias)
+            .filter(**{f"{target}__in": tag_pks})
+            .values(target)
+            .annotate(linked=Count("pk"))
+            .values_list(target, "linked")
+        )
+        return dict(rows)
@@ -0,0 +1,26 @@
+"""
+Process-local counters for the API
+"""
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters = Counter()
+
+
+def incr(name, value=1):
+    """counter 증가"""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot():
+    """현재 counter 값을 dict로 반환"""
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    """모든 counter 초기화 (테스트용)"""
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,219 @@
+"""
+Middleware for the API
+"""
+import hashlib
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+from core import cache, metrics
+from core.db.routers import read_from_replica
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    안전한 method의 요청은 replica에서 읽고, 쓰기 요청은 primary로 보낸다
+
+    쓰기 요청을 보낸 client는 DATABASE_REPLICA_PIN_SECONDS 동안 primary에서 읽어서
+    replica 지연과 관계없이 자신이 쓴 내용을 바로 볼 수 있다. client는 Authorization 헤더,
+    없으면 session cookie로 구분하며 pin은 worker끼리 공유되도록 cache에 저장한다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = self.get_pin_key(request)
+        if request.method not in SAFE_METHODS:
+            with read_from_replica(False):
+                response = self.get_response(request)
+            if key is not None:
+                self.get_cache().set(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+            return response
+
+        pinned = key is not None and self.get_cache().get(key) is not None
+        if pinned:
+            metrics.incr("db_router.pinned")
+        with read_from_replica(not pinned):
+            return self.get_response(request)
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.API_CACHE_ALIAS]
+
+    @staticmethod
+    def get_pin_key(request):
+        credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not credential:
+            return None
+        return f"db:pin:{hashlib.sha256(credential.encode()).hexdigest()}"
+
+
+class GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 응답을 brotli(br, brotli 필요) 또는 gzip으로 압축
+
+    COMPRESSION_MIN_SIZE보다 작은 응답, 이미 압축된 응답, 압축해도 작아지지 않는 content type은
+    그대로 보내고, streaming 응답은 chunk 단위로 압축한다. CachedListMixin의 list 응답은 압축 결과를
+    list cache key 옆에 저장하여 cache hit에서는 다시 압축하지 않는다.
+    압축 전후 크기와 CPU 시간은 core.metrics와 Server-Timing 헤더로 보고한다.
+    """
+
+    compressors = {"br": BrotliCompressor, "gzip": GzipCompressor} if brotli else {"gzip": GzipCompressor}
+    compressible_types = (
+        "text/",
+        "application/json",
+        "application/msgpack",
+        "application/x-ndjson",
+        "application/javascript",
+        "application/xml",
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.select_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if getattr(response, "is_async", False):
+                return response
+            response.streaming_content = self.compress_stream(response.streaming_content, encoding)
+            del response["Content-Length"]
+        elif not self.compress_content(response, encoding):
+            return response
+
+        response["Content-Encoding"] = encoding
+        # 압축된 표현은 byte 단위로 같지 않으므로 weak ETag (If-None-Match는 weak 비교)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return False
+        content_type = response.get("Content-Type", "")
+        return content_type.startswith(self.compressible_types)
+
+    def select_encoding(self, accept_encoding):
+        """server가 선호하는 순서(br, gzip)로 client가 q>0으로 허용한 encoding 선택"""
+        accepted = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+
+        for encoding in self.compressors:
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return None
+
+    def compress_content(self, response, encoding):
+        """response.content를 압축, 크기가 줄지 않으면 False"""
+        content = response.content
+        cache_key = getattr(response, "compression_cache_key", None)
+        if cache_key is not None:
+            content_type = hashlib.md5(response.get("Content-Type", "").encode()).hexdigest()[:8]
+            cache_key = f"{cache_key}:{encoding}:{content_type}"
+            # 같은 key라도 rendering 결과(CSRF token, 숫자 등)가 다를 수 있으므로 원본 digest까지 같을 때만 재사용
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+            cached = cache.get_cache().get(cache_key)
+            if cached is not None and cached[0] == digest:
+                metrics.incr("compression.cache_hits")
+                return self.replace_content(response, content, cached[1], 0.0)
+
+        started = time.thread_time()
+        compressor = self.compressors[encoding]()
+        compressed = compressor.compress(content) + compressor.finish()
+        cpu = time.thread_time() - started
+        if cache_key is not None:
+            cache.get_cache().set(cache_key, (digest, compressed), settings.API_CACHE_TIMEOUT)
+        return self.replace_content(response, content, compressed, cpu)
+
+    def replace_content(self, response, content, compressed, cpu):
+        if len(compressed) >= len(content):
+            return False
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Server-Timing"] = ", ".join(
+            filter(None, [response.get("Server-Timing"), f"compress;dur={cpu * 1000:.2f}"])
+        )
+        self.record(len(content), len(compressed), cpu)
+        return True
+
+    def compress_stream(self, chunks, encoding):
+        compressor = self.compressors[encoding]()
+        size, compressed_size, cpu = 0, 0, 0.0
+        for chunk in chunks:
+            started = time.thread_time()
+            data = compressor.compress(chunk)
+            cpu += time.thread_time() - started
+            size += len(chunk)
+            compressed_size += len(data)
+            if data:
+                yield data
+
+        data = compressor.finish()
+        compressed_size += len(data)
+        self.record(size, compressed_size, cpu)
+        yield data
+
+    @staticmethod
+    def record(size, compressed_size, cpu):
+        metrics.incr("compression.responses")
+        metrics.incr("compression.bytes_in", size)
+        metrics.incr("compression.bytes_out", compressed_size)
+        metrics.incr("compression.bytes_saved", size - compressed_size)
+        metrics.incr("compression.cpu_us", int(cpu * 1_000_000))
@@ -0,0 +1,702 @@
+"""
+Reusable mixins for the API viewsets
+"""
+import codecs
+import csv
+import hashlib
+import io
+from datetime import timedelta
+from functools import cached_property
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import router, transaction
+from django.db.models import DateTimeField, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import quote_etag
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from core import cache, filters, importer, search, sharding
+from core.autocomplete import tag_index
+from core.bulk import bulk_create_instances, bulk_update_instances
+from core.fastpath import Unsupported, ValuesSerializer
+from core.renderers import ORJSONRenderer
+
+
+class BulkOperationSerializer(serializers.Serializer):
+    """bulk 요청의 operation 하나"""
+
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and attrs.get("id") is None:
+            raise serializers.ValidationError({"id": "This field is required."})
+        return attrs
+
+
+class BulkOperationsMixin:
+    """
+    POST <list-url>/bulk/ 로 create/update/delete operation 목록을 한번에 처리
+
+    각 item은 view의 serializer로 검증하고, 쓰기는 bulk_create/bulk_update와
+    batch tag 처리로 몇 번의 쿼리로 끝낸다. 실패한 item은 다른 item에 영향을 주지 않고
+    item별 결과에 error로 반환된다.
+    """
+
+    bulk_max_operations = 1000
+    bulk_tag_field = None
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        # 큰 payload를 item마다 검증하기 전에 거부 (list가 아니면 serializer의 오류로 응답)
+        if isinstance(request.data, list) and len(request.data) > self.bulk_max_operations:
+            return Response(
+                {"detail": f"At most {self.bulk_max_operations} operations are allowed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        operations = BulkOperationSerializer(data=request.data, many=True)
+        operations.is_valid(raise_exception=True)
+
+        queryset = self.get_queryset()
+        model = queryset.model
+        ids = {operation["id"] for operation in operations.validated_data if operation["op"] != "create"}
+        targets = queryset.in_bulk(ids)
+
+        results = []
+        creates, updates, deletes = [], [], []
+        seen = set()
+        for operation in operations.validated_data:
+            op, pk = operation["op"], operation.get("id")
+            result = {"op": op} if op == "create" else {"op": op, "id": pk}
+            results.append(result)
+
+            if op != "create":
+                if pk not in targets:
+                    result.update(status=status.HTTP_404_NOT_FOUND, errors={"detail": "Not found."})
+                    continue
+                if pk in seen:
+                    result.update(
+                        status=status.HTTP_400_BAD_REQUEST,
+                        errors={"id": "Duplicate operation for this id."},
+                    )
+                    continue
+                seen.add(pk)
+
+            if op == "delete":
+                deletes.append(pk)
+                result["status"] = status.HTTP_204_NO_CONTENT
+                continue
+
+            serializer = self.get_serializer(
+                targets.get(pk), data=operation["data"], partial=op == "update"
+            )
+            if not serializer.is_valid():
+                result.update(status=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+                continue
+
+            if op == "create":
+                creates.append((result, serializer.validated_data))
+            else:
+                updates.append((result, targets[pk], serializer.validated_data))
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            created = bulk_create_instances(
+                model, self.bulk_tag_field, request.user, [data for _, data in creates]
+            )
+            bulk_update_instances(
+                model, self.bulk_tag_field, request.user, [(instance, data) for _, instance, data in updates]
+            )
+            if deletes:
+                queryset.filter(pk__in=deletes).delete()
+
+        written = [(result, instance) for (result, _), instance in zip(creates, created)]
+        written += [(result, instance) for result, instance, _ in updates]
+        if written:
+            fresh = self.get_queryset().in_bulk([instance.pk for _, instance in written])
+            for result, instance in written:
+                result["status"] = status.HTTP_201_CREATED if result["op"] == "create" else status.HTTP_200_OK
+                result["data"] = self.get_serializer(fresh[instance.pk]).data
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class ShardedViewSetMixin:
+    """
+    인증된 user의 shard(core.sharding)에서 요청을 처리
+
+    queryset 조회, serializer의 쓰기와 transaction이 모두 같은 shard를 사용한다.
+    쓰기 요청이면 shard에 shadow user row가 있는지 확인한다.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # 처리되지 않은 예외로 finalize_response가 호출되지 않아도 shard가 다음 요청에 남지 않도록
+        token = sharding.activate(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            sharding.deactivate(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not request.user.is_authenticated:
+            return
+        alias = sharding.shard_for_user(request.user.pk)
+        if alias is not None:
+            sharding.activate(alias)
+            if request.method not in SAFE_METHODS:
+                sharding.ensure_shadow_user(alias, request.user)
+
+
+class CachedListMixin:
+    """
+    list 응답의 serialized payload를 user별 generation key로 cache
+
+    view를 통한 쓰기 요청이 성공하면 user의 generation을 올려 cache를 무효화한다.
+    (serializer/ORM을 통한 쓰기는 core.signals에서 무효화)
+    """
+
+    cache_namespace = None
+
+    def get_cache_namespace(self):
+        return self.cache_namespace or self.basename
+
+    def list(self, request, *args, **kwargs):
+        key = cache.payload_key(request.user.pk, self.get_cache_namespace(), request.build_absolute_uri())
+        payload = cache.get_payload(key)
+        if payload is not None:
+            response = Response(payload, headers={"X-Cache": "HIT"})
+        else:
+            response = super().list(request, *args, **kwargs)
+            cache.set_payload(key, response.data)
+            response["X-Cache"] = "MISS"
+        # CompressionMiddleware가 압축 결과를 이 key 옆에 저장
+        response.compression_cache_key = key
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            # bulk_create/bulk_update처럼 signal이 없는 쓰기까지 포함
+            cache.bump_generation(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    detail/list 응답에 ETag를 붙이고 If-None-Match가 일치하면 304로 응답
+
+    list는 (user, update_dt) index만 읽는 MAX(update_dt) 한번으로 ETag를 만들어
+    serialization, tag prefetch 전에 304 여부를 결정한다. detail의 조건부 요청은 pk로
+    update_dt만 조회한다. ETag에는 user의 cache generation이 포함되어 삭제나
+    tag 이름 변경처럼 update_dt가 바뀌지 않는 변경도 반영된다.
+
+    Last-Modified는 보내지 않는다. update_dt만으로는 위 변경을 표현할 수 없어 If-Modified-Since만
+    보내는 client가 오래된 응답에 304를 받게 되기 때문이다.
+    """
+
+    last_modified_field = "update_dt"
+
+    def list(self, request, *args, **kwargs):
+        # COUNT는 row 수에 비례하므로 사용하지 않음 (삭제는 generation으로 반영)
+        last_modified = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max(self.last_modified_field),
+        )["last_modified"]
+        etag = self.make_etag(request, last_modified)
+        not_modified = self.get_not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        if "If-None-Match" in request.headers:
+            try:
+                last_modified = (
+                    self.get_queryset()
+                    .prefetch_related(None)
+                    .filter(**{self.lookup_field: lookup})
+                    .values_list(self.last_modified_field, flat=True)
+                    .first()
+                )
+            except (TypeError, ValueError, DjangoValidationError):
+                # pk 형식이 맞지 않으면 get_object()의 404로 응답
+                last_modified = None
+            if last_modified is not None:
+                etag = self.make_etag(request, lookup, last_modified)
+                not_modified = self.get_not_modified(request, etag)
+                if not_modified is not None:
+                    return not_modified
+
+        instance = self.get_object()
+        response = Response(self.get_serializer(instance).data)
+        etag = self.make_etag(request, lookup, getattr(instance, self.last_modified_field))
+        return self.set_validators(response, etag)
+
+    def make_etag(self, request, *parts):
+        """user generation, url, 응답 형식과 parts로 strong ETag 생성"""
+        values = (
+            cache.get_generation(request.user.pk),
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", ""),
+            *parts,
+        )
+        return quote_etag(hashlib.sha1(":".join(str(value) for value in values).encode()).hexdigest())
+
+    def get_not_modified(self, request, etag):
+        if request.method not in SAFE_METHODS:
+            return None
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            self.set_validators(response, etag)
+        return response
+
+    def set_validators(self, response, etag):
+        response["ETag"] = etag
+        # user별 응답이므로 공유 cache에 저장하지 않고, 매번 재검증
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    GET 요청의 ?fields=a,b / ?exclude=c 로 응답 field를 고르고, 요청되지 않은 column은 조회하지 않는다
+
+    serializer field의 source로 model field를 찾아 queryset에 only()를 적용하고, 빠진 M2M/FK field의
+    prefetch_related/select_related는 제거한다. pagination 정렬 키와 last_modified_field는 항상 조회한다.
+    """
+
+    fields_query_param = "fields"
+    exclude_query_param = "exclude"
+
+    @cached_property
+    def sparse_fields(self):
+        """요청된 serializer field 이름 목록, 전체 field면 None"""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        fields = self._split_param(self.fields_query_param)
+        exclude = self._split_param(self.exclude_query_param)
+        if not fields and not exclude:
+            return None
+
+        available = list(self.sparse_serializer_fields)
+        unknown = sorted((set(fields) | set(exclude)) - set(available))
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param if set(unknown) & set(fields) else self.exclude_query_param:
+                    [f"Unknown field(s): {', '.join(unknown)}"],
+            })
+        return [name for name in available if (not fields or name in fields) and name not in exclude]
+
+    @cached_property
+    def sparse_serializer_fields(self):
+        return self.get_serializer_class()(context=self.get_serializer_context()).fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.sparse_fields is not None:
+            child = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            fields = child.fields
+            for name in list(fields):
+                if name not in self.sparse_fields:
+                    fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        return self.prune_queryset(queryset, self.sparse_fields)
+
+    def prune_queryset(self, queryset, names):
+        model = queryset.model
+        columns = {model._meta.pk.name, *self.get_required_columns()}
+        relations = set()
+        for name in names:
+            source = self.sparse_serializer_fields[name].source
+            try:
+                model_field = model._meta.get_field(source.split(".")[0])
+            except FieldDoesNotExist:
+                # method/property 등 column으로 알 수 없는 field는 전체 조회
+                return queryset
+            if model_field.many_to_many or model_field.one_to_many:
+                relations.add(model_field.name)
+                continue
+            columns.add(model_field.name)
+            if model_field.is_relation:
+                relations.add(model_field.name)
+
+        lookups = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, "prefetch_to", lookup).split("__")[0] in relations
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*lookups)
+        if isinstance(queryset.query.select_related, dict):
+            related = [name for name in queryset.query.select_related if name in relations]
+            queryset = queryset.select_related(None)
+            if related:
+                queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+    def get_required_columns(self):
+        """응답에 없어도 view가 instance에서 읽는 column"""
+        columns = []
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, "get_ordering"):
+            columns += [field.lstrip("-") for field in paginator.get_ordering(self)]
+        if getattr(self, "last_modified_field", None):
+            columns.append(self.last_modified_field)
+        return columns
+
+    def _split_param(self, name):
+        value = self.request.query_params.get(name, "")
+        return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class FastListMixin:
+    """
+    list action을 core.fastpath.ValuesSerializer로 serialize (read-only fast path)
+
+    serializer가 values()로 표현할 수 없는 field를 가지거나 API_FAST_LIST가 꺼져 있으면
+    기존 ListModelMixin.list를 사용한다.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_LIST:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(many=True)
+        try:
+            builder = ValuesSerializer(serializer.child)
+        except Unsupported:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = []
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            extra = [field.lstrip("-") for field in self.paginator.get_ordering(self)]
+        rows = builder.values(queryset, extra)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(builder.serialize(page))
+        return Response(builder.serialize(rows))
+
+
+class ExportMixin:
+    """
+    GET <list-url>/export/?type=ndjson|csv 로 user의 전체 data를 streaming
+
+    pk 순서로 export_chunk_size개씩 조회하고 chunk마다 tag를 한번에 조회하므로 row 수와 관계없이
+    메모리 사용량이 일정하다. CSV에서 nested object는 "user.email"처럼 column을 나누고,
+    tag 목록은 이름을 "|"로 이어 붙인다. ?fields= / ?exclude= 도 사용할 수 있다.
+    """
+
+    export_chunk_size = 1000
+    export_buffer_size = 64 * 1024
+    export_content_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv; charset=utf-8",
+    }
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in self.export_content_types:
+            raise ValidationError({"type": [f"Must be one of: {', '.join(self.export_content_types)}."]})
+
+        serializer = self.get_serializer(many=True).child
+        queryset = self.filter_queryset(self.get_queryset())
+        # body는 dispatch가 끝난 뒤에 iterate되므로 지금의 shard/replica로 고정
+        queryset = queryset.using(queryset.db)
+        items = self.iter_export_items(serializer, queryset)
+        if export_type == "csv":
+            lines = self.iter_csv(serializer, items)
+        else:
+            renderer = ORJSONRenderer()
+            lines = (renderer.render(item) + b"\n" for item in items)
+
+        response = StreamingHttpResponse(
+            self._buffered(lines), content_type=self.export_content_types[export_type]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.basename}.{export_type}"'
+        return response
+
+    def iter_export_items(self, serializer, queryset):
+        """pk keyset으로 chunk를 나누어 serialize한 item을 하나씩 yield"""
+        try:
+            builder = ValuesSerializer(serializer)
+        except Unsupported:
+            builder = None
+
+        queryset = queryset.order_by("pk")
+        last = None
+        while True:
+            chunk = queryset if last is None else queryset.filter(pk__gt=last)
+            if builder is None:
+                chunk = list(chunk[:self.export_chunk_size])
+                if not chunk:
+                    return
+                last = chunk[-1].pk
+                yield from (serializer.to_representation(instance) for instance in chunk)
+            else:
+                chunk = list(builder.values(chunk)[:self.export_chunk_size])
+                if not chunk:
+                    return
+                last = chunk[-1][builder.pk]
+                yield from builder.serialize(chunk, using=queryset.db)
+
+    def iter_csv(self, serializer, items):
+        columns = []
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.BaseSerializer) and not isinstance(field, serializers.ListSerializer):
+                columns.extend((field.field_name, child.field_name) for child in field._readable_fields)
+            else:
+                columns.append((field.field_name, None))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values):
+            writer.writerow(values)
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value.encode()
+
+        # Excel에서 한글이 깨지지 않도록 BOM
+        yield codecs.BOM_UTF8 + line(name if child is None else f"{name}.{child}" for name, child in columns)
+        for item in items:
+            yield line(self._csv_value(item[name], child) for name, child in columns)
+
+    @staticmethod
+    def _csv_value(value, child):
+        if child is not None:
+            return None if value is None else value[child]
+        if isinstance(value, list):
+            return importer.join_tag_names(tag["name"] if isinstance(tag, dict) else tag for tag in value)
+        return value
+
+    def _buffered(self, chunks):
+        """작은 line을 export_buffer_size 정도로 모아서 yield"""
+        buffer, size = [], 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= self.export_buffer_size:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+
+class ImportMixin:
+    """
+    POST <list-url>/import/?type=ndjson|csv 로 NDJSON/CSV를 읽어 bulk 생성 (core.importer)
+
+    body에 파일 내용을 그대로 보내거나(Content-Type: application/x-ndjson, text/csv)
+    multipart의 file field로 업로드한다. body 전체를 메모리에 올리지 않고 한 줄씩 처리한다.
+    잘못된 row는 건너뛰고 line 번호와 error를 응답에 포함한다 (최대 import_max_errors개).
+    """
+
+    import_batch_size = 1000
+    import_max_errors = 100
+    import_file_field = "file"
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import")
+    def import_data(self, request, *args, **kwargs):
+        import_type = request.query_params.get("type", "ndjson")
+        if import_type not in importer.PARSERS:
+            raise ValidationError({"type": [f"Must be one of: {', '.join(importer.PARSERS)}."]})
+
+        if request.content_type.startswith("multipart/form-data"):
+            stream = request.FILES.get(self.import_file_field)
+        else:
+            stream = request.stream
+        if stream is None:
+            raise ValidationError({self.import_file_field: ["No file was submitted."]})
+
+        result = importer.Importer(
+            self.get_serializer(),
+            self.bulk_tag_field,
+            request.user,
+            batch_size=self.import_batch_size,
+            max_errors=self.import_max_errors,
+        ).run(stream, import_type)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class SearchMixin:
+    """
+    list/export를 ?q= 검색어로 filter (core.search)
+
+    공백으로 나눈 단어를 모두 포함하는 row만 남긴다.
+    """
+
+    search_query_param = "q"
+    search_actions = ("list", "export")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        query = self.request.query_params.get(self.search_query_param, "").strip()
+        if query and self.action in self.search_actions:
+            queryset = search.search(queryset, query, self.request.user, self.search_pks)
+        return queryset
+
+    @cached_property
+    def search_pks(self):
+        """ConditionalGetMixin 등에서 filter_queryset을 여러 번 호출해도 index는 한번만 조회"""
+        query = self.request.query_params.get(self.search_query_param, "")
+        return search.indexed_pks(self.get_queryset().model, query, self.request.user)
+
+
+class TagFilterMixin:
+    """
+    list/export를 ?tags=1,2&tag_match=all|any 로 filter (core.filters.tagged_pks)
+
+    all(기본)은 tag를 모두 가진 row, any는 하나 이상 가진 row.
+    """
+
+    tag_filter_field = None
+    tags_query_param = "tags"
+    tag_match_query_param = "tag_match"
+    tag_filter_actions = ("list", "export")
+    max_filter_tags = 50
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.tag_filter_actions or self.tag_filter_pks is None:
+            return queryset
+        return queryset.filter(pk__in=self.tag_filter_pks)
+
+    @cached_property
+    def tag_filter_pks(self):
+        """tag filter가 없으면 None, through 테이블은 요청마다 한번만 조회"""
+        tag_ids = self.get_filter_tag_ids()
+        if not tag_ids:
+            return None
+        match = self.request.query_params.get(self.tag_match_query_param, "all")
+        if match not in ("all", "any"):
+            raise ValidationError({self.tag_match_query_param: ["Must be one of: all, any."]})
+        return filters.tagged_pks(getattr(self.get_queryset().model, self.tag_filter_field), tag_ids, match)
+
+    def get_filter_tag_ids(self):
+        value = self.request.query_params.get(self.tags_query_param, "")
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        try:
+            tag_ids = [int(name) for name in names]
+        except ValueError:
+            raise ValidationError({self.tags_query_param: ["Expected a comma separated list of tag ids."]})
+        if len(tag_ids) > self.max_filter_tags:
+            raise ValidationError({self.tags_query_param: [f"At most {self.max_filter_tags} tags are allowed."]})
+        return tag_ids
+
+
+class RangeFilterMixin:
+    """
+    list/export를 ?<field>_min= / ?<field>_max= 범위로 filter (range_filter_fields)
+
+    값은 model field의 to_python으로 검증한다. DateTimeField의 _max에 날짜만 주면 그 날 전체를 포함한다.
+    """
+
+    range_filter_fields = ()
+    range_filter_actions = ("list", "export")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.range_filter_actions and self.range_lookups:
+            queryset = queryset.filter(**self.range_lookups)
+        return queryset
+
+    @cached_property
+    def range_lookups(self):
+        model = self.get_queryset().model
+        lookups, errors = {}, {}
+        for name in self.range_filter_fields:
+            field = model._meta.get_field(name)
+            bounds = {}
+            for suffix, lookup in (("min", "gte"), ("max", "lte")):
+                param = f"{name}_{suffix}"
+                raw = self.request.query_params.get(param, "").strip()
+                if not raw:
+                    continue
+                try:
+                    value = field.to_python(raw)
+                    field.run_validators(value)
+                except DjangoValidationError as exc:
+                    errors[param] = exc.messages
+                    continue
+                if lookup == "lte" and isinstance(field, DateTimeField) and parse_date(raw) is not None:
+                    value, lookup = value + timedelta(days=1), "lt"
+                bounds[suffix] = value
+                lookups[f"{name}__{lookup}"] = value
+            if len(bounds) == 2 and bounds["min"] > bounds["max"]:
+                errors[f"{name}_max"] = [f"Must be greater than or equal to {name}_min."]
+        if errors:
+            raise ValidationError(errors)
+        return lookups
+
+
+class OrderingMixin:
+    """
+    list를 ?ordering=price,-visited_dt 처럼 ordering_fields 안의 field로 정렬
+
+    KeysetPagination이 view.ordering을 정렬/cursor 키로 사용하고 id를 tie-breaker로 붙인다.
+    """
+
+    ordering_fields = ()
+    ordering_query_param = "ordering"
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == "list" and self.ordering:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset
+
+    @cached_property
+    def ordering(self):
+        """?ordering=이 없으면 None (paginator의 기본 정렬)"""
+        value = self.request.query_params.get(self.ordering_query_param, "")
+        ordering = [part.strip() for part in value.split(",") if part.strip()]
+        names = [field[1:] if field.startswith("-") else field for field in ordering]
+        if any(name not in self.ordering_fields for name in names) or len(set(names)) != len(names):
+            raise ValidationError(
+                {self.ordering_query_param: [f"Must be a comma separated list of: {', '.join(self.ordering_fields)}."]}
+            )
+        return ordering or None
+
+
+class TagAutocompleteMixin:
+    """
+    GET <tags-url>/autocomplete/?prefix=ca&limit=10 로 이름이 prefix로 시작하는 tag를 사용 횟수 순으로 조회
+
+    DB 대신 core.autocomplete의 user별 prefix index에서 찾는다.
+    """
+
+    autocomplete_limit = 10
+    autocomplete_max_limit = 50
+
+    @action(detail=False, methods=["get"], url_path="autocomplete")
+    def autocomplete(self, request, *args, **kwargs):
+        prefix = request.query_params.get("prefix", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", self.autocomplete_limit))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        if not 0 < limit <= self.autocomplete_max_limit:
+            raise ValidationError({"limit": [f"Must be between 1 and {self.autocomplete_max_limit}."]})
+
+        tags = tag_index.search(self.get_queryset().model, request.user.pk, prefix, limit)
+        return Response([{"id": tag_id, "name": name, "usage_count": count} for tag_id, name, count in tags])
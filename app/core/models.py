@@ -11,6 +11,7 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from rest_framework.authtoken.models import Token
 
 
 class UserManager(BaseUserManager):
@@ -52,6 +53,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
+class TokenActivity(models.Model):
+    """authtoken token의 마지막 사용 시각 (sliding expiry, core.tokens)"""
+
+    token = models.OneToOneField(Token, on_delete=models.CASCADE, primary_key=True, related_name="activity")
+    last_seen = models.DateTimeField(default=timezone.now, db_index=True)
+
+
+class UserShard(models.Model):
+    """hash ring과 다른 shard로 옮긴 user의 shard (core.sharding, default DB에만 저장)"""
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True)
+    alias = models.CharField(max_length=64)
+
+
 class Camping(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="campings")
     title = models.CharField(max_length=255)
@@ -69,6 +84,13 @@ class Camping(models.Model):
 
     class Meta:
         ordering = ["-update_dt"]
+        indexes = [
+            # keyset pagination: WHERE user_id = ? AND (update_dt, id) < (?, ?)
+            models.Index(fields=["user", "update_dt", "id"], name="camping_user_update_id_idx"),
+            # ?visited_dt_min=&ordering=visited_dt, ?price_max=&ordering=price
+            models.Index(fields=["user", "visited_dt", "id"], name="camping_user_visited_id_idx"),
+            models.Index(fields=["user", "price", "id"], name="camping_user_price_id_idx"),
+        ]
 
 
 class CampingTag(models.Model):
@@ -79,6 +101,8 @@ class CampingTag(models.Model):
     )
 
     name = models.CharField(max_length=255)
+    # 이 tag가 붙은 camping 수 (core.tags, core.signals에서 F()로 갱신)
+    usage_count = models.PositiveIntegerField(default=0)
 
     # slug = models.SlugField(max_length=255, allow_unicode=True, unique=True)
 
@@ -109,6 +133,13 @@ class Recipe(models.Model):
 
     class Meta:
         ordering = ["-update_dt"]
+        indexes = [
+            # keyset pagination: WHERE user_id = ? AND (update_dt, id) < (?, ?)
+            models.Index(fields=["user", "update_dt", "id"], name="recipe_user_update_id_idx"),
+            # ?time_minutes_max=&ordering=time_minutes, ?price_max=&ordering=price
+            models.Index(fields=["user", "time_minutes", "id"], name="recipe_user_minutes_id_idx"),
+            models.Index(fields=["user", "price", "id"], name="recipe_user_price_id_idx"),
+        ]
         verbose_name = _("Recipe", )
         verbose_name_plural = _("Recipe")
 
@@ -117,6 +148,8 @@ class RecipeTag(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, allow_unicode=True)
+    # 이 tag가 붙은 recipe 수 (core.tags, core.signals에서 F()로 갱신)
+    usage_count = models.PositiveIntegerField(default=0)
 
     update_dt = models.DateTimeField(auto_now=True)
     create_dt = models.DateTimeField(auto_now_add=True)
@@ -126,3 +159,18 @@ class RecipeTag(models.Model):
 
     class Meta:
         ordering = ["update_dt"]
+
+
+class SearchTerm(models.Model):
+    """camping/recipe 검색용 inverted index (core.search), row 하나에 검색어 n-gram 하나"""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    camping = models.ForeignKey(Camping, null=True, on_delete=models.CASCADE, related_name="search_terms")
+    recipe = models.ForeignKey(Recipe, null=True, on_delete=models.CASCADE, related_name="search_terms")
+    term = models.CharField(max_length=8)
+
+    class Meta:
+        indexes = [
+            # WHERE user_id = ? AND term IN (...)
+            models.Index(fields=["user", "term"], name="searchterm_user_term_idx"),
+        ]
@@ -0,0 +1,176 @@
+"""
+Pagination classes for the APIs
+"""
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    (update_dt, id) 기준 keyset(cursor) pagination
+
+    다음 페이지는 OFFSET 대신 마지막 row의 정렬 키보다 작은 row를 조회하므로
+    몇 페이지를 넘기든 page_size만큼만 읽고, COUNT(*)는 실행하지 않는다.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    ordering = ("-update_dt", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        self.base_url = request.build_absolute_uri()
+
+        reverse, position = self.decode_cursor(request)
+        ordering = [self._flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(queryset.model, ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_following
+        else:
+            self.has_next, self.has_previous = has_following, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, view):
+        """view에 ordering이 있으면 사용, tie-breaker로 id를 항상 마지막에 둔다"""
+        ordering = list(getattr(view, "ordering", None) or self.ordering)
+        if ordering[-1].lstrip("-") != "id":
+            ordering.append("-id" if ordering[-1].startswith("-") else "id")
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(reverse=False, item=self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(reverse=True, item=self.page[0])
+
+    def encode_cursor(self, reverse, item):
+        position = [self._value(item, field.lstrip("-")) for field in self.ordering]
+        payload = {"r": int(reverse), "p": [self._dump(value) for value in position]}
+        encoded = b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+
+        try:
+            payload = json.loads(b64decode(parse.unquote(encoded).encode()))
+            reverse = bool(payload["r"])
+            position = payload["p"]
+            if len(position) != len(self.ordering):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse, position
+
+    def _after(self, model, ordering, position):
+        """정렬 키 tuple 비교 (a, b) > (x, y)를 OR 조건으로 풀어서 만든다"""
+        values = []
+        for field, raw in zip(ordering, position):
+            model_field = model._meta.get_field(field.lstrip("-"))
+            try:
+                values.append(model_field.to_python(raw))
+            except (TypeError, ValueError, ValidationError):
+                # 변조된 cursor의 값이 문자열/숫자가 아닌 경우 포함
+                raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            prefix = {
+                other.lstrip("-"): value for other, value in zip(ordering[:index], values[:index])
+            }
+            condition |= Q(**prefix, **{f"{name}__{lookup}": values[index]})
+        return condition
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _value(item, name):
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
+
+    @staticmethod
+    def _dump(value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value
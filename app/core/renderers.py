@@ -0,0 +1,101 @@
+"""
+Renderers and parsers for the API
+
+orjson이 설치되어 있으면 orjson으로 encode/decode하고, 없으면 DRF의 JSONRenderer/JSONParser와 같다.
+msgpack이 설치되어 있으면 Accept/Content-Type: application/msgpack으로 MessagePack을 주고받을 수 있다.
+
+    REST_FRAMEWORK = {"DEFAULT_RENDERER_CLASSES": ["core.renderers.ORJSONRenderer", ...]}
+    renderer_classes = [ORJSONRenderer]  # view별로 지정
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson 기반 JSONRenderer
+
+    DRF JSONRenderer와 같은 결과를 내도록 datetime은 UTC면 Z로 끝나는 ISO 8601, 한글은 escape하지 않고,
+    dict의 숫자 key는 문자열로 변환한다. orjson이 직접 처리하지 못하는 값(Decimal, lazy 번역 문자열 등)은
+    DRF의 JSONEncoder로 변환한다. indent를 요청하거나 UNICODE_JSON/COMPACT_JSON 설정을 끈 경우에는
+    DRF JSONRenderer로 render한다.
+    """
+
+    if orjson is not None:
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+        # JavaScript에 그대로 삽입해도 안전하도록 DRF와 같이 U+2028, U+2029 escape
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """orjson 기반 JSONParser"""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer (msgpack 필요)
+
+    datetime, Decimal 등은 JSON 응답과 같은 값이 되도록 DRF의 JSONEncoder로 변환한다.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack parser (msgpack 필요)"""
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,120 @@
+"""
+Full-text search over campings and recipes
+
+SEARCH_BACKEND="index" (기본): SearchTerm 테이블의 inverted index.
+텍스트를 NFKC 정규화, 소문자 변환 후 단어마다 bigram으로 나누어 저장하므로 "캠핑장에서"처럼 조사가 붙은
+한글도 "캠핑"으로 찾을 수 있다. 검색어의 bigram을 모두 가진 row의 id를 (user, term) index로 먼저 찾으므로
+user의 전체 row 수가 아니라 검색어가 나오는 row 수에 비례한다.
+
+SEARCH_BACKEND="fulltext": MySQL FULLTEXT index(ngram parser)를 MATCH ... AGAINST로 조회한다.
+index는 ``manage.py ensure_fulltext_indexes``로 만들고, 이 경우 SearchTerm은 갱신하지 않는다.
+
+두 경우 모두 후보 row를 단어별 icontains로 다시 확인하므로 결과가 같다. 한 글자 단어만으로 된
+검색어는 index를 쓸 수 없어 icontains로만 찾는다.
+"""
+import operator
+import re
+import unicodedata
+from functools import reduce
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Q
+
+from core.filters import candidate_pks
+from core.models import Camping, Recipe, SearchTerm
+
+TOKEN_SIZE = 2
+
+# model: 검색 대상 field
+SEARCH_FIELDS = {
+    Camping: ("title", "review"),
+    Recipe: ("title", "description"),
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text):
+    return _WORD.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+def terms(text):
+    """text의 단어별 bigram, TOKEN_SIZE보다 짧은 단어는 제외"""
+    result = set()
+    for word in words(text):
+        result.update(word[start:start + TOKEN_SIZE] for start in range(len(word) - TOKEN_SIZE + 1))
+    return result
+
+
+def index_enabled():
+    return settings.SEARCH_BACKEND != "fulltext"
+
+
+def index_instances(model, instances, using=None):
+    """instances의 SearchTerm을 새로 만든다 (기존 term은 삭제)"""
+    if not index_enabled() or not instances:
+        return
+    fields = SEARCH_FIELDS[model]
+    column = f"{model._meta.model_name}_id"
+    manager = SearchTerm._default_manager.db_manager(using)
+    manager.filter(**{f"{column}__in": [instance.pk for instance in instances]}).delete()
+    manager.bulk_create([
+        SearchTerm(user_id=instance.user_id, term=term, **{column: instance.pk})
+        for instance in instances
+        for term in terms(" ".join(getattr(instance, field) or "" for field in fields))
+    ])
+
+
+def indexed_pks(model, query, user):
+    """
+    SearchTerm index에서 query의 bigram을 모두 가진 row의 pk (core.filters.candidate_pks)
+
+    index를 사용하지 않거나(fulltext) index로 찾을 수 있는 단어가 없으면 None
+    """
+    long_words = [word for word in words(query) if len(word) >= TOKEN_SIZE]
+    if not index_enabled() or not long_words:
+        return None
+    query_terms = terms(" ".join(long_words))
+    column = model._meta.model_name
+    return candidate_pks(
+        SearchTerm.objects.filter(user=user, term__in=query_terms, **{f"{column}__isnull": False})
+        .values(column)
+        .annotate(matches=Count("term", distinct=True))
+        .filter(matches=len(query_terms))
+        .values_list(column, flat=True)
+    )
+
+
+def search(queryset, query, user, pks=None):
+    """
+    queryset에서 query의 단어를 모두 포함하는 row
+
+    pks에 indexed_pks()의 결과를 넘기면 index를 다시 조회하지 않는다.
+    """
+    fields = SEARCH_FIELDS[queryset.model]
+    query_words = words(query)
+    if not query_words:
+        return queryset.none()
+
+    if pks is None:
+        pks = indexed_pks(queryset.model, query, user)
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    elif not index_enabled() and connections[queryset.db].vendor == "mysql":
+        long_words = [word for word in query_words if len(word) >= TOKEN_SIZE]
+        if long_words:
+            queryset = _match_against(queryset, fields, long_words)
+
+    for word in query_words:
+        queryset = queryset.filter(reduce(operator.or_, (Q(**{f"{field}__icontains": word}) for field in fields)))
+    return queryset
+
+
+def _match_against(queryset, fields, query_words):
+    """ngram parser의 BOOLEAN MODE에서 "..."는 ngram phrase 검색, 단어는 \\w+이므로 escape가 필요 없다"""
+    quote = connections[queryset.db].ops.quote_name
+    table = quote(queryset.model._meta.db_table)
+    columns = ", ".join(f"{table}.{quote(field)}" for field in fields)
+    against = " ".join(f'+"{word}"' for word in query_words)
+    return queryset.extra(where=[f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)"], params=[against])
@@ -0,0 +1,160 @@
+"""
+User-id based sharding for the camping/recipe data
+
+Camping, Recipe, tag와 M2M through row는 user별로 DATABASE_SHARDS 중 한 DB에 저장된다.
+user → shard는 consistent hashing으로 정하고, move_user_shard로 옮긴 user는 UserShard에 기록한다.
+shard DB에는 FK 제약조건을 위해 user row의 복사본(shadow)을 둔다.
+"""
+import bisect
+import contextvars
+import copy
+import hashlib
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+
+from core.cache import get_cache
+
+_current_shard = contextvars.ContextVar("current_shard", default=None)
+
+# 이 process에서 shadow user 존재를 확인한 (alias, user_id)
+_shadowed = set()
+
+
+class HashRing:
+    """virtual node를 둔 consistent hash ring"""
+
+    def __init__(self, nodes, vnodes=64):
+        self._ring = sorted(
+            (self._hash(f"{node}#{index}"), node) for node in nodes for index in range(vnodes)
+        )
+        self._hashes = [point for point, _ in self._ring]
+
+    def get_node(self, key):
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._hashes, self._hash(str(key))) % len(self._ring)
+        return self._ring[index][1]
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+@lru_cache(maxsize=None)
+def _ring(shards):
+    return HashRing(shards)
+
+
+def get_ring():
+    return _ring(tuple(settings.DATABASE_SHARDS))
+
+
+def _shard_key(user_id):
+    return f"shard:{user_id}"
+
+
+def shard_for_user(user_id):
+    """user의 data가 저장된 shard alias, sharding을 사용하지 않으면 None"""
+    if not settings.DATABASE_SHARDS:
+        return None
+
+    cache = get_cache()
+    alias = cache.get(_shard_key(user_id))
+    if alias is None:
+        from core.models import UserShard
+
+        alias = UserShard.objects.filter(user_id=user_id).values_list("alias", flat=True).first()
+        if alias not in settings.DATABASE_SHARDS:
+            alias = get_ring().get_node(user_id)
+        cache.set(_shard_key(user_id), alias, settings.SHARD_CACHE_TIMEOUT)
+    return alias
+
+
+def forget_user(user_id):
+    """
+    cache된 user → shard 매핑 제거
+
+    매핑은 API cache(settings.API_CACHE_ALIAS)에 있으므로 worker간 공유되는 cache여야 모든 worker에
+    반영된다. settings는 DATABASE_SHARDS가 있으면 LocMemCache로 기동하지 않는다.
+    """
+    get_cache().delete(_shard_key(user_id))
+
+
+def get_current_shard():
+    return _current_shard.get()
+
+
+def activate(alias):
+    """현재 context의 shard 설정, deactivate()에 넘길 token 반환"""
+    return _current_shard.set(alias)
+
+
+def deactivate(token):
+    _current_shard.reset(token)
+
+
+@contextmanager
+def use_shard(alias):
+    """block 안에서 sharding 대상 model을 alias shard에서 읽고 쓴다"""
+    token = activate(alias)
+    try:
+        yield
+    finally:
+        deactivate(token)
+
+
+def atomic(model):
+    """model이 저장되는 DB(현재 shard)에서 transaction을 여는 decorator"""
+
+    def decorator(func):
+        @wraps(func)
+        def inner(*args, **kwargs):
+            with transaction.atomic(using=router.db_for_write(model)):
+                return func(*args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+def ensure_shadow_user(alias, user):
+    """shard에 user row 복사본이 없으면 생성"""
+    if alias is None or alias == DEFAULT_DB_ALIAS or (alias, user.pk) in _shadowed:
+        return
+
+    User = get_user_model()
+    if not User.objects.using(alias).filter(pk=user.pk).exists():
+        shadow = copy.copy(user)
+        # 인증은 항상 default DB에서 하므로 password는 복사하지 않음
+        shadow.set_unusable_password()
+        User.objects.using(alias).bulk_create([shadow], ignore_conflicts=True)
+    _shadowed.add((alias, user.pk))
+
+
+def sync_shadow_user(user):
+    """이름 변경 등을 user가 속한 shard의 shadow row에 반영"""
+    alias = shard_for_user(user.pk)
+    if alias is None or alias == DEFAULT_DB_ALIAS:
+        return
+
+    User = get_user_model()
+    fields = {
+        field.attname: getattr(user, field.attname)
+        for field in User._meta.concrete_fields
+        if not field.primary_key and field.name != "password"
+    }
+    User.objects.using(alias).filter(pk=user.pk).update(**fields)
+
+
+def delete_user_data(user_id):
+    """user가 삭제되면 모든 shard에서 shadow row와 data를 삭제"""
+    User = get_user_model()
+    for alias in settings.DATABASE_SHARDS:
+        if alias != DEFAULT_DB_ALIAS:
+            User.objects.using(alias).filter(pk=user_id).delete()
+        _shadowed.discard((alias, user_id))
+    forget_user(user_id)
@@ -0,0 +1,188 @@
+"""
+Signal handlers for the core models
+"""
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, F, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core import search, sharding
+from core.authentication import token_cache
+from core.autocomplete import tag_index
+from core.db.indexes import ensure_through_indexes
+from core.cache import bump_generation
+from core.models import Camping, CampingTag, Recipe, RecipeTag, TokenActivity
+from core.tags import count_usage
+
+USER_OWNED_MODELS = (Camping, CampingTag, Recipe, RecipeTag)
+# model: tag를 연결하는 M2M
+TAG_FIELDS = {Camping: Camping.camping_tags, Recipe: Recipe.recipe_tags}
+
+
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """user 소유 객체가 바뀌면 해당 user의 cache generation을 올린다"""
+    bump_generation(instance.user_id)
+
+
+for model in USER_OWNED_MODELS:
+    post_save.connect(invalidate_owner_cache, sender=model, dispatch_uid=f"cache-save-{model.__name__}")
+    post_delete.connect(invalidate_owner_cache, sender=model, dispatch_uid=f"cache-delete-{model.__name__}")
+
+
+@receiver(m2m_changed, sender=Camping.camping_tags.through)
+@receiver(m2m_changed, sender=Recipe.recipe_tags.through)
+def invalidate_tagged_cache(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        bump_generation(instance.user_id)
+
+
+@receiver(post_save, sender=Camping)
+@receiver(post_save, sender=Recipe)
+def update_search_index(sender, instance, using, update_fields, **kwargs):
+    fields = search.SEARCH_FIELDS[sender]
+    if update_fields is None or set(update_fields) & set(fields):
+        search.index_instances(sender, [instance], using=using)
+
+
+@receiver(post_save, sender=CampingTag)
+@receiver(post_save, sender=RecipeTag)
+def update_tag_index(sender, instance, created, using, **kwargs):
+    """tag 생성/이름 변경을 autocomplete index에 반영"""
+    tag_index.update(
+        sender, instance.user_id, "put", instance.pk, instance.name, 0 if created else None, using=using
+    )
+
+
+@receiver(post_delete, sender=CampingTag)
+@receiver(post_delete, sender=RecipeTag)
+def remove_from_tag_index(sender, instance, using, **kwargs):
+    tag_index.update(sender, instance.user_id, "remove", instance.pk, using=using)
+
+
+@receiver(pre_delete, sender=Camping)
+@receiver(pre_delete, sender=Recipe)
+def release_tag_usage(sender, instance, using, origin=None, **kwargs):
+    """
+    cascade로 지워질 tag 연결 수만큼 usage_count를 줄인다
+
+    queryset.delete()는 instance마다 signal을 보내므로 첫 instance에서 queryset 전체의 연결을 tag별로 세어
+    UPDATE 한번으로 줄이고 나머지 instance는 건너뛴다. user 삭제처럼 tag도 함께 지워지는 cascade에서는 건너뛴다.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not sender:
+        return
+    if isinstance(origin, QuerySet):
+        if getattr(origin, "_tag_usage_released", False):
+            return
+        origin._tag_usage_released = True
+        deleted = origin.values("pk")
+    else:
+        deleted = [instance.pk]
+
+    descriptor = TAG_FIELDS[sender]
+    field = descriptor.field
+    tag = field.m2m_reverse_field_name()
+    links = (
+        descriptor.through.objects.using(using)
+        .filter(**{f"{field.m2m_field_name()}__in": deleted})
+        .values(tag, f"{tag}__user")
+        .annotate(n=Count("pk"))
+        .values_list(f"{tag}__user", tag, "n")
+    )
+    count_usage(descriptor, {(user_id, tag_pk): -n for user_id, tag_pk, n in links}, using=using)
+
+
+@receiver(post_delete, sender=Camping)
+@receiver(post_delete, sender=Recipe)
+def invalidate_tag_index(sender, instance, using, **kwargs):
+    """cascade로 지워진 tag 연결은 어떤 tag인지 알 수 없으므로 user의 index를 다시 만든다"""
+    tag_index.invalidate(TAG_FIELDS[sender].field.related_model, instance.user_id, using=using)
+
+
+@receiver(m2m_changed, sender=Camping.camping_tags.through)
+@receiver(m2m_changed, sender=Recipe.recipe_tags.through)
+def count_tag_usage(sender, instance, action, reverse, model, pk_set, using, **kwargs):
+    """
+    .add()/.remove()/.clear()에 맞춰 usage_count를 F()로 갱신 (serializer/bulk 쓰기는 core.tags.count_usage)
+
+    remove/clear는 삭제 전에 실제로 있는 연결만 센다. autocomplete index는 add만 그대로 반영하고
+    remove/clear 후에는 어떤 tag가 바뀌었는지 알 수 없으므로 다시 만든다.
+    """
+    tag_model = type(instance) if reverse else model
+    tags = tag_model.objects.using(using)
+    usage_count = F("usage_count")
+    if action == "post_add" and pk_set:
+        if reverse:
+            tags.filter(pk=instance.pk).update(usage_count=usage_count + len(pk_set))
+            tag_index.update(tag_model, instance.user_id, "incr", instance.pk, len(pk_set), using=using)
+        else:
+            tags.filter(pk__in=pk_set).update(usage_count=usage_count + 1)
+            for tag_pk in pk_set:
+                tag_index.update(tag_model, instance.user_id, "incr", tag_pk, 1, using=using)
+    elif action in ("pre_remove", "pre_clear"):
+        field = next(descriptor.field for descriptor in TAG_FIELDS.values() if descriptor.through is sender)
+        if reverse:
+            links = sender.objects.using(using).filter(**{field.m2m_reverse_field_name(): instance.pk})
+            if pk_set is not None:
+                links = links.filter(**{f"{field.m2m_field_name()}__in": pk_set})
+            removed = links.count()
+            if removed:
+                tags.filter(pk=instance.pk).update(usage_count=usage_count - removed)
+        else:
+            linked = tags.filter(**{field.related_query_name(): instance.pk})
+            if pk_set is not None:
+                linked = linked.filter(pk__in=pk_set)
+            linked.update(usage_count=usage_count - 1)
+    elif action in ("post_remove", "post_clear"):
+        tag_index.invalidate(tag_model, instance.user_id, using=using)
+
+
+@receiver(post_save, sender=get_user_model())
+def reset_new_user_cache(sender, instance, created, **kwargs):
+    """id가 재사용되더라도 이전 user의 cache를 보지 않도록 새 user는 generation을 새로 시작"""
+    if created:
+        bump_generation(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """비활성화 등 user가 바뀌면 cache된 인증 정보 제거"""
+    if not created:
+        token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def sync_shadow_user(sender, instance, created, using, **kwargs):
+    """default DB의 user가 바뀌면 shard의 shadow row도 갱신"""
+    if not created and using == DEFAULT_DB_ALIAS:
+        sharding.sync_shadow_user(instance)
+
+
+@receiver(post_delete, sender=get_user_model())
+def delete_sharded_data(sender, instance, using, **kwargs):
+    """user 삭제 시 shard에 있는 data도 삭제 (shard의 user row 삭제가 cascade)"""
+    if using == DEFAULT_DB_ALIAS:
+        sharding.delete_user_data(instance.pk)
+
+
+@receiver(post_save, sender=Token)
+def create_token_activity(sender, instance, created, using, **kwargs):
+    """새 token은 발급 시각을 마지막 사용 시각으로 activity row를 만든다 (core.tokens.expired_tokens)"""
+    if created:
+        TokenActivity.objects.using(using).create(token=instance, last_seen=instance.created)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    """로그아웃/재발급으로 token이 바뀌면 cache에서 제거"""
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_migrate)
+def create_through_indexes(sender, using, **kwargs):
+    """Meta.indexes로 만들 수 없는 M2M through 테이블 index 생성"""
+    if sender.name == "core":
+        ensure_through_indexes(using)
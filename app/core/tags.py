@@ -0,0 +1,154 @@
+"""
+Helpers for resolving and attaching tags in bulk
+
+signal 없이 bulk로 쓰므로 연결 수 변화는 tag의 usage_count와 core.autocomplete index에 직접 반영한다.
+"""
+from collections import Counter
+
+from django.db import connections, router
+from django.db.models import Case, F, IntegerField, Max, Value, When
+from django.db.models.functions import Lower
+
+from core.autocomplete import tag_index
+
+
+def get_or_create_tags(tag_model, user, tags):
+    """
+    tag payload(dict 목록)를 이름 기준으로 한번에 조회하고, 없는 태그만 bulk_create
+
+    이름은 MySQL의 case-insensitive collation(이전의 get_or_create)처럼 대소문자를 구분하지 않고 비교한다.
+    payload 순서를 유지한 {name: tag} dict를 반환한다 (대소문자만 다른 이름은 같은 tag).
+    """
+    names = list(dict.fromkeys(tag["name"] for tag in tags))
+    if not names:
+        return {}
+    keys = {}
+    for name in names:
+        keys.setdefault(name.lower(), name)
+
+    resolved = {}
+    existing = (
+        tag_model.objects.filter(user=user)
+        .annotate(name_key=Lower("name"))
+        .filter(name_key__in=list(keys))
+        .order_by("pk")
+    )
+    for tag in existing:
+        resolved.setdefault(tag.name.lower(), tag)
+
+    missing = [tag_model(user=user, name=name) for key, name in keys.items() if key not in resolved]
+    if missing:
+        last = None
+        if not connections[router.db_for_write(tag_model)].features.can_return_rows_from_bulk_insert:
+            last = tag_model.objects.filter(user=user).aggregate(last=Max("pk"))["last"] or 0
+        created = tag_model.objects.bulk_create(missing)
+        if last is not None:
+            # MySQL은 bulk insert 후 pk를 돌려주지 않으므로 이번에 insert한 row만 다시 조회
+            created = tag_model.objects.filter(user=user, pk__gt=last, name__in=[tag.name for tag in missing])
+        for tag in created:
+            resolved.setdefault(tag.name.lower(), tag)
+            tag_index.update(tag_model, user.pk, "put", tag.pk, tag.name, 0)
+
+    return {name: resolved[name.lower()] for name in names}
+
+
+def through_row(descriptor, instance_pk, tag_pk):
+    """M2M through model row 생성"""
+    field = descriptor.field
+    return descriptor.through(**{
+        f"{field.m2m_field_name()}_id": instance_pk,
+        f"{field.m2m_reverse_field_name()}_id": tag_pk,
+    })
+
+
+def add_tags(descriptor, links):
+    """
+    links: [(instance, [tag, ...]), ...]
+
+    모든 instance의 tag 연결을 through 테이블에 한번의 bulk insert로 추가한다.
+    새로 생성된 instance처럼 기존 연결이 없는 경우에 사용.
+    """
+    # 대소문자만 다른 이름은 같은 tag로 resolve되므로 instance마다 한번만 연결
+    links = [(instance, list({tag.pk: tag for tag in tags}.values())) for instance, tags in links]
+    rows = [
+        through_row(descriptor, instance.pk, tag.pk)
+        for instance, tags in links
+        for tag in tags
+    ]
+    if rows:
+        descriptor.through.objects.bulk_create(rows)
+        count_usage(descriptor, Counter((instance.user_id, tag.pk) for instance, tags in links for tag in tags))
+
+
+def count_usage(descriptor, deltas, using=None):
+    """
+    deltas: {(user_id, tag_pk): 연결 수 변화}
+
+    usage_count는 F()로 더하는 UPDATE 한번으로 갱신하므로 동시에 들어온 요청의 변화도 잃지 않는다.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    tag_model = descriptor.field.related_model
+    tag_model.objects.using(using).filter(pk__in=[tag_pk for _, tag_pk in deltas]).update(
+        usage_count=F("usage_count") + Case(
+            *[When(pk=tag_pk, then=Value(delta)) for (_, tag_pk), delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    for (user_id, tag_pk), delta in deltas.items():
+        tag_index.update(tag_model, user_id, "incr", tag_pk, delta, using=using)
+
+
+def update_tag(tag, data):
+    """tag serializer의 update, usage_count를 덮어쓰지 않도록 바뀐 field(auto_now 포함)만 저장"""
+    for attr, value in data.items():
+        setattr(tag, attr, value)
+    fields = set(data) | {field.name for field in tag._meta.concrete_fields if getattr(field, "auto_now", False)}
+    tag.save(update_fields=sorted(fields))
+    return tag
+
+
+def sync_tags(descriptor, links):
+    """
+    links: [(instance, [tag, ...]), ...]
+
+    기존 연결과 비교하여 빠진 tag 연결만 삭제하고 새로 생긴 연결만 추가한다.
+    변경이 없으면 현재 연결을 조회하는 쿼리 한번으로 끝난다.
+    """
+    links = [(instance, {tag.pk for tag in tags}) for instance, tags in links]
+    if not links:
+        return
+
+    field = descriptor.field
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+
+    current = {}
+    rows = descriptor.through.objects.filter(
+        **{f"{source}__in": [instance.pk for instance, _ in links]}
+    ).values_list("pk", source, target)
+    for row_pk, instance_pk, tag_pk in rows:
+        current.setdefault(instance_pk, {})[tag_pk] = row_pk
+
+    removed, added = [], []
+    deltas = Counter()
+    for instance, tag_pks in links:
+        existing = current.get(instance.pk, {})
+        for tag_pk, row_pk in existing.items():
+            if tag_pk not in tag_pks:
+                removed.append(row_pk)
+                deltas[instance.user_id, tag_pk] -= 1
+        for tag_pk in tag_pks - existing.keys():
+            added.append(through_row(descriptor, instance.pk, tag_pk))
+            deltas[instance.user_id, tag_pk] += 1
+        # prefetch된 tag 목록은 더 이상 유효하지 않음
+        getattr(instance, "_prefetched_objects_cache", {}).pop(field.name, None)
+
+    if removed:
+        descriptor.through.objects.filter(pk__in=removed).delete()
+    if added:
+        descriptor.through.objects.bulk_create(added)
+    count_usage(descriptor, deltas)
@@ -0,0 +1,115 @@
+"""
+Tests for the cached token authentication
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import TokenCache, token_cache
+from utils.functools import create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+ME_URL = reverse("user:me")
+TOKEN_URL = reverse("user:token")
+LOGOUT_URL = reverse("user:logout")
+
+
+def token_queries(queries):
+    return [query for query in queries.captured_queries if Token._meta.db_table in query["sql"]]
+
+
+class TokenCacheTests(TestCase):
+    """TokenCache 단위 테스트"""
+
+    @override_settings(AUTH_TOKEN_CACHE_SIZE=2)
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache()
+        user = create_user()
+        cache.set("a", (user, None))
+        cache.set("b", (user, None))
+        cache.get("a")
+        cache.set("c", (user, None))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(len(cache), 2)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_ttl_zero_disables_cache(self):
+        cache = TokenCache()
+        cache.set("a", (create_user(), None))
+
+        self.assertIsNone(cache.get("a"))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """token 인증 cache 테스트"""
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_second_request_skips_token_query(self):
+        """두번째 요청부터 authtoken 조회 쿼리 없음"""
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(CAMPING_URL)
+        with CaptureQueriesContext(connection) as second:
+            res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(token_queries(first)), 1)
+        self.assertEqual(token_queries(second), [])
+
+    def test_invalid_token_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """비활성화된 user는 cache가 있어도 거부"""
+        self.client.get(CAMPING_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalidates_token(self):
+        """로그아웃하면 token 삭제 및 cache 제거"""
+        self.client.get(CAMPING_URL)
+
+        res = self.client.post(LOGOUT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertEqual(self.client.get(CAMPING_URL).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_regeneration_invalidates_cache(self):
+        """token을 다시 발급하면 이전 token은 거부"""
+        self.client.get(CAMPING_URL)
+        self.token.delete()
+        Token.objects.create(user=self.user)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_is_visible(self):
+        """user 정보 수정 후 cache된 user가 아닌 최신 정보 조회"""
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {"name": "new name"})
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["name"], "new name")
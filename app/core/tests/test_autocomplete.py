@@ -0,0 +1,152 @@
+"""
+Tests for the tag autocomplete index
+"""
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.autocomplete import PrefixIndex, tag_index
+from core.models import Camping, CampingTag, RecipeTag
+from utils.functools import create_user
+
+AUTOCOMPLETE_URL = reverse("camping:campingtag-autocomplete")
+CAMPING_URL = reverse("camping:camping-list")
+
+
+class PrefixIndexTests(SimpleTestCase):
+    """PrefixIndex 테스트"""
+
+    def setUp(self):
+        self.index = PrefixIndex([(1, "Camp", 3), (2, "campfire", 5), (3, "canoe", 9), (4, "Lake", 1)])
+
+    def test_search(self):
+        self.assertEqual(self.index.search("cam", 10), [(2, "campfire", 5), (1, "Camp", 3)])
+        self.assertEqual(self.index.search("CA", 2), [(3, "canoe", 9), (2, "campfire", 5)])
+        self.assertEqual(self.index.search("x", 10), [])
+
+    def test_ranked_scan(self):
+        """prefix 범위가 scan_limit보다 크면 사용 횟수 순 목록에서 찾음"""
+        with mock.patch.object(PrefixIndex, "scan_limit", 1):
+            self.assertEqual(self.index.search("ca", 2), [(3, "canoe", 9), (2, "campfire", 5)])
+            self.assertEqual(self.index.search("", 1), [(3, "canoe", 9)])
+
+    def test_updates(self):
+        self.index.put(5, "camper")
+        self.index.put(3, "lakeside")
+        self.index.incr(1, 4)
+        self.index.remove(2)
+        self.index.incr(2, 1)
+
+        self.assertEqual(self.index.search("ca", 10), [(1, "Camp", 7), (5, "camper", 0)])
+        self.assertEqual(self.index.search("lake", 10), [(3, "lakeside", 9), (4, "Lake", 1)])
+
+
+class AutocompleteApiTests(TestCase):
+    """autocomplete API 테스트"""
+
+    def setUp(self):
+        tag_index.clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_camping(self, *tags):
+        """index 갱신은 commit 후에 실행되므로 callback을 바로 실행"""
+        payload = {
+            "title": "DeepForest",
+            "visited_dt": "2022-12-03",
+            "review": "Some review",
+            "price": 50000,
+            "camping_tags": [{"name": name} for name in tags],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(CAMPING_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data
+
+    def autocomplete(self, **params):
+        res = self.client.get(AUTOCOMPLETE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(tag["name"], tag["usage_count"]) for tag in res.data]
+
+    def test_top_tags(self):
+        self.create_camping("campfire", "canoe")
+        self.create_camping("canoe")
+        CampingTag.objects.create(user=self.user, name="cabin")
+        CampingTag.objects.create(user=create_user(email="other@example.com"), name="car")
+
+        self.assertEqual(self.autocomplete(prefix="ca"), [("canoe", 2), ("campfire", 1), ("cabin", 0)])
+        self.assertEqual(self.autocomplete(prefix="Cam"), [("campfire", 1)])
+        self.assertEqual(self.autocomplete(prefix="ca", limit=1), [("canoe", 2)])
+
+    def test_incremental_update(self):
+        """index를 만든 뒤에는 tag 변경을 DB에서 다시 읽지 않고 반영"""
+        self.create_camping("canoe")
+        self.autocomplete(prefix="c")
+        camping = self.create_camping("canoe", "campfire")
+        tag = CampingTag.objects.get(name="campfire")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse("camping:campingtag-detail", args=[tag.id]), {"name": "cabin"})
+            self.client.patch(
+                reverse("camping:camping-detail", args=[camping["id"]]),
+                {"camping_tags": [{"name": "cabin"}]},
+                format="json",
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            tags = self.autocomplete(prefix="c")
+
+        self.assertEqual(tags, [("cabin", 1), ("canoe", 1)])
+        self.assertFalse(any("core_campingtag" in query["sql"] for query in queries.captured_queries))
+
+    def test_delete(self):
+        camping = self.create_camping("canoe", "campfire")
+        self.autocomplete(prefix="c")
+        with self.captureOnCommitCallbacks(execute=True):
+            CampingTag.objects.get(name="campfire").delete()
+        self.assertEqual(self.autocomplete(prefix="c"), [("canoe", 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Camping.objects.get(id=camping["id"]).delete()
+        self.assertEqual(self.autocomplete(prefix="c"), [("canoe", 0)])
+
+    def test_m2m_add(self):
+        tag = CampingTag.objects.create(user=self.user, name="canoe")
+        self.autocomplete(prefix="c")
+        with self.captureOnCommitCallbacks(execute=True):
+            Camping.objects.create(
+                user=self.user, title="DeepForest", visited_dt="2022-12-03", review="review", price=1
+            ).camping_tags.add(tag)
+
+        self.assertEqual(self.autocomplete(prefix="c"), [("canoe", 1)])
+
+    def test_rollback_not_applied(self):
+        """rollback된 쓰기는 index에 반영하지 않음"""
+        self.create_camping("canoe")
+        self.autocomplete(prefix="c")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                CampingTag.objects.create(user=self.user, name="cabin")
+                CampingTag.objects.get(name="canoe").delete()
+                raise RuntimeError
+
+        self.assertEqual(self.autocomplete(prefix="c"), [("canoe", 1)])
+
+    def test_invalid_limit(self):
+        for limit in ("x", 0, 51):
+            res = self.client.get(AUTOCOMPLETE_URL, {"prefix": "c", "limit": limit})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, limit)
+
+    def test_recipe(self):
+        RecipeTag.objects.create(user=self.user, name="soup")
+        CampingTag.objects.create(user=self.user, name="sea")
+
+        res = self.client.get(reverse("recipe:recipetag-autocomplete"), {"prefix": "s"})
+
+        self.assertEqual([tag["name"] for tag in res.data], ["soup"])
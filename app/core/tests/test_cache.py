@@ -0,0 +1,143 @@
+"""
+Tests for the per-user list cache
+"""
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import cache, metrics
+from core.models import CampingTag
+from utils.functools import create_camping, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+CAMPING_TAG_URL = reverse("camping:campingtag-list")
+
+
+class GenerationTests(TestCase):
+    """generation counter 테스트"""
+
+    def test_bump_changes_payload_key(self):
+        """generation을 올리면 같은 url이라도 key가 바뀜"""
+        user = create_user()
+        key = cache.payload_key(user.pk, "camping", "http://testserver/camping/campings/")
+
+        cache.bump_generation(user.pk)
+
+        self.assertNotEqual(key, cache.payload_key(user.pk, "camping", "http://testserver/camping/campings/"))
+
+    def test_generation_recovers_after_eviction(self):
+        """generation key가 사라져도 이전 값과 겹치지 않음"""
+        user = create_user()
+        before = cache.get_generation(user.pk)
+        cache.get_cache().delete(f"api:gen:{user.pk}")
+
+        self.assertGreater(cache.get_generation(user.pk), before)
+
+
+class CachedListAPITests(TestCase):
+    """list 응답 cache 테스트"""
+
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        metrics.reset()
+
+    def test_second_list_served_from_cache(self):
+        """두번째 조회는 validator 조회 외에 DB를 거치지 않음"""
+        create_camping(self.user)
+        first = self.client.get(CAMPING_URL)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(CAMPING_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(metrics.snapshot()["api_cache.hits"], 1)
+        self.assertEqual(metrics.snapshot()["api_cache.misses"], 1)
+
+    def test_cache_is_per_user(self):
+        """다른 user의 cache를 보지 않음"""
+        create_camping(self.user)
+        self.client.get(CAMPING_URL)
+        other = create_user(email="other@example.com")
+        self.client.force_authenticate(other)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"], [])
+
+    def test_api_write_invalidates_list(self):
+        """API로 생성하면 list cache 무효화"""
+        self.client.get(CAMPING_URL)
+        payload = dict(title="new", visited_dt="2022-12-03", review="review", price=1)
+        self.client.post(CAMPING_URL, payload)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_bulk_write_invalidates_list(self):
+        """signal이 없는 bulk 쓰기도 list cache 무효화"""
+        camping = create_camping(self.user, title="before")
+        self.client.get(CAMPING_URL)
+        payload = [dict(op="update", id=camping.id, data=dict(title="after"))]
+        self.client.post(reverse("camping:camping-bulk"), payload, format="json")
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.data["results"][0]["title"], "after")
+
+    def test_tag_rename_invalidates_camping_list(self):
+        """tag 이름을 바꾸면 tag를 포함한 camping list도 무효화"""
+        tag = CampingTag.objects.create(user=self.user, name="old")
+        create_camping(self.user).camping_tags.add(tag)
+        self.client.get(CAMPING_URL)
+        self.client.get(CAMPING_TAG_URL)
+
+        self.client.patch(reverse("camping:campingtag-detail", args=[tag.id]), {"name": "new"})
+
+        campings = self.client.get(CAMPING_URL)
+        tags = self.client.get(CAMPING_TAG_URL)
+        self.assertEqual(campings.data["results"][0]["camping_tags"][0]["name"], "new")
+        self.assertEqual(tags.data[0]["name"], "new")
+
+    def test_orm_write_invalidates_list(self):
+        """ORM으로 삭제해도 signal로 무효화"""
+        camping = create_camping(self.user)
+        self.client.get(CAMPING_URL)
+        camping.delete()
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+
+class MetricsAPITests(TestCase):
+    """metrics API 테스트"""
+
+    def test_metrics_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(create_user())
+
+        res = client.get(reverse("metrics"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_reports_cache_counters(self):
+        admin = create_user(email="admin@example.com")
+        admin.is_staff = True
+        admin.save()
+        client = APIClient()
+        client.force_authenticate(admin)
+        metrics.reset()
+        client.get(CAMPING_URL)
+
+        res = client.get(reverse("metrics"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["api_cache.misses"], 1)
@@ -0,0 +1,134 @@
+"""
+Tests for the response compression middleware
+"""
+import gzip
+import json
+from unittest import skipUnless
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import cache, metrics
+from core.middleware import CompressionMiddleware, brotli
+from core.models import Camping
+from utils.functools import create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    """CompressionMiddleware 단위 테스트"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        metrics.reset()
+
+    def process(self, response, accept_encoding="gzip"):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_cached_body_requires_same_content(self):
+        """같은 cache key, 같은 길이라도 내용이 다르면 압축 결과를 재사용하지 않음"""
+        cache.get_cache().clear()
+        bodies = [json.dumps([{"price": price}] * 200).encode() for price in (1000, 2000)]
+        results = []
+        for body in bodies:
+            response = HttpResponse(body, content_type="application/json")
+            response.compression_cache_key = "compression-test"
+            results.append(gzip.decompress(self.process(response).content))
+
+        self.assertEqual(results, bodies)
+        self.assertNotIn("compression.cache_hits", metrics.snapshot())
+
+    def test_gzip(self):
+        body = json.dumps([{"title": "캠핑"}] * 200).encode()
+
+        res = self.process(HttpResponse(body, content_type="application/json"))
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(res["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(res.content), body)
+        self.assertEqual(int(res["Content-Length"]), len(res.content))
+        self.assertIn("compress;dur=", res["Server-Timing"])
+        self.assertEqual(metrics.snapshot()["compression.bytes_saved"], len(body) - len(res.content))
+
+    def test_small_body_not_compressed(self):
+        res = self.process(HttpResponse(b'{"a": 1}', content_type="application/json"))
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_without_accept_encoding(self):
+        res = self.process(HttpResponse(b"x" * 4096, content_type="application/json"), accept_encoding="")
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+        self.assertEqual(res["Vary"], "Accept-Encoding")
+
+    def test_refused_encoding(self):
+        res = self.process(HttpResponse(b"x" * 4096, content_type="text/csv"), accept_encoding="gzip;q=0, br;q=0")
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_incompressible_type_skipped(self):
+        res = self.process(HttpResponse(b"x" * 4096, content_type="image/png"))
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    @skipUnless(brotli, "requires brotli")
+    def test_brotli_preferred(self):
+        body = b"x" * 4096
+
+        res = self.process(HttpResponse(body, content_type="application/json"), accept_encoding="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(res.content), body)
+
+    def test_etag_weakened(self):
+        response = HttpResponse(b"x" * 4096, content_type="application/json")
+        response["ETag"] = '"abc"'
+
+        res = self.process(response)
+
+        self.assertEqual(res["ETag"], 'W/"abc"')
+
+    def test_streaming(self):
+        chunks = [json.dumps({"id": index, "title": "캠핑"}).encode() + b"\n" for index in range(500)]
+        response = StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson")
+
+        res = self.process(response)
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(res.streaming_content)), b"".join(chunks))
+        self.assertEqual(metrics.snapshot()["compression.bytes_in"], len(b"".join(chunks)))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressedListAPITests(TestCase):
+    """cache된 list 응답의 압축 결과 재사용"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index in range(20):
+            Camping.objects.create(user=self.user, title=f"캠핑 {index}", visited_dt="2022-12-03", review="x", price=1)
+        metrics.reset()
+
+    def test_cache_hit_reuses_compressed_body(self):
+        first = self.client.get(CAMPING_URL, HTTP_ACCEPT_ENCODING="gzip")
+        second = self.client.get(CAMPING_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(json.loads(gzip.decompress(second.content))["results"][0]["title"], "캠핑 19")
+        self.assertEqual(metrics.snapshot()["compression.cache_hits"], 1)
+        self.assertIn("compress;dur=0.00", second["Server-Timing"])
+
+    def test_weak_etag_revalidates(self):
+        first = self.client.get(CAMPING_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        res = self.client.get(CAMPING_URL, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertTrue(first["ETag"].startswith("W/"))
+        self.assertEqual(res.status_code, 304)
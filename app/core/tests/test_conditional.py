@@ -0,0 +1,153 @@
+"""
+Tests for ETag conditional GET
+"""
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import CampingTag, Recipe
+from utils.functools import create_camping, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+def camping_detail_url(camping_id):
+    return reverse("camping:camping-detail", args=[camping_id])
+
+
+class ConditionalGetTests(TestCase):
+    """조건부 GET 테스트"""
+
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_returns_validators(self):
+        """list 응답에 ETag 포함"""
+        create_camping(self.user)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["ETag"].startswith('"'))
+        self.assertIn("private", res["Cache-Control"])
+
+    def test_list_not_modified_before_serialization(self):
+        """If-None-Match가 일치하면 aggregate 한번으로 304"""
+        create_camping(self.user)
+        etag = self.client.get(CAMPING_URL)["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(CAMPING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_list_modified_after_write(self):
+        """쓰기 후에는 같은 ETag로 요청해도 200"""
+        camping = create_camping(self.user)
+        etag = self.client.get(CAMPING_URL)["ETag"]
+        self.client.patch(camping_detail_url(camping.id), {"title": "new"})
+
+        res = self.client.get(CAMPING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_list_etag_changes_after_delete(self):
+        """최신 row가 아닌 row를 삭제해도 ETag가 바뀜"""
+        old = create_camping(self.user, title="old")
+        create_camping(self.user, title="new")
+        etag = self.client.get(CAMPING_URL)["ETag"]
+        old.delete()
+
+        res = self.client.get(CAMPING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_ignores_if_modified_since(self):
+        """Last-Modified를 보내지 않으므로 If-Modified-Since만으로는 304가 되지 않음"""
+        old = create_camping(self.user, title="old")
+        create_camping(self.user, title="new")
+        res = self.client.get(CAMPING_URL)
+        self.assertNotIn("Last-Modified", res)
+        old.delete()
+
+        res = self.client.get(CAMPING_URL, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([camping["title"] for camping in res.data["results"]], ["new"])
+
+    def test_list_etag_depends_on_page(self):
+        """페이지마다 ETag가 다름"""
+        for i in range(3):
+            create_camping(self.user, title=f"camping{i}")
+        first = self.client.get(CAMPING_URL, {"page_size": 2})
+
+        second = self.client.get(first.data["next"])
+
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_detail_not_modified_with_single_query(self):
+        """detail의 If-None-Match는 쿼리 한번으로 304"""
+        camping = create_camping(self.user)
+        etag = self.client.get(camping_detail_url(camping.id))["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(camping_detail_url(camping.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_ignores_if_modified_since(self):
+        """tag 이름 변경은 update_dt를 바꾸지 않으므로 If-Modified-Since로는 304를 주지 않음"""
+        tag = CampingTag.objects.create(user=self.user, name="old")
+        camping = create_camping(self.user)
+        camping.camping_tags.add(tag)
+        self.assertNotIn("Last-Modified", self.client.get(camping_detail_url(camping.id)))
+        tag.name = "new"
+        tag.save()
+
+        res = self.client.get(camping_detail_url(camping.id), HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["camping_tags"][0]["name"], "new")
+
+    def test_detail_etag_changes_after_tag_rename(self):
+        """tag 이름이 바뀌면 camping의 update_dt가 그대로여도 ETag가 바뀜"""
+        tag = CampingTag.objects.create(user=self.user, name="old")
+        camping = create_camping(self.user)
+        camping.camping_tags.add(tag)
+        etag = self.client.get(camping_detail_url(camping.id))["ETag"]
+        tag.name = "new"
+        tag.save()
+
+        res = self.client.get(camping_detail_url(camping.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["camping_tags"][0]["name"], "new")
+
+    def test_detail_of_other_user_is_not_found(self):
+        """다른 user의 detail은 조건부 요청이어도 404"""
+        camping = create_camping(create_user(email="other@example.com"))
+
+        res = self.client.get(camping_detail_url(camping.id), HTTP_IF_NONE_MATCH='"anything"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_invalid_pk_is_not_found(self):
+        """pk 형식이 잘못된 조건부 요청은 500이 아닌 404"""
+        res = self.client.get(camping_detail_url("abc"), HTTP_IF_NONE_MATCH='"anything"')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_recipe_list_not_modified(self):
+        """recipe list도 조건부 GET 지원"""
+        Recipe.objects.create(user=self.user, title="t", description="d", time_minutes=1, price=1)
+        etag = self.client.get(RECIPE_URL)["ETag"]
+
+        res = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,195 @@
+"""
+Tests for the DB connection pool
+"""
+import os
+import tempfile
+import threading
+import uuid
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase
+
+from core.db import pool
+from core.db.backends.sqlite3.base import DatabaseWrapper
+
+
+class FakeConnection:
+    """DB-API connection 흉내"""
+
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise OSError("gone")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql):
+        if self.conn.broken:
+            raise OSError("gone")
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """ConnectionPool 테스트"""
+
+    def test_release_reuses_connection(self):
+        """반납한 connection을 다시 빌려줌"""
+        p = pool.ConnectionPool(size=2)
+        conn = p.acquire(FakeConnection)
+        p.release(conn)
+
+        self.assertIs(p.acquire(FakeConnection), conn)
+        self.assertEqual(p.stats()["connects"], 1)
+        self.assertEqual(conn.rollbacks, 1)
+
+    def test_stats_in_use_and_idle(self):
+        """사용 중/idle connection 수"""
+        p = pool.ConnectionPool(size=3)
+        first = p.acquire(FakeConnection)
+        p.acquire(FakeConnection)
+        p.release(first)
+
+        stats = p.stats()
+
+        self.assertEqual(stats["in_use"], 1)
+        self.assertEqual(stats["idle"], 1)
+
+    def test_exhausted_pool_times_out(self):
+        """SIZE개 모두 사용 중이면 TIMEOUT 후 PoolTimeout"""
+        p = pool.ConnectionPool(size=1, timeout=0.01)
+        p.acquire(FakeConnection)
+
+        with self.assertRaises(pool.PoolTimeout):
+            p.acquire(FakeConnection)
+        self.assertEqual(p.stats()["waits"], 1)
+        self.assertEqual(p.stats()["timeouts"], 1)
+
+    def test_waiter_gets_released_connection(self):
+        """기다리던 thread가 반납된 connection을 받음"""
+        p = pool.ConnectionPool(size=1, timeout=5)
+        conn = p.acquire(FakeConnection)
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(p.acquire(FakeConnection)))
+        waiter.start()
+        while not p.stats()["waits"]:
+            threading.Event().wait(0.001)
+
+        p.release(conn)
+        waiter.join()
+
+        self.assertEqual(received, [conn])
+        self.assertEqual(p.stats()["connects"], 1)
+
+    def test_broken_connection_is_replaced(self):
+        """health check에 실패한 idle connection은 닫고 새로 연다"""
+        p = pool.ConnectionPool(size=1)
+        conn = p.acquire(FakeConnection)
+        p.release(conn)
+        conn.broken = True
+
+        fresh = p.acquire(FakeConnection)
+
+        self.assertIsNot(fresh, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(p.stats()["discarded"], 1)
+
+    def test_unhealthy_release_is_discarded(self):
+        """healthy=False로 반납하면 pool에 넣지 않음"""
+        p = pool.ConnectionPool(size=1)
+        conn = p.acquire(FakeConnection)
+
+        p.release(conn, healthy=False)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(p.stats()["idle"], 0)
+        self.assertEqual(p.stats()["in_use"], 0)
+
+    def test_expired_connection_is_recycled(self):
+        """MAX_AGE가 지난 connection은 반납 시 닫음"""
+        p = pool.ConnectionPool(size=1, max_age=0)
+        conn = p.acquire(FakeConnection)
+
+        p.release(conn)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(p.stats()["recycled"], 1)
+
+    def test_failed_connect_frees_slot(self):
+        """connect 실패가 pool 자리를 차지하지 않음"""
+        p = pool.ConnectionPool(size=1, timeout=0.01)
+
+        def fail():
+            raise OSError("refused")
+
+        with self.assertRaises(OSError):
+            p.acquire(fail)
+        self.assertIsInstance(p.acquire(FakeConnection), FakeConnection)
+
+    def test_foreign_connection_is_not_closed(self):
+        """fork 이전 process에서 빌린 connection은 닫지 않고 버림"""
+        p = pool.ConnectionPool(size=1)
+        conn = FakeConnection()
+
+        p.release(conn)
+
+        self.assertFalse(conn.closed)
+        self.assertEqual(p.stats()["idle"], 0)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """core.db.backends.sqlite3 테스트"""
+
+    def setUp(self):
+        fd, name = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        self.addCleanup(os.remove, name)
+        self.alias = f"pool-{uuid.uuid4().hex}"
+        self.settings_dict = {
+            **connection.settings_dict,
+            "ENGINE": "core.db.backends.sqlite3",
+            "NAME": name,
+            "POOL": {"SIZE": 2, "TIMEOUT": 0.01},
+        }
+        self.addCleanup(lambda: pool.get_pool(self.alias).close())
+
+    def test_close_returns_connection_to_pool(self):
+        """close 후 다시 연결하면 같은 connection을 사용"""
+        wrapper = DatabaseWrapper(self.settings_dict, self.alias)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+
+        wrapper.close()
+        wrapper.ensure_connection()
+
+        self.assertIs(wrapper.connection, raw)
+        self.assertEqual(pool.stats()[f"db_pool.{self.alias}.connects"], 1)
+        wrapper.close()
+
+    def test_exhausted_pool_raises_operational_error(self):
+        """pool이 가득 차면 OperationalError"""
+        wrappers = [DatabaseWrapper(self.settings_dict, self.alias) for _ in range(3)]
+        for wrapper in wrappers[:2]:
+            wrapper.ensure_connection()
+            self.addCleanup(wrapper.close)
+
+        with self.assertRaises(OperationalError):
+            wrappers[2].ensure_connection()
@@ -0,0 +1,137 @@
+"""
+Tests for the read replica routing
+"""
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.db.routers import ReplicaRouter, read_from_replica
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Camping
+from utils.functools import create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+
+# replica가 primary를 mirror하지 않는 별도 DB로 설정된 경우에만 실행
+REPLICA = next(
+    (
+        alias for alias in settings.DATABASE_REPLICAS
+        if not settings.DATABASES[alias].get("TEST", {}).get("MIRROR")
+    ),
+    None,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    """ReplicaRouter 테스트"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Camping))
+
+    def test_reads_go_to_replica_when_enabled(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Camping), "replica")
+
+    def test_token_reads_stay_on_primary(self):
+        """replica 지연으로 새 token의 인증이 실패하지 않도록 primary에서 읽음"""
+        with read_from_replica():
+            self.assertIsNone(self.router.db_for_read(Token))
+
+    def test_writes_go_to_primary(self):
+        with read_from_replica():
+            self.assertIsNone(self.router.db_for_write(Camping))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        with read_from_replica():
+            self.assertIsNone(self.router.db_for_read(Camping))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    """ReplicaRoutingMiddleware 테스트"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.routed = []
+        self.middleware = ReplicaRoutingMiddleware(self.get_response)
+
+    def get_response(self, request):
+        self.routed.append(ReplicaRouter().db_for_read(Camping))
+        return HttpResponse()
+
+    def request(self, method, token="abc"):
+        request = getattr(self.factory, method)("/camping/campings/", HTTP_AUTHORIZATION=f"Token {token}")
+        self.middleware(request)
+        return self.routed[-1]
+
+    def test_safe_request_reads_from_replica(self):
+        self.assertEqual(self.request("get", token="reader"), "replica")
+
+    def test_write_request_uses_primary(self):
+        self.assertIsNone(self.request("post", token="writer"))
+
+    def test_client_is_pinned_after_write(self):
+        """쓰기 후에는 같은 client의 읽기도 primary"""
+        self.request("patch", token="pinned")
+
+        self.assertIsNone(self.request("get", token="pinned"))
+        self.assertEqual(self.request("get", token="other"), "replica")
+
+    def test_anonymous_write_does_not_pin(self):
+        self.middleware(self.factory.post("/user/create/"))
+
+        self.assertEqual(self.request("get", token="anonymous"), "replica")
+
+    def test_routing_is_reset_after_request(self):
+        self.request("get", token="reset")
+
+        self.assertIsNone(ReplicaRouter().db_for_read(Camping))
+
+
+@skipUnless(REPLICA, "requires a non-mirrored replica database")
+class ReplicaIntegrationTests(TransactionTestCase):
+    """primary와 별도의 replica DB로 read-your-writes 확인"""
+
+    databases = {"default", REPLICA} if REPLICA else {"default"}
+
+    def setUp(self):
+        self.user = create_user()
+        # replica에도 같은 user가 복제되어 있다고 가정
+        get_user_model().objects.using(REPLICA).bulk_create([self.user])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.user).key}")
+
+    def test_reads_use_replica(self):
+        """replica에 아직 복제되지 않은 row는 보이지 않음"""
+        Camping.objects.create(user=self.user, title="Primary only", visited_dt="2022-12-03", price=1000)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_client_reads_own_writes(self):
+        """쓰기 후에는 primary에서 읽어 방금 쓴 row가 보임"""
+        payload = {"title": "Written", "visited_dt": "2022-12-03", "review": "Some review", "price": 1000}
+        self.client.post(CAMPING_URL, payload, format="json")
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual([item["title"] for item in res.data["results"]], ["Written"])
+
+    def test_reads_in_transaction_use_primary(self):
+        with read_from_replica(), transaction.atomic():
+            Camping.objects.create(user=self.user, title="In transaction", visited_dt="2022-12-03", price=1)
+
+            self.assertTrue(Camping.objects.filter(title="In transaction").exists())
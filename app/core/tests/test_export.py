@@ -0,0 +1,98 @@
+"""
+Tests for the streaming NDJSON/CSV export
+"""
+import csv
+import io
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from camping.serializers import CampingDetailSerializer
+from camping.views import CampingViewSet
+from core.models import Camping, CampingTag, RecipeTag
+from utils.functools import create_camping, create_recipe, create_user
+
+CAMPING_EXPORT_URL = reverse("camping:camping-export")
+RECIPE_EXPORT_URL = reverse("recipe:recipe-export")
+
+
+class ExportApiTests(TestCase):
+    """export API 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content).decode()
+
+    def test_ndjson(self):
+        tags = [CampingTag.objects.create(user=self.user, name=name) for name in ("forest", "lake")]
+        campings = [create_camping(self.user, title=f"Camping {index}") for index in range(3)]
+        campings[1].camping_tags.add(*tags)
+        create_camping(create_user(email="other@example.com"))
+
+        res, body = self.export(CAMPING_EXPORT_URL)
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="camping.ndjson"', res["Content-Disposition"])
+        items = [json.loads(line) for line in body.splitlines()]
+        expected = CampingDetailSerializer(Camping.objects.filter(user=self.user).order_by("id"), many=True).data
+        self.assertEqual(items, json.loads(json.dumps(expected)))
+
+    def test_csv(self):
+        recipe = create_recipe(self.user, title="Soup, hot")
+        recipe.recipe_tags.add(
+            RecipeTag.objects.create(user=self.user, name="soup"),
+            RecipeTag.objects.create(user=self.user, name="korean"),
+        )
+
+        res, body = self.export(RECIPE_EXPORT_URL, type="csv")
+
+        self.assertTrue(res["Content-Type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(body.lstrip("\ufeff"))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Soup, hot")
+        self.assertEqual(rows[0]["user.email"], self.user.email)
+        self.assertEqual(rows[0]["recipe_tags"], "soup|korean")
+        self.assertEqual(rows[0]["description"], "Long description")
+        self.assertEqual(list(rows[0]), [
+            "id", "user.email", "user.name", "title", "time_minutes", "price", "link",
+            "update_dt", "create_dt", "recipe_tags", "description",
+        ])
+
+    def test_sparse_fields(self):
+        create_camping(self.user)
+
+        _, body = self.export(CAMPING_EXPORT_URL, type="csv", fields="id,title")
+
+        self.assertEqual(body.lstrip("\ufeff").splitlines()[0], "id,title")
+
+    def test_invalid_type(self):
+        res = self.client.get(CAMPING_EXPORT_URL, {"type": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_chunked_queries(self):
+        """chunk마다 row 조회 1번 + tag 조회 1번"""
+        tag = CampingTag.objects.create(user=self.user, name="forest")
+        for index in range(5):
+            create_camping(self.user, title=f"Camping {index}").camping_tags.add(tag)
+
+        with mock.patch.object(CampingViewSet, "export_chunk_size", 2):
+            with CaptureQueriesContext(connection) as queries:
+                _, body = self.export(CAMPING_EXPORT_URL)
+
+        self.assertEqual(len(body.splitlines()), 5)
+        # chunk 3개(2, 2, 1) + 빈 chunk 확인
+        self.assertEqual(len(queries), 3 * 2 + 1)
@@ -0,0 +1,126 @@
+"""
+Tests for the values-based list fast path
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from camping.serializers import CampingSerializer
+from core import cache
+from core.fastpath import Unsupported, ValuesSerializer
+from core.models import Camping, CampingTag, Recipe, RecipeTag
+from recipe.serializers import RecipeSerializer
+from utils.functools import create_camping, create_recipe, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class ValuesSerializerTests(TestCase):
+    """ValuesSerializer 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+
+    def test_same_as_serializer(self):
+        camping = create_camping(self.user)
+        camping.camping_tags.add(
+            CampingTag.objects.create(user=self.user, name="b"),
+            CampingTag.objects.create(user=self.user, name="a"),
+        )
+        create_camping(self.user, title="Empty")
+        queryset = Camping.objects.order_by("id")
+        builder = ValuesSerializer(CampingSerializer())
+
+        data = builder.serialize(builder.values(queryset))
+
+        self.assertEqual(data, CampingSerializer(queryset, many=True).data)
+
+    def test_nested_user(self):
+        recipe = create_recipe(self.user)
+        recipe.recipe_tags.add(RecipeTag.objects.create(user=self.user, name="soup"))
+        queryset = Recipe.objects.all()
+        builder = ValuesSerializer(RecipeSerializer())
+
+        data = builder.serialize(builder.values(queryset))
+
+        self.assertEqual(data, RecipeSerializer(queryset, many=True).data)
+        self.assertEqual(data[0]["user"], {"email": self.user.email, "name": self.user.name})
+
+    def test_unsupported_field(self):
+        """method field 등 values()로 만들 수 없는 field"""
+
+        class Serializer(serializers.ModelSerializer):
+            summary = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Camping
+                fields = ["id", "summary"]
+
+        with self.assertRaises(Unsupported):
+            ValuesSerializer(Serializer())
+
+
+class FastListApiTests(TestCase):
+    """list API의 fast path 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_both(self, url, **params):
+        """fast path와 기존 serializer 응답"""
+        fast = self.client.get(url, params)
+        cache.bump_generation(self.user.pk)
+        with override_settings(API_FAST_LIST=False):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        return fast, slow
+
+    def test_camping_list_identical(self):
+        tags = [CampingTag.objects.create(user=self.user, name=name) for name in ("forest", "lake")]
+        for index in range(3):
+            camping = create_camping(self.user, title=f"Camping {index}")
+            camping.camping_tags.add(*tags[:index])
+
+        fast, slow = self.get_both(CAMPING_URL)
+
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(len(fast.data["results"]), 3)
+
+    def test_recipe_list_identical(self):
+        recipe = create_recipe(self.user, link="https://example.com")
+        recipe.recipe_tags.add(RecipeTag.objects.create(user=self.user, name="soup"))
+        create_recipe(self.user, title="Stew")
+
+        fast, slow = self.get_both(RECIPE_URL)
+
+        self.assertEqual(fast.content, slow.content)
+
+    def test_sparse_fields_and_pagination(self):
+        for index in range(3):
+            create_camping(self.user, title=f"Camping {index}")
+
+        fast, slow = self.get_both(CAMPING_URL, fields="id,title", page_size=2)
+        self.assertEqual(fast.content, slow.content)
+
+        fast, slow = self.client.get(fast.data["next"]), self.client.get(slow.data["next"])
+        self.assertEqual(fast.content, slow.content)
+
+    def test_query_count(self):
+        """row 수와 관계없이 쿼리 수가 일정"""
+        tag = CampingTag.objects.create(user=self.user, name="forest")
+        for index in range(5):
+            create_camping(self.user, title=f"Camping {index}").camping_tags.add(tag)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 5)
+        # last-modified 조회, values 조회, tag 조회
+        self.assertEqual(len(queries), 3)
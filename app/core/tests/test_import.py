@@ -0,0 +1,169 @@
+"""
+Tests for the streaming NDJSON/CSV import
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Camping, CampingTag, Recipe
+from utils.functools import create_user
+
+CAMPING_IMPORT_URL = reverse("camping:camping-import")
+CAMPING_EXPORT_URL = reverse("camping:camping-export")
+RECIPE_IMPORT_URL = reverse("recipe:recipe-import")
+
+
+def ndjson(*items):
+    return "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items).encode()
+
+
+CAMPING = {"title": "DeepForest", "visited_dt": "2022-12-03T10:00:00", "review": "Some review", "price": 1000}
+
+
+class ImportApiTests(TestCase):
+    """import API 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, url, body, import_type="ndjson", content_type="application/x-ndjson"):
+        return self.client.post(f"{url}?type={import_type}", body, content_type=content_type)
+
+    def test_ndjson(self):
+        CampingTag.objects.create(user=self.user, name="forest")
+        body = ndjson(
+            {**CAMPING, "camping_tags": [{"name": "forest"}, {"name": "lake"}]},
+            {**CAMPING, "title": "Second"},
+        )
+
+        res = self.post(CAMPING_IMPORT_URL, body)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"created": 2, "failed": 0, "errors": []})
+        camping = Camping.objects.get(user=self.user, title="DeepForest")
+        self.assertEqual(sorted(camping.camping_tags.values_list("name", flat=True)), ["forest", "lake"])
+        self.assertEqual(CampingTag.objects.filter(user=self.user).count(), 2)
+
+    def test_duplicate_tag_names(self):
+        """한 row에 같은 tag 이름이 반복되어도 한번만 연결"""
+        body = ndjson({**CAMPING, "camping_tags": [{"name": "forest"}, {"name": "forest"}]})
+
+        res = self.post(CAMPING_IMPORT_URL, body)
+
+        self.assertEqual(res.data, {"created": 1, "failed": 0, "errors": []})
+        camping = Camping.objects.get(user=self.user)
+        self.assertEqual(list(camping.camping_tags.values_list("name", flat=True)), ["forest"])
+
+    def test_row_errors_do_not_abort(self):
+        """잘못된 row는 line 번호와 함께 보고하고 나머지는 저장"""
+        body = ndjson(CAMPING, {**CAMPING, "price": -1}) + b"{not json\n" + ndjson({**CAMPING, "title": "Last"})
+
+        res = self.post(CAMPING_IMPORT_URL, body)
+
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(res.data["failed"], 2)
+        self.assertEqual([error["line"] for error in res.data["errors"]], [2, 3])
+        # MySQL은 serializer(min_value), SQLite는 DB CHECK 제약 조건에서 거부
+        self.assertIn("price", str(res.data["errors"][0]["errors"]))
+        self.assertEqual(Camping.objects.filter(user=self.user).count(), 2)
+
+    def test_max_errors(self):
+        body = ndjson(*[{"title": "No price"}] * 5)
+
+        res = self.post(CAMPING_IMPORT_URL, body)
+
+        self.assertEqual(res.data["failed"], 5)
+        self.assertEqual(len(res.data["errors"]), 5)
+
+    def test_csv_round_trip(self):
+        """export한 CSV를 그대로 import"""
+        other = create_user(email="other@example.com")
+        source = APIClient()
+        source.force_authenticate(other)
+        Camping.objects.create(user=other, **CAMPING).camping_tags.add(
+            CampingTag.objects.create(user=other, name="forest")
+        )
+        body = b"".join(source.get(CAMPING_EXPORT_URL, {"type": "csv"}).streaming_content)
+
+        res = self.post(CAMPING_IMPORT_URL, body, "csv", "text/csv")
+
+        self.assertEqual(res.data["created"], 1, res.data)
+        camping = Camping.objects.get(user=self.user)
+        self.assertEqual(camping.title, "DeepForest")
+        self.assertEqual([tag.name for tag in camping.camping_tags.all()], ["forest"])
+
+    def test_csv_round_trip_tag_separator(self):
+        """tag 이름 안의 "|"와 "\\"도 export/import 후 그대로 유지"""
+        other = create_user(email="other@example.com")
+        source = APIClient()
+        source.force_authenticate(other)
+        names = ["a|b", "c\\", "d\\|e"]
+        Camping.objects.create(user=other, **CAMPING).camping_tags.add(
+            *[CampingTag.objects.create(user=other, name=name) for name in names]
+        )
+        body = b"".join(source.get(CAMPING_EXPORT_URL, {"type": "csv"}).streaming_content)
+
+        res = self.post(CAMPING_IMPORT_URL, body, "csv", "text/csv")
+
+        self.assertEqual(res.data["created"], 1, res.data)
+        camping = Camping.objects.get(user=self.user)
+        self.assertEqual(sorted(tag.name for tag in camping.camping_tags.all()), sorted(names))
+
+    def test_recipe_csv_ignores_user_columns(self):
+        body = "title,time_minutes,price,description,user.email,recipe_tags\nSoup,5,1000,Hot,x@example.com,soup|hot\n".encode()
+
+        res = self.post(RECIPE_IMPORT_URL, body, "csv", "text/csv")
+
+        self.assertEqual(res.data["created"], 1, res.data)
+        recipe = Recipe.objects.get()
+        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.recipe_tags.count(), 2)
+
+    def test_multipart_upload(self):
+        upload = SimpleUploadedFile("campings.ndjson", ndjson(CAMPING))
+
+        res = self.client.post(f"{CAMPING_IMPORT_URL}?type=ndjson", {"file": upload}, format="multipart")
+
+        self.assertEqual(res.data["created"], 1)
+
+    def test_invalid_type(self):
+        res = self.post(CAMPING_IMPORT_URL, ndjson(CAMPING), "xml")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Camping.objects.exists())
+
+    def test_invalidates_list_cache(self):
+        self.client.get(reverse("camping:camping-list"))
+        self.post(CAMPING_IMPORT_URL, ndjson(CAMPING))
+
+        res = self.client.get(reverse("camping:camping-list"))
+
+        self.assertEqual(len(res.data["results"]), 1)
+
+
+class ImportCommandTests(TestCase):
+    """import_data command 테스트"""
+
+    def test_import_file(self):
+        user = create_user()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "campings.ndjson")
+            with open(path, "wb") as f:
+                f.write(ndjson(CAMPING, {"title": "Broken"}))
+            out, err = StringIO(), StringIO()
+
+            call_command("import_data", "camping", user.email, path, "--batch-size", "1", stdout=out, stderr=err)
+
+        self.assertIn("Imported 1 camping(s), 1 row(s) failed", out.getvalue())
+        self.assertIn("line 2", err.getvalue())
+        self.assertEqual(Camping.objects.filter(user=user).count(), 1)
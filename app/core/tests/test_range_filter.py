@@ -0,0 +1,117 @@
+"""
+Tests for the range filters and ?ordering=
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from utils.functools import create_camping, create_recipe, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class RangeFilterTests(TestCase):
+    """range filter, ordering 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        create_camping(self.user, title="cheap 2024", visited_dt="2024-12-31 23:00", price=10000)
+        create_camping(self.user, title="cheap 2025", visited_dt="2025-03-01 10:00", price=20000)
+        create_camping(self.user, title="new year", visited_dt="2025-12-31 18:00", price=40000)
+        create_camping(self.user, title="expensive 2025", visited_dt="2025-07-01 10:00", price=90000)
+
+    def titles(self, url=CAMPING_URL, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        return [item["title"] for item in res.data["results"]]
+
+    def test_range(self):
+        titles = self.titles(visited_dt_min="2025-01-01", visited_dt_max="2025-12-31", price_max=50000)
+
+        self.assertEqual(sorted(titles), ["cheap 2025", "new year"])
+
+    def test_datetime_bounds(self):
+        """날짜와 시각을 함께 주면 그 시각까지만 포함"""
+        titles = self.titles(visited_dt_min="2025-03-01 10:00", visited_dt_max="2025-12-31 12:00")
+
+        self.assertEqual(sorted(titles), ["cheap 2025", "expensive 2025"])
+
+    def test_invalid_range(self):
+        for params in ({"price_min": "x"}, {"visited_dt_max": "2025-13-01"}, {"price_min": 10, "price_max": 5}):
+            res = self.client.get(CAMPING_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.titles(ordering="-price"), ["expensive 2025", "new year", "cheap 2025", "cheap 2024"]
+        )
+        self.assertEqual(
+            self.titles(ordering="visited_dt"), ["cheap 2024", "cheap 2025", "expensive 2025", "new year"]
+        )
+
+    def test_ordering_paginated_by_cursor(self):
+        """cursor가 ?ordering=의 정렬 키를 따라감"""
+        create_camping(self.user, title="same price", price=20000)
+        titles, url = [], f"{CAMPING_URL}?ordering=price&page_size=2"
+        while url:
+            res = self.client.get(url)
+            titles += [item["title"] for item in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(titles[0], "cheap 2024")
+        self.assertEqual(sorted(titles[1:3]), ["cheap 2025", "same price"])
+        self.assertEqual(titles[3:], ["new year", "expensive 2025"])
+
+    def test_invalid_ordering(self):
+        for ordering in ("title", "price,-price", "--price"):
+            res = self.client.get(CAMPING_URL, {"ordering": ordering})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, ordering)
+
+    def test_recipe(self):
+        create_recipe(self.user, title="quick", time_minutes=10)
+        create_recipe(self.user, title="slow", time_minutes=120)
+        create_recipe(self.user, title="medium", time_minutes=30)
+
+        titles = self.titles(RECIPE_URL, time_minutes_max=30, ordering="-time_minutes")
+
+        self.assertEqual(titles, ["medium", "quick"])
+
+
+class RangeIndexTests(TestCase):
+    """range filter + ordering 조회가 (user, field, id) index를 사용하는지 EXPLAIN으로 확인"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def explain_list(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        # list 조회는 page_size + 1개를 LIMIT으로 읽는 query
+        sql = next(query["sql"] for query in queries.captured_queries if "LIMIT" in query["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+            return str(cursor.fetchall())
+
+    def test_camping_indexes(self):
+        plan = self.explain_list(CAMPING_URL, {"price_max": 50000, "ordering": "price"})
+        self.assertIn("camping_user_price_id_idx", plan)
+
+        plan = self.explain_list(CAMPING_URL, {"visited_dt_min": "2025-01-01", "ordering": "-visited_dt"})
+        self.assertIn("camping_user_visited_id_idx", plan)
+
+    def test_recipe_indexes(self):
+        plan = self.explain_list(RECIPE_URL, {"time_minutes_max": 30, "ordering": "time_minutes"})
+        self.assertIn("recipe_user_minutes_id_idx", plan)
+
+        plan = self.explain_list(RECIPE_URL, {"price_min": 1000, "ordering": "-price"})
+        self.assertIn("recipe_user_price_id_idx", plan)
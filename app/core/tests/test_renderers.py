@@ -0,0 +1,180 @@
+"""
+Tests for the orjson renderer and parser
+"""
+import datetime
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Camping, Recipe
+from core.renderers import MessagePackParser, MessagePackRenderer, ORJSONParser, ORJSONRenderer
+from utils.functools import create_user
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """DRF JSONRenderer와 같은 bytes를 만드는지 확인"""
+
+    def assertSameAsDRF(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_datetimes(self):
+        self.assertSameAsDRF({
+            "utc": datetime.datetime(2022, 12, 3, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "kst": datetime.datetime(2022, 12, 3, 10, 30, tzinfo=KST),
+            "naive": datetime.datetime(2022, 12, 3, 10, 30),
+            "date": datetime.date(2022, 12, 3),
+        })
+
+    def test_korean_text_is_not_escaped(self):
+        rendered = ORJSONRenderer().render({"title": "깊은 숲 캠핑장"})
+
+        self.assertIn("깊은 숲 캠핑장".encode(), rendered)
+        self.assertSameAsDRF({"title": "깊은 숲 캠핑장"})
+
+    def test_types_handled_by_drf_encoder(self):
+        self.assertSameAsDRF({"price": Decimal("1.5"), "label": _("Recipe"), 1: [None, True]})
+
+    def test_line_separators_are_escaped(self):
+        self.assertSameAsDRF({"review": "line break "})
+
+    def test_indent_falls_back_to_drf(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTests(SimpleTestCase):
+    """ORJSONParser 테스트"""
+
+    def test_parses_utf8(self):
+        body = '{"title": "캠핑", "camping_tags": [{"name": "숲"}]}'.encode()
+
+        self.assertEqual(ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+
+    def test_other_encoding(self):
+        body = '{"title": "캠핑"}'.encode("euc-kr")
+
+        self.assertEqual(ORJSONParser().parse(BytesIO(body), parser_context={"encoding": "euc-kr"}), {"title": "캠핑"})
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"title": '))
+
+
+class ORJSONAPITests(TestCase):
+    """API 응답/요청에 기본으로 사용되는지 확인"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_and_list_with_korean_text(self):
+        payload = {"title": "깊은 숲", "visited_dt": "2022-12-03T10:30:00", "review": "좋아요", "price": 1000}
+        self.client.post(CAMPING_URL, payload, format="json")
+
+        res = self.client.get(CAMPING_URL)
+
+        camping = Camping.objects.get(user=self.user)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertIn("깊은 숲".encode(), res.content)
+        self.assertEqual(res.json()["results"][0]["visited_dt"], "2022-12-03T10:30:00")
+        self.assertEqual(camping.review, "좋아요")
+
+
+@skipUnless(msgpack, "requires msgpack")
+class MessagePackTests(SimpleTestCase):
+    """MessagePack renderer/parser 테스트"""
+
+    def test_round_trip(self):
+        data = {"title": "캠핑", "camping_tags": [{"name": "숲"}], "price": 1000, "link": None}
+
+        rendered = MessagePackRenderer().render(data)
+
+        self.assertEqual(MessagePackParser().parse(BytesIO(rendered)), data)
+
+    def test_values_match_json(self):
+        """datetime, Decimal은 JSON 응답과 같은 값"""
+        data = {"visited_dt": datetime.datetime(2022, 12, 3, 10, 30), "price": Decimal("1.5")}
+
+        unpacked = msgpack.unpackb(MessagePackRenderer().render(data))
+
+        self.assertEqual(unpacked, {"visited_dt": "2022-12-03T10:30:00", "price": 1.5})
+
+    def test_invalid_payload(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+
+@skipUnless(msgpack, "requires msgpack")
+class MessagePackAPITests(TestCase):
+    """Accept/Content-Type: application/msgpack 요청"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, url, payload, method="post"):
+        return getattr(self.client, method)(
+            url, msgpack.packb(payload), content_type="application/msgpack", HTTP_ACCEPT="application/msgpack",
+        )
+
+    def test_create_camping_with_nested_tags(self):
+        payload = {
+            "title": "깊은 숲", "visited_dt": "2022-12-03T10:30:00", "review": "좋아요", "price": 1000,
+            "camping_tags": [{"name": "계곡"}, {"name": "forest"}],
+        }
+
+        res = self.post(CAMPING_URL, payload)
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        data = msgpack.unpackb(res.content)
+        self.assertEqual(data["title"], "깊은 숲")
+        self.assertEqual(sorted(tag["name"] for tag in data["camping_tags"]), ["forest", "계곡"])
+
+    def test_update_recipe_tags(self):
+        recipe = Recipe.objects.create(user=self.user, title="Soup", description="Hot", time_minutes=5, price=1)
+
+        res = self.post(f"{RECIPE_URL}{recipe.pk}/", {"recipe_tags": [{"name": "국"}]}, method="patch")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(list(recipe.recipe_tags.values_list("name", flat=True)), ["국"])
+
+    def test_list_negotiation(self):
+        """같은 list를 JSON과 MessagePack으로 받으면 내용이 같고 ETag는 다름"""
+        Camping.objects.create(user=self.user, title="캠핑", visited_dt="2022-12-03", review="x", price=1)
+
+        as_json = self.client.get(CAMPING_URL)
+        as_msgpack = self.client.get(CAMPING_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(msgpack.unpackb(as_msgpack.content), as_json.json())
+        self.assertLess(len(as_msgpack.content), len(as_json.content))
+        self.assertNotEqual(as_msgpack["ETag"], as_json["ETag"])
+
+    def test_format_query_parameter(self):
+        res = self.client.get(CAMPING_URL, {"format": "msgpack"})
+
+        self.assertEqual(res["Content-Type"], "application/msgpack")
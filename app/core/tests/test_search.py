@@ -0,0 +1,151 @@
+"""
+Tests for the ?q= search and the SearchTerm index
+"""
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import filters, search
+from core.models import SearchTerm
+from utils.functools import create_camping, create_recipe, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class TokenizeTests(SimpleTestCase):
+    """n-gram tokenize 테스트"""
+
+    def test_bigrams(self):
+        self.assertEqual(search.terms("캠핑장에서"), {"캠핑", "핑장", "장에", "에서"})
+
+    def test_normalize(self):
+        """NFKC 정규화, 소문자 변환, 한 글자 단어 제외"""
+        self.assertEqual(search.terms("ＡＢ c, Ab!"), {"ab"})
+
+
+class SearchIndexTests(TestCase):
+    """SearchTerm index 갱신 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+
+    def test_index_on_save(self):
+        camping = create_camping(self.user, title="계곡", review="조용한")
+
+        self.assertEqual(
+            set(SearchTerm.objects.filter(camping=camping).values_list("term", flat=True)),
+            {"계곡", "조용", "용한"},
+        )
+
+        camping.review = "시끄러운"
+        camping.save()
+        self.assertNotIn("조용", SearchTerm.objects.filter(camping=camping).values_list("term", flat=True))
+
+    def test_unrelated_update_fields_skip_index(self):
+        camping = create_camping(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            camping.save(update_fields=["price"])
+
+        self.assertFalse(any("core_searchterm" in query["sql"] for query in queries.captured_queries))
+
+    def test_delete_removes_terms(self):
+        create_recipe(self.user).delete()
+
+        self.assertFalse(SearchTerm.objects.exists())
+
+    def test_rebuild_command(self):
+        camping = create_camping(self.user, title="계곡")
+        SearchTerm.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertTrue(SearchTerm.objects.filter(camping=camping, term="계곡").exists())
+
+
+class SearchApiTests(TestCase):
+    """?q= 검색 API 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def titles(self, url, query):
+        res = self.client.get(url, {"q": query})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(item["title"] for item in res.data["results"])
+
+    def test_korean_substring(self):
+        create_camping(self.user, title="숲속", review="계곡 옆 캠핑장에서 조용히 쉬었다")
+        create_camping(self.user, title="바다", review="파도 소리가 좋은 캠핑")
+        create_camping(create_user(email="other@example.com"), title="남의 것", review="계곡 캠핑장")
+
+        self.assertEqual(self.titles(CAMPING_URL, "캠핑장"), ["숲속"])
+        self.assertEqual(self.titles(CAMPING_URL, "캠핑"), ["바다", "숲속"])
+        self.assertEqual(self.titles(CAMPING_URL, "계곡 조용"), ["숲속"])
+
+    def test_title_and_description(self):
+        create_recipe(self.user, title="Kimchi Stew", description="spicy")
+        create_recipe(self.user, title="Soup", description="Mild kimchi broth")
+        create_recipe(self.user, title="Salad", description="fresh")
+
+        self.assertEqual(self.titles(RECIPE_URL, "KIMCHI"), ["Kimchi Stew", "Soup"])
+        self.assertEqual(self.titles(RECIPE_URL, "stew spicy"), ["Kimchi Stew"])
+
+    def test_bigrams_must_be_adjacent(self):
+        """bigram이 모두 있어도 이어져 있지 않으면 제외"""
+        create_camping(self.user, title="가나 나다", review="")
+
+        self.assertEqual(self.titles(CAMPING_URL, "가나다"), [])
+
+    def test_single_character(self):
+        create_camping(self.user, title="깊은숲")
+
+        self.assertEqual(self.titles(CAMPING_URL, "숲"), ["깊은숲"])
+
+    def test_only_punctuation(self):
+        create_camping(self.user)
+
+        self.assertEqual(self.titles(CAMPING_URL, "!!"), [])
+
+    def test_many_candidates(self):
+        """후보가 MAX_CANDIDATES보다 많으면 subquery로 조회"""
+        for index in range(3):
+            create_camping(self.user, title=f"계곡 {index}")
+
+        with mock.patch.object(filters, "MAX_CANDIDATES", 1):
+            self.assertEqual(self.titles(CAMPING_URL, "계곡"), ["계곡 0", "계곡 1", "계곡 2"])
+
+    def test_uses_index(self):
+        create_camping(self.user, title="계곡")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(CAMPING_URL, {"q": "계곡"})
+
+        # ConditionalGetMixin의 MAX(update_dt)와 list가 같은 후보 id 목록을 사용
+        self.assertEqual(sum("core_searchterm" in query["sql"] for query in queries.captured_queries), 1)
+
+    @override_settings(SEARCH_BACKEND="fulltext")
+    def test_fulltext_backend_without_mysql(self):
+        """fulltext 설정이지만 MySQL이 아니면 icontains로 검색, SearchTerm은 갱신하지 않음"""
+        create_camping(self.user, title="계곡")
+
+        self.assertEqual(self.titles(CAMPING_URL, "계곡"), ["계곡"])
+        self.assertFalse(SearchTerm.objects.exists())
+
+    def test_export_search(self):
+        create_camping(self.user, title="계곡")
+        create_camping(self.user, title="바다")
+
+        res = self.client.get(reverse("camping:camping-export"), {"q": "바다"})
+
+        self.assertEqual(len(b"".join(res.streaming_content).splitlines()), 1)
@@ -0,0 +1,223 @@
+"""
+Tests for the user-id sharding
+"""
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import sharding
+from core.cache import get_cache
+from core.management.commands import move_user_shard
+from core.db.routers import ShardRouter
+from core.models import Camping, CampingTag, Recipe, SearchTerm, UserShard
+from utils.functools import create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+# primary를 mirror하지 않는 별도 shard가 2개 이상 설정된 경우에만 실행
+SHARDS = [
+    alias for alias in settings.DATABASE_SHARDS
+    if not settings.DATABASES[alias].get("TEST", {}).get("MIRROR")
+]
+
+
+class HashRingTests(SimpleTestCase):
+    """HashRing 테스트"""
+
+    def test_same_key_same_node(self):
+        ring = sharding.HashRing(["a", "b", "c"])
+
+        self.assertEqual(ring.get_node(42), ring.get_node(42))
+
+    def test_keys_spread_over_nodes(self):
+        ring = sharding.HashRing(["a", "b", "c"])
+
+        counts = {}
+        for key in range(3000):
+            node = ring.get_node(key)
+            counts[node] = counts.get(node, 0) + 1
+
+        self.assertEqual(set(counts), {"a", "b", "c"})
+        self.assertTrue(all(count > 600 for count in counts.values()))
+
+    def test_adding_node_moves_few_keys(self):
+        """node를 추가해도 일부 key만 새 node로 이동"""
+        before = sharding.HashRing(["a", "b", "c"])
+        after = sharding.HashRing(["a", "b", "c", "d"])
+
+        moved = [key for key in range(3000) if before.get_node(key) != after.get_node(key)]
+
+        self.assertLess(len(moved), 1200)
+        self.assertTrue(all(after.get_node(key) == "d" for key in moved))
+
+    def test_empty_ring(self):
+        self.assertIsNone(sharding.HashRing([]).get_node(1))
+
+
+class ShardRouterTests(SimpleTestCase):
+    """ShardRouter 테스트"""
+
+    def test_sharded_models_use_current_shard(self):
+        router = ShardRouter()
+        with sharding.use_shard("shard_1"):
+            self.assertEqual(router.db_for_read(Camping), "shard_1")
+            self.assertEqual(router.db_for_write(Camping.camping_tags.through), "shard_1")
+            self.assertIsNone(router.db_for_read(get_user_model()))
+
+    def test_no_shard_outside_context(self):
+        self.assertIsNone(ShardRouter().db_for_read(Recipe))
+
+    @override_settings(DATABASE_SHARDS=[])
+    def test_sharding_disabled(self):
+        self.assertIsNone(sharding.shard_for_user(1))
+
+
+@skipUnless(len(SHARDS) >= 2, "requires two non-mirrored shard databases")
+class ShardedAPITests(TransactionTestCase):
+    """별도의 shard DB로 API와 move_user_shard 확인"""
+
+    databases = {"default", *SHARDS}
+
+    def setUp(self):
+        # flush된 DB에서 이전 test의 user id → shard 매핑과 shadow 확인 결과를 재사용하지 않도록
+        get_cache().clear()
+        sharding._shadowed.clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.user).key}")
+        self.home = sharding.shard_for_user(self.user.pk)
+        self.other = next(alias for alias in SHARDS if alias != self.home)
+
+    def create_camping(self, **params):
+        payload = {
+            "title": "DeepForest", "visited_dt": "2022-12-03", "review": "Some review", "price": 1000,
+            "camping_tags": [{"name": "forest"}], **params,
+        }
+        res = self.client.post(CAMPING_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data
+
+    def test_data_written_to_user_shard(self):
+        """camping, tag, 연결이 user의 shard에만 저장"""
+        self.create_camping()
+
+        self.assertEqual(Camping.objects.using(self.home).filter(user=self.user).count(), 1)
+        self.assertEqual(Camping.objects.using(self.other).count(), 0)
+        self.assertEqual(Camping.objects.count(), 0)
+        self.assertEqual(Camping.camping_tags.through.objects.using(self.home).count(), 1)
+
+    def test_list_reads_user_shard(self):
+        self.create_camping()
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual([item["title"] for item in res.data["results"]], ["DeepForest"])
+        self.assertEqual([tag["name"] for tag in res.data["results"][0]["camping_tags"]], ["forest"])
+
+    def test_export_streams_from_user_shard(self):
+        """body는 dispatch 이후에 iterate되어도 user의 shard에서 조회"""
+        self.create_camping()
+        res = self.client.get(reverse("camping:camping-export"))
+
+        lines = b"".join(res.streaming_content).decode().splitlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"name":"forest"', lines[0])
+
+    def test_import_writes_user_shard(self):
+        body = b'{"title": "Imported", "review": "r", "price": 1, "camping_tags": [{"name": "lake"}]}\n'
+        res = self.client.post(
+            reverse("camping:camping-import"), body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(Camping.objects.using(self.home).filter(user=self.user).count(), 1)
+        self.assertEqual(CampingTag.objects.using(self.home).filter(user=self.user).count(), 1)
+        self.assertEqual(Camping.objects.using(self.other).count(), 0)
+
+    def test_recipe_shows_shadow_user(self):
+        """recipe의 user는 shard의 shadow row에서 조회되고, user 수정이 반영됨"""
+        payload = {"title": "Soup", "time_minutes": 10, "price": 1000, "description": "Hot"}
+        self.client.post(RECIPE_URL, payload, format="json")
+        self.user.name = "Renamed"
+        self.user.save()
+
+        res = self.client.get(RECIPE_URL)
+
+        self.assertEqual(res.data["results"][0]["user"]["name"], "Renamed")
+
+    def test_move_user_shard(self):
+        """data가 id와 수정 시각을 유지한 채 옮겨지고 API도 새 shard를 사용"""
+        created = self.create_camping()
+        before = Camping.objects.using(self.home).get(pk=created["id"])
+
+        call_command("move_user_shard", self.user.pk, self.other, stdout=StringIO())
+
+        moved = Camping.objects.using(self.other).get(pk=created["id"])
+        self.assertEqual(moved.update_dt, before.update_dt)
+        self.assertEqual(moved.create_dt, before.create_dt)
+        self.assertEqual(list(moved.camping_tags.values_list("name", flat=True)), ["forest"])
+        self.assertFalse(Camping.objects.using(self.home).exists())
+        self.assertFalse(CampingTag.objects.using(self.home).exists())
+        self.assertEqual(UserShard.objects.get(user=self.user).alias, self.other)
+
+        res = self.client.get(CAMPING_URL)
+        self.assertEqual([item["id"] for item in res.data["results"]], [created["id"]])
+        # 검색 index는 새 shard에서 다시 생성
+        self.assertFalse(SearchTerm.objects.using(self.home).exists())
+        res = self.client.get(CAMPING_URL, {"q": "forest"})
+        self.assertEqual([item["id"] for item in res.data["results"]], [created["id"]])
+
+    def test_move_back_removes_override(self):
+        self.create_camping()
+        call_command("move_user_shard", self.user.pk, self.other, stdout=StringIO())
+
+        call_command("move_user_shard", self.user.pk, self.home, stdout=StringIO())
+
+        self.assertFalse(UserShard.objects.filter(user=self.user).exists())
+        self.assertEqual(Camping.objects.using(self.home).count(), 1)
+
+    def test_move_aborts_on_id_collision(self):
+        """target shard에 같은 id가 있으면 아무것도 옮기지 않음"""
+        created = self.create_camping()
+        other_user = create_user(email="other@example.com")
+        sharding.ensure_shadow_user(self.other, other_user)
+        Camping.objects.using(self.other).create(
+            pk=created["id"], user=other_user, title="Taken", visited_dt="2022-12-03", review="x", price=1,
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("move_user_shard", self.user.pk, self.other, stdout=StringIO())
+
+        self.assertEqual(Camping.objects.using(self.home).filter(user=self.user).count(), 1)
+        self.assertFalse(UserShard.objects.exists())
+
+    def test_move_aborts_when_source_changes(self):
+        """복사 중 source가 바뀌면 commit된 target 복사본을 지우고 매핑은 그대로 둠"""
+        self.create_camping()
+
+        with mock.patch.object(move_user_shard.Command, "versions", side_effect=[["changed"], ["copied"]]):
+            with self.assertRaises(CommandError):
+                call_command("move_user_shard", self.user.pk, self.other, stdout=StringIO())
+
+        self.assertEqual(Camping.objects.using(self.home).filter(user=self.user).count(), 1)
+        self.assertFalse(Camping.objects.using(self.other).exists())
+        self.assertFalse(CampingTag.objects.using(self.other).exists())
+        self.assertFalse(UserShard.objects.exists())
+        self.assertEqual(sharding.shard_for_user(self.user.pk), self.home)
+
+    def test_delete_user_removes_shard_data(self):
+        self.create_camping()
+
+        self.user.delete()
+
+        self.assertFalse(Camping.objects.using(self.home).exists())
+        self.assertFalse(get_user_model().objects.using(self.home).exists())
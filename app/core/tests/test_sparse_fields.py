@@ -0,0 +1,101 @@
+"""
+Tests for ?fields= / ?exclude= sparse fieldsets
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import CampingTag
+from utils.functools import create_camping, create_recipe, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class SparseFieldsTests(TestCase):
+    """sparse fieldset 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        return res, [query["sql"] for query in queries.captured_queries]
+
+    def test_camping_fields_skip_review_and_tags(self):
+        """review, tag를 요청하지 않으면 review column과 tag prefetch를 조회하지 않음"""
+        camping = create_camping(self.user)
+        camping.camping_tags.add(CampingTag.objects.create(user=self.user, name="forest"))
+
+        res, queries = self.get(CAMPING_URL, fields="id,title")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [{"id": camping.id, "title": "DeepForest"}])
+        self.assertFalse(any('"review"' in sql for sql in queries))
+        self.assertFalse(any(CampingTag._meta.db_table in sql for sql in queries))
+        self.assertEqual(len(queries), 2)
+
+    def test_camping_exclude(self):
+        create_camping(self.user)
+
+        res, queries = self.get(CAMPING_URL, exclude="review")
+
+        self.assertNotIn("review", res.data["results"][0])
+        self.assertIn("camping_tags", res.data["results"][0])
+        self.assertFalse(any('"review"' in sql for sql in queries))
+
+    def test_camping_detail_fields(self):
+        camping = create_camping(self.user)
+
+        res, queries = self.get(reverse("camping:camping-detail", args=[camping.id]), fields="price")
+
+        self.assertEqual(res.data, {"price": 50000})
+        self.assertFalse(any('"review"' in sql for sql in queries))
+
+    def test_recipe_without_user_skips_join(self):
+        """user를 요청하지 않으면 user table을 join하지 않음"""
+        create_recipe(self.user)
+
+        res, queries = self.get(RECIPE_URL, fields="id,title,recipe_tags")
+
+        self.assertEqual(set(res.data["results"][0]), {"id", "title", "recipe_tags"})
+        self.assertFalse(any(self.user._meta.db_table in sql for sql in queries))
+        self.assertFalse(any('"description"' in sql for sql in queries))
+
+    def test_recipe_with_user(self):
+        create_recipe(self.user)
+
+        res, _ = self.get(RECIPE_URL, fields="title,user")
+
+        self.assertEqual(res.data["results"][0]["user"]["email"], self.user.email)
+
+    def test_pagination_with_pruned_columns(self):
+        """정렬 키를 항상 조회하므로 다음 page cursor가 동작"""
+        for index in range(3):
+            create_camping(self.user, title=f"camping {index}")
+
+        first, queries = self.get(CAMPING_URL, fields="title", page_size=2)
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(len(queries), 2)
+        self.assertEqual([item["title"] for item in second.data["results"]], ["camping 0"])
+
+    def test_unknown_field(self):
+        res = self.client.get(CAMPING_URL, {"fields": "title,secret"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", res.data)
+
+    def test_fields_ignored_for_writes(self):
+        payload = {"title": "New", "visited_dt": "2022-12-03", "review": "x", "price": 1}
+
+        res = self.client.post(f"{CAMPING_URL}?fields=title", payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("review", res.data)
@@ -0,0 +1,169 @@
+"""
+Tests for the denormalized tag usage counts
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from camping.serializers import CampingTagSerialzier
+from core.models import Camping, CampingTag, Recipe, RecipeTag
+from utils.functools import create_camping, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+BULK_URL = reverse("camping:camping-bulk")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class TagUsageCountTests(TestCase):
+    """usage_count 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def counts(self, model=CampingTag):
+        return dict(model.objects.filter(user=self.user).values_list("name", "usage_count"))
+
+    def post_camping(self, *tags):
+        payload = {
+            "title": "DeepForest",
+            "visited_dt": "2022-12-03",
+            "review": "Some review",
+            "price": 50000,
+            "camping_tags": [{"name": name} for name in tags],
+        }
+        res = self.client.post(CAMPING_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data["id"]
+
+    def test_serializer_writes(self):
+        first = self.post_camping("forest", "lake")
+        self.post_camping("forest")
+        self.assertEqual(self.counts(), {"forest": 2, "lake": 1})
+
+        url = reverse("camping:camping-detail", args=[first])
+        self.client.patch(url, {"camping_tags": [{"name": "lake"}, {"name": "sea"}]}, format="json")
+        self.assertEqual(self.counts(), {"forest": 1, "lake": 1, "sea": 1})
+
+        self.client.delete(url)
+        self.assertEqual(self.counts(), {"forest": 1, "lake": 0, "sea": 0})
+
+    def test_bulk_writes(self):
+        camping = create_camping(self.user)
+        payload = [
+            {"op": "create", "data": {"title": "a", "review": "r", "price": 1, "camping_tags": [{"name": "forest"}]}},
+            {"op": "create", "data": {"title": "b", "review": "r", "price": 1, "camping_tags": [{"name": "forest"}]}},
+            {"op": "update", "id": camping.id, "data": {"camping_tags": [{"name": "lake"}]}},
+        ]
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), {"forest": 2, "lake": 1})
+
+    def test_m2m_signals(self):
+        forest = CampingTag.objects.create(user=self.user, name="forest")
+        lake = CampingTag.objects.create(user=self.user, name="lake")
+        camping = create_camping(self.user)
+        other = create_camping(self.user)
+
+        camping.camping_tags.add(forest, lake)
+        camping.camping_tags.add(forest)
+        forest.camping_set.add(other)
+        self.assertEqual(self.counts(), {"forest": 2, "lake": 1})
+
+        camping.camping_tags.remove(forest)
+        other.camping_tags.remove(lake)
+        self.assertEqual(self.counts(), {"forest": 1, "lake": 1})
+
+        camping.camping_tags.clear()
+        forest.camping_set.clear()
+        self.assertEqual(self.counts(), {"forest": 0, "lake": 0})
+
+    def test_queryset_delete(self):
+        """queryset 삭제는 삭제되는 연결을 tag별로 세어 UPDATE 한번으로 줄임"""
+        forest = CampingTag.objects.create(user=self.user, name="forest")
+        lake = CampingTag.objects.create(user=self.user, name="lake")
+        for _ in range(3):
+            create_camping(self.user).camping_tags.add(forest, lake)
+        kept = create_camping(self.user, title="kept")
+        kept.camping_tags.add(forest)
+
+        with CaptureQueriesContext(connection) as queries:
+            Camping.objects.exclude(pk=kept.pk).delete()
+
+        self.assertEqual(self.counts(), {"forest": 1, "lake": 0})
+        updates = [query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+
+    def test_user_delete(self):
+        """tag도 함께 지워지는 user 삭제에서는 usage_count를 갱신하지 않음"""
+        self.post_camping("forest")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.delete()
+
+        self.assertFalse(CampingTag.objects.exists())
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries.captured_queries))
+
+    def test_rename_keeps_count(self):
+        """이름 변경은 다른 요청이 F()로 더한 usage_count를 덮어쓰지 않음"""
+        tag = CampingTag.objects.create(user=self.user, name="forest")
+        CampingTag.objects.filter(pk=tag.pk).update(usage_count=F("usage_count") + 3)
+
+        serializer = CampingTagSerialzier(tag, data={"name": "woods", "usage_count": 100}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertEqual(self.counts(), {"woods": 3})
+
+    def test_exposed(self):
+        self.post_camping("forest")
+
+        res = self.client.get(reverse("camping:campingtag-list"))
+
+        self.assertEqual([(tag["name"], tag["usage_count"]) for tag in res.data], [("forest", 1)])
+
+    def test_recipe(self):
+        payload = {
+            "title": "Soup",
+            "description": "some description",
+            "time_minutes": 10,
+            "price": 5000,
+            "recipe_tags": [{"name": "soup"}],
+        }
+        res = self.client.post(RECIPE_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(user=self.user)
+        self.assertEqual(self.counts(RecipeTag), {"soup": 1})
+
+        recipe.delete()
+        self.assertEqual(self.counts(RecipeTag), {"soup": 0})
+
+
+class RepairTagCountsTests(TestCase):
+    """repair_tag_counts command 테스트"""
+
+    def test_repair(self):
+        user = create_user()
+        forest = CampingTag.objects.create(user=user, name="forest")
+        lake = CampingTag.objects.create(user=user, name="lake")
+        create_camping(user).camping_tags.add(forest, lake)
+        create_camping(user).camping_tags.add(forest)
+        CampingTag.objects.filter(pk=forest.pk).update(usage_count=7)
+        CampingTag.objects.filter(pk=lake.pk).update(usage_count=0)
+
+        out = StringIO()
+        call_command("repair_tag_counts", "--batch-size", "1", stdout=out)
+
+        self.assertEqual(
+            dict(CampingTag.objects.values_list("name", "usage_count")), {"forest": 2, "lake": 1}
+        )
+        self.assertIn("Repaired 2 of 2 tag(s)", out.getvalue())
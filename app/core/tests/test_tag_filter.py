@@ -0,0 +1,105 @@
+"""
+Tests for the ?tags= filter
+"""
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import filters
+from core.models import Camping, CampingTag, Recipe, RecipeTag
+from utils.functools import create_camping, create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+RECIPE_URL = reverse("recipe:recipe-list")
+
+
+class TagFilterTests(TestCase):
+    """tag filter 테스트"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.forest = CampingTag.objects.create(user=self.user, name="forest")
+        self.lake = CampingTag.objects.create(user=self.user, name="lake")
+        self.sea = CampingTag.objects.create(user=self.user, name="sea")
+        create_camping(self.user, title="both").camping_tags.add(self.forest, self.lake)
+        create_camping(self.user, title="forest").camping_tags.add(self.forest)
+        create_camping(self.user, title="sea").camping_tags.add(self.sea)
+        create_camping(self.user, title="none")
+
+    def titles(self, **params):
+        res = self.client.get(CAMPING_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(item["title"] for item in res.data["results"])
+
+    def test_match_all(self):
+        self.assertEqual(self.titles(tags=f"{self.forest.id},{self.lake.id}"), ["both"])
+        self.assertEqual(self.titles(tags=f"{self.forest.id}"), ["both", "forest"])
+
+    def test_match_any(self):
+        tags = f"{self.lake.id},{self.sea.id}"
+
+        self.assertEqual(self.titles(tags=tags, tag_match="any"), ["both", "sea"])
+
+    def test_duplicate_ids(self):
+        self.assertEqual(self.titles(tags=f"{self.lake.id},{self.lake.id}"), ["both"])
+
+    def test_other_users_tag(self):
+        other = create_user(email="other@example.com")
+        tag = CampingTag.objects.create(user=other, name="forest")
+        create_camping(other).camping_tags.add(tag)
+
+        self.assertEqual(self.titles(tags=f"{tag.id}"), [])
+
+    def test_many_candidates(self):
+        """후보가 MAX_CANDIDATES보다 많으면 subquery로 조회"""
+        with mock.patch.object(filters, "MAX_CANDIDATES", 1):
+            self.assertEqual(self.titles(tags=f"{self.forest.id}"), ["both", "forest"])
+            self.assertEqual(self.titles(tags=f"{self.lake.id},{self.sea.id}", tag_match="any"), ["both", "sea"])
+
+    def test_invalid_params(self):
+        for params in ({"tags": "1,x"}, {"tags": "1", "tag_match": "none"}, {"tags": ",".join(["1"] * 51)}):
+            res = self.client.get(CAMPING_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_single_grouped_query(self):
+        """through 테이블을 한번 GROUP BY/HAVING으로 조회, join을 tag 수만큼 늘리지 않음"""
+        tags = f"{self.forest.id},{self.lake.id},{self.sea.id}"
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(CAMPING_URL, {"tags": tags})
+
+        through = [query["sql"] for query in queries.captured_queries if "HAVING" in query["sql"]]
+        self.assertEqual(len(through), 1)
+        self.assertEqual(through[0].count("JOIN"), 0)
+
+    def test_recipe(self):
+        tag = RecipeTag.objects.create(user=self.user, name="soup")
+        recipe = Recipe.objects.create(user=self.user, title="Soup", description="", time_minutes=1, price=1)
+        recipe.recipe_tags.add(tag)
+        Recipe.objects.create(user=self.user, title="Salad", description="", time_minutes=1, price=1)
+
+        res = self.client.get(RECIPE_URL, {"tags": tag.id})
+
+        self.assertEqual([item["title"] for item in res.data["results"]], ["Soup"])
+
+
+class ThroughIndexTests(TestCase):
+    """post_migrate로 만든 through 테이블 index 테스트"""
+
+    def test_indexes_exist(self):
+        for descriptor, name in ((Camping.camping_tags, "camping_tags_tag_camping_idx"),
+                                 (Recipe.recipe_tags, "recipe_tags_tag_recipe_idx")):
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, descriptor.through._meta.db_table)
+            field = descriptor.field
+            self.assertEqual(
+                constraints[name]["columns"],
+                [f"{field.m2m_reverse_field_name()}_id", f"{field.m2m_field_name()}_id"],
+            )
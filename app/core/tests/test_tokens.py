@@ -0,0 +1,150 @@
+"""
+Tests for token expiry and rotation
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import token_cache
+from core.models import TokenActivity
+from core.tokens import expired_tokens
+from utils.functools import create_user
+
+CAMPING_URL = reverse("camping:camping-list")
+TOKEN_URL = reverse("user:token")
+
+
+def age_token(token, seconds):
+    """token의 마지막 사용 시각을 과거로 이동"""
+    last_seen = timezone.now() - timedelta(seconds=seconds)
+    TokenActivity.objects.update_or_create(token=token, defaults={"last_seen": last_seen})
+
+
+@override_settings(AUTH_TOKEN_TTL=3600, AUTH_TOKEN_TOUCH_INTERVAL=60)
+class TokenExpiryTests(TestCase):
+    """token 만료 테스트"""
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_expired_token_rejected(self):
+        age_token(self.token, 3601)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_recent_use_extends_expiry(self):
+        """사용할 때마다 만료 시각이 연장됨 (sliding)"""
+        age_token(self.token, 3000)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        last_seen = TokenActivity.objects.get(token=self.token).last_seen
+        self.assertLess(timezone.now() - last_seen, timedelta(seconds=5))
+
+    def test_last_seen_write_coalesced(self):
+        """interval 안의 요청은 last_seen을 다시 쓰지 않음"""
+        age_token(self.token, 120)
+        table = TokenActivity._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                self.client.get(CAMPING_URL)
+
+        writes = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE") and table in q["sql"]]
+        self.assertEqual(len(writes), 1)
+
+    def test_login_rotates_expired_token(self):
+        """만료된 token으로 다시 로그인하면 새 token 발급"""
+        age_token(self.token, 3601)
+
+        res = self.client.post(TOKEN_URL, {"email": "user@example.com", "password": "test123!@#"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data["token"], self.token.key)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertIn("expires_at", res.data)
+
+    def test_login_keeps_valid_token(self):
+        res = self.client.post(TOKEN_URL, {"email": "user@example.com", "password": "test123!@#"})
+
+        self.assertEqual(res.data["token"], self.token.key)
+
+    @override_settings(AUTH_TOKEN_TTL=0)
+    def test_ttl_zero_never_expires(self):
+        age_token(self.token, 10 ** 8)
+
+        res = self.client.get(CAMPING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+@override_settings(AUTH_TOKEN_TTL=3600)
+class PurgeExpiredTokensCommandTests(TestCase):
+    """purge_expired_tokens command 테스트"""
+
+    def test_purges_only_expired_tokens_in_batches(self):
+        expired = []
+        for i in range(5):
+            token = Token.objects.create(user=create_user(email=f"old{i}@example.com"))
+            age_token(token, 7200)
+            expired.append(token.key)
+        fresh = Token.objects.create(user=create_user(email="fresh@example.com"))
+        out = StringIO()
+
+        call_command("purge_expired_tokens", batch_size=2, stdout=out)
+
+        self.assertEqual(list(Token.objects.values_list("key", flat=True)), [fresh.key])
+        self.assertFalse(TokenActivity.objects.filter(token_id__in=expired).exists())
+        self.assertIn("Deleted 5", out.getvalue())
+
+    def test_expired_tokens_query(self):
+        """last_seen 조건만으로 조회하고 token 테이블과 join하지 않음"""
+        sql = str(expired_tokens().query)
+
+        self.assertNotIn(" OR ", sql)
+        self.assertNotIn("JOIN", sql)
+
+
+class BackfillTokenActivityCommandTests(TestCase):
+    """backfill_token_activity command 테스트"""
+
+    def test_new_token_has_activity(self):
+        token = Token.objects.create(user=create_user())
+
+        self.assertEqual(TokenActivity.objects.get(token=token).last_seen, token.created)
+
+    @override_settings(AUTH_TOKEN_TTL=3600)
+    def test_backfill_legacy_tokens(self):
+        """activity가 없던 token은 발급 시각으로 채워져 purge 대상이 됨"""
+        legacy = Token.objects.create(user=create_user(email="legacy@example.com"))
+        issued = timezone.now() - timedelta(hours=2)
+        Token.objects.filter(pk=legacy.pk).update(created=issued)
+        TokenActivity.objects.filter(token=legacy).delete()
+        recent = Token.objects.create(user=create_user(email="recent@example.com"))
+        TokenActivity.objects.filter(token=recent).delete()
+        used = Token.objects.create(user=create_user(email="used@example.com"))
+        out = StringIO()
+
+        call_command("backfill_token_activity", batch_size=1, stdout=out)
+
+        self.assertIn("Created 2", out.getvalue())
+        self.assertEqual(TokenActivity.objects.get(token=legacy).last_seen, issued)
+        self.assertTrue(TokenActivity.objects.filter(token=used).exists())
+        call_command("purge_expired_tokens", stdout=StringIO())
+        self.assertEqual(sorted(Token.objects.values_list("key", flat=True)), sorted([recent.key, used.key]))
@@ -0,0 +1,82 @@
+"""
+Sliding expiry for authtoken tokens
+
+token은 마지막 사용 시각(TokenActivity.last_seen)으로부터 AUTH_TOKEN_TTL이 지나면 만료된다.
+last_seen은 AUTH_TOKEN_TOUCH_INTERVAL마다 최대 한번만 갱신하므로 요청마다 DB 쓰기가 생기지 않는다.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.models import TokenActivity
+
+
+def get_last_seen(token):
+    """activity가 없는 기존 token은 발급 시각을 마지막 사용 시각으로 본다"""
+    try:
+        return token.activity.last_seen
+    except ObjectDoesNotExist:
+        return token.created
+
+
+def get_ttl():
+    if settings.AUTH_TOKEN_TTL <= 0:
+        return None
+    return timedelta(seconds=settings.AUTH_TOKEN_TTL)
+
+
+def get_expires_at(token):
+    ttl = get_ttl()
+    if ttl is None:
+        return None
+    return get_last_seen(token) + ttl
+
+
+def is_expired(token, now=None):
+    expires_at = get_expires_at(token)
+    return expires_at is not None and expires_at <= (now or timezone.now())
+
+
+def touch(token, now=None, force=False):
+    """마지막 사용 시각이 AUTH_TOKEN_TOUCH_INTERVAL 이상 지났을 때만 갱신"""
+    now = now or timezone.now()
+    interval = timedelta(seconds=settings.AUTH_TOKEN_TOUCH_INTERVAL)
+    if not force and now - get_last_seen(token) < interval:
+        return
+
+    if not TokenActivity.objects.filter(token=token).update(last_seen=now):
+        try:
+            with transaction.atomic():
+                TokenActivity.objects.create(token=token, last_seen=now)
+        except IntegrityError:
+            # 다른 요청이 먼저 만든 경우
+            pass
+    token.activity = TokenActivity(token=token, last_seen=now)
+
+
+def get_or_rotate(user):
+    """user의 token 반환. 만료된 token은 삭제하고 새로 발급"""
+    token, created = Token.objects.select_related("activity").get_or_create(user=user)
+    if not created and is_expired(token):
+        token.delete()
+        token = Token.objects.create(user=user)
+    touch(token, force=True)
+    return token
+
+
+def expired_tokens(now=None):
+    """
+    만료된 token의 pk queryset (TokenActivity.last_seen index의 range 조회)
+
+    activity row는 token을 발급할 때 만들고(core.signals), 그 전에 발급된 token은
+    backfill_token_activity로 채우므로 activity가 없는 token은 따로 찾지 않는다.
+    """
+    ttl = get_ttl()
+    if ttl is None:
+        return TokenActivity.objects.none().values_list("token_id", flat=True)
+    cutoff = (now or timezone.now()) - ttl
+    return TokenActivity.objects.filter(last_seen__lte=cutoff).values_list("token_id", flat=True)
@@ -0,0 +1,20 @@
+"""
+Views for the core APIs
+"""
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics
+from core.authentication import CachedTokenAuthentication
+from core.db import pool
+
+
+class MetricsView(APIView):
+    """현재 process의 API counter와 DB pool 상태 조회 (관리자 전용)"""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({**metrics.snapshot(), **pool.stats()})
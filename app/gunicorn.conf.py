@@ -0,0 +1,51 @@
+"""
+Gunicorn configuration for production serving
+
+    gunicorn -c gunicorn.conf.py
+
+모든 값은 환경 변수로 조정할 수 있다.
+"""
+import multiprocessing
+import os
+
+
+def _env(name, default):
+    """docker-compose가 빈 문자열로 넘긴 값은 기본값 사용"""
+    return os.getenv(name) or default
+
+
+bind = _env("GUNICORN_BIND", "0.0.0.0:8000")
+wsgi_app = _env("GUNICORN_APP", "app.wsgi:application")
+
+# gthread: worker process마다 thread pool, DB I/O 대기 중에도 다른 요청 처리
+# ASGI로 serving하려면 GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker, GUNICORN_APP=app.asgi:application
+worker_class = _env("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(_env("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(_env("GUNICORN_THREADS", 4))
+
+# master에서 app을 한번 import한 뒤 fork (worker 기동이 빠르고 메모리 공유)
+preload_app = _env("GUNICORN_PRELOAD", "1") == "1"
+
+# 메모리 누수 대비 worker 재시작, 동시에 재시작하지 않도록 jitter
+max_requests = int(_env("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(_env("GUNICORN_MAX_REQUESTS_JITTER", 200))
+timeout = int(_env("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(_env("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(_env("GUNICORN_KEEPALIVE", 5))
+
+accesslog = _env("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """preload 중 열린 DB 연결을 worker끼리 공유하지 않도록 닫는다"""
+    from django.db import connections
+
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    """worker 종료 시 pool에 남은 DB connection을 닫는다"""
+    from core.db import pool
+
+    pool.close_all()
@@ -4,15 +4,20 @@ Serialzier for Recipe API
 
 from rest_framework import serializers
 
+from core import sharding
 from core.models import Recipe, RecipeTag
+from core.tags import add_tags, get_or_create_tags, sync_tags, update_tag
 from user.serializers import UserSerialzier
 
 
 class RecipeTagSerializer(serializers.ModelSerializer):
     class Meta:
         model = RecipeTag
-        fields = ["id", "name"]
-        read_only_fields = ["id"]
+        fields = ["id", "name", "usage_count"]
+        read_only_fields = ["id", "usage_count"]
+
+    def update(self, instance, validated_data):
+        return update_tag(instance, validated_data)
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -26,22 +31,27 @@ class RecipeSerializer(serializers.ModelSerializer):
 
     def _get_or_create_instance_tags(self, recipe_tags, instance=None):
         auth_user = self.context.get("request").user
-        for recipe_tag in recipe_tags:
-            tag_obj, is_created = RecipeTag.objects.get_or_create(user=auth_user, **recipe_tag)
-            if getattr(instance, "recipe_tags", False):
-                instance.recipe_tags.add(tag_obj)
+        tag_objs = get_or_create_tags(RecipeTag, auth_user, recipe_tags)
+        add_tags(Recipe.recipe_tags, [(instance, tag_objs.values())])
 
+    def _update_instance_tags(self, recipe_tags, instance):
+        auth_user = self.context.get("request").user
+        tag_objs = get_or_create_tags(RecipeTag, auth_user, recipe_tags)
+        sync_tags(Recipe.recipe_tags, [(instance, tag_objs.values())])
+
+    @sharding.atomic(Recipe)
     def create(self, validated_data):
         recipe_tags = validated_data.pop("recipe_tags", [])
         recipe = Recipe.objects.create(**validated_data)
         self._get_or_create_instance_tags(recipe_tags, recipe)
         return recipe
 
+    @sharding.atomic(Recipe)
     def update(self, instance, validated_data):
-        recipe_tags = validated_data.pop("recipe_tags", [])
+        # tag가 없는 PATCH는 tag를 건드리지 않고, tag가 없는 PUT은 모든 tag를 지운다
+        recipe_tags = validated_data.pop("recipe_tags", None if self.partial else [])
         if recipe_tags is not None:
-            instance.recipe_tags.clear()
-            self._get_or_create_instance_tags(recipe_tags, instance)
+            self._update_instance_tags(recipe_tags, instance)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
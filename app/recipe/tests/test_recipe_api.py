@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -214,6 +216,87 @@ class PrivateRecipeAPIsTest(TestCase):
         tag = RecipeTag.objects.get(user=self.user, name="Lunch")
         self.assertIn(tag, recipe.recipe_tags.all())
 
+    def test_create_recipe_query_count_independent_of_tags(self) -> None:
+        """tag 개수와 무관하게 Recipe 생성 쿼리 수 고정"""
+        RecipeTag.objects.create(user=self.user, name="existing")
+
+        def create_with_tags(count):
+            payload = dict(
+                title="sample title",
+                description="some description",
+                time_minutes=5,
+                price=10000,
+                recipe_tags=[dict(name="existing")] + [dict(name=f"tag{count}-{i}") for i in range(count)],
+            )
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RECIPE_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(res.data["recipe_tags"]), count + 1)
+            return len(queries)
+
+        self.assertEqual(create_with_tags(2), create_with_tags(20))
+
+    def test_partial_update_without_tags_keeps_tags(self) -> None:
+        """tag 없이 PATCH하면 기존 tag 유지"""
+        tag = RecipeTag.objects.create(user=self.user, name="Dessert")
+        recipe = create_recipe(user=self.user)
+        recipe.recipe_tags.add(tag)
+
+        res = self.client.patch(detail_url(recipe.id), {"title": "new title"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(recipe.recipe_tags.all()), [tag])
+
+    def test_full_update_without_tags_clears_tags(self) -> None:
+        """tag 없이 PUT하면 기존 tag 삭제"""
+        tag = RecipeTag.objects.create(user=self.user, name="Dessert")
+        recipe = create_recipe(user=self.user)
+        recipe.recipe_tags.add(tag)
+        payload = dict(title="new title", description="new description", time_minutes=15, price=20000)
+
+        res = self.client.put(detail_url(recipe.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(recipe.recipe_tags.all()), [])
+
+    def test_update_tags_replaces_only_changed(self) -> None:
+        """tag 업데이트 시 바뀐 tag만 반영"""
+        keep = RecipeTag.objects.create(user=self.user, name="keep")
+        drop = RecipeTag.objects.create(user=self.user, name="drop")
+        recipe = create_recipe(user=self.user)
+        recipe.recipe_tags.add(keep, drop)
+        keep_row = Recipe.recipe_tags.through.objects.get(recipe=recipe, recipetag=keep)
+
+        payload = {"recipe_tags": [{"name": "keep"}, {"name": "new"}]}
+        res = self.client.patch(detail_url(recipe.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(tag.name for tag in recipe.recipe_tags.all()), ["keep", "new"])
+        self.assertTrue(Recipe.recipe_tags.through.objects.filter(pk=keep_row.pk).exists())
+
+    def test_bulk_create_and_update(self) -> None:
+        """bulk API로 레서피 생성/수정"""
+        recipe = create_recipe(self.user)
+        payload = [
+            dict(op="create", data=dict(
+                title="bulk title",
+                description="some description",
+                time_minutes=5,
+                price=10000,
+                recipe_tags=[dict(name="tag1")],
+            )),
+            dict(op="update", id=recipe.id, data=dict(price=1, recipe_tags=[dict(name="tag1")])),
+        ]
+
+        res = self.client.post(reverse("recipe:recipe-bulk"), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["status"] for result in res.data["results"]], [201, 200])
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.price, 1)
+        self.assertEqual(RecipeTag.objects.filter(user=self.user, name="tag1").count(), 1)
+        self.assertEqual(Recipe.recipe_tags.through.objects.filter(recipetag__name="tag1").count(), 2)
+
     def test_full_update_recipe_with_tag(self) -> None:
         """tag를 포함하여 생성된 Recipe 전체 업데이트"""
         pass
@@ -231,3 +314,43 @@ class PrivateRecipeAPIsTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(recipe.recipe_tags.count(), 0)
+
+    def test_list_query_count_independent_of_rows(self) -> None:
+        """레서피 개수와 무관하게 리스트 조회 쿼리 수 고정"""
+        for i in range(5):
+            recipe = create_recipe(self.user, title=f"title{i}")
+            recipe.recipe_tags.add(RecipeTag.objects.create(user=self.user, name=f"tag{i}"))
+
+        # validator(MAX(update_dt)) + page(user join) + tag prefetch
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 5)
+        self.assertEqual(res.data["results"][0]["user"]["email"], self.user.email)
+
+    def test_detail_query_count(self) -> None:
+        """레서피 상세 조회는 user join + tag prefetch 2번"""
+        recipe = create_recipe(self.user)
+        for i in range(3):
+            recipe.recipe_tags.add(RecipeTag.objects.create(user=self.user, name=f"tag{i}"))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["recipe_tags"]), 3)
+
+    def test_list_paginated_by_cursor(self) -> None:
+        """cursor pagination으로 전체 레서피 순회"""
+        for i in range(5):
+            create_recipe(self.user, title=f"title{i}")
+        expected = list(Recipe.objects.filter(user=self.user).order_by("-update_dt", "-id").values_list("id", flat=True))
+
+        first = self.client.get(RECIPE_URL, {"page_size": 3})
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertIsNone(second.data["next"])
+        ids = [item["id"] for item in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, expected)
@@ -1,19 +1,55 @@
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from core.authentication import CachedTokenAuthentication
+from core.mixins import (
+    BulkOperationsMixin,
+    CachedListMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    FastListMixin,
+    ImportMixin,
+    OrderingMixin,
+    RangeFilterMixin,
+    SearchMixin,
+    ShardedViewSetMixin,
+    SparseFieldsMixin,
+    TagAutocompleteMixin,
+    TagFilterMixin,
+)
 from core.models import Recipe, RecipeTag
+from core.pagination import KeysetPagination
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer, RecipeTagSerializer
 
 
-class RecipeViewSet(ModelViewSet):
+class RecipeViewSet(
+    ShardedViewSetMixin,
+    SparseFieldsMixin,
+    SearchMixin,
+    TagFilterMixin,
+    RangeFilterMixin,
+    OrderingMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    FastListMixin,
+    ExportMixin,
+    ImportMixin,
+    BulkOperationsMixin,
+    ModelViewSet,
+):
     serializer_class = RecipeDetailSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    bulk_tag_field = "recipe_tags"
+    tag_filter_field = "recipe_tags"
+    range_filter_fields = ("time_minutes", "price")
+    ordering_fields = ("update_dt", "time_minutes", "price")
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        """user는 join, tag는 prefetch하여 row 수와 무관하게 쿼리 수 고정"""
+        return self.queryset.filter(user=self.request.user).select_related("user").prefetch_related("recipe_tags")
 
     def get_serializer_class(self):
         """Return the serializer class for the request"""
@@ -26,10 +62,10 @@ class RecipeViewSet(ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TagViewSet(ModelViewSet):
+class TagViewSet(ShardedViewSetMixin, TagAutocompleteMixin, CachedListMixin, ModelViewSet):
     serializer_class = RecipeTagSerializer
     queryset = RecipeTag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
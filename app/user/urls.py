@@ -1,6 +1,6 @@
 from django.urls import path
 
-from user.views import CreateUserView, CreateTokenView, ManageUserView
+from user.views import CreateUserView, CreateTokenView, LogoutView, ManageUserView
 
 app_name = "user"
 
@@ -8,4 +8,5 @@ urlpatterns = [
     path("create/", CreateUserView.as_view(), name="create"),
     path("token/", CreateTokenView.as_view(), name="token"),
     path("me/", ManageUserView.as_view(), name="me"),
+    path("logout/", LogoutView.as_view(), name="logout"),
 ]
@@ -1,12 +1,16 @@
 """
 View for the user API
 """
-from rest_framework.authentication import TokenAuthentication
+from rest_framework import status
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from core import tokens
+from core.authentication import CachedTokenAuthentication, token_cache
 from user.serializers import UserSerialzier, UserAuthTokenSerializer
 
 
@@ -22,8 +26,32 @@ class CreateTokenView(ObtainAuthToken):
     serializer_class = UserAuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
+    def post(self, request, *args, **kwargs):
+        """유효한 token은 만료 시각을 연장하고, 만료된 token은 새로 발급"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = tokens.get_or_rotate(serializer.validated_data["user"])
+        # 다시 로그인하면 이전에 cache된 user 정보를 버림
+        token_cache.invalidate(token.key)
+        return Response({"token": token.key, "expires_at": tokens.get_expires_at(token)})
+
+
+class LogoutView(APIView):
+    """token 삭제"""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
 class ManageUserView(RetrieveUpdateAPIView):
     serializer_class = UserSerialzier
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        """인증된 user 반환"""
+        return self.request.user
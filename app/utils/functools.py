@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 
-from core.models import RecipeTag
+from core.models import Camping, Recipe, RecipeTag
 
 
 def create_user(email="user@example.com", password="test123!@#", name="user"):
@@ -17,3 +17,25 @@ def create_recipe_tag(user, name="tag1"):
         name=name,
     )
     return RecipeTag.objects.create(user=user, **kwargs)
+
+
+def create_camping(user, **params):
+    defaults = dict(
+        title="DeepForest",
+        visited_dt="2022-12-03",
+        review="Some review",
+        price=50000,
+    )
+    defaults.update(params)
+    return Camping.objects.create(user=user, **defaults)
+
+
+def create_recipe(user, **params):
+    defaults = dict(
+        title="Soup",
+        description="Long description",
+        time_minutes=5,
+        price=1000,
+    )
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
@@ -8,6 +8,11 @@ elif [[ $1 == "test" ]]; then
   docker-compose run --rm app sh -c "python manage.py test"
 elif [[ $1 == "reset" ]]; then
   docker-compose down && docker-compose up -d --build --force-recreate
+elif [[ $1 == "migrate" ]]; then
+  docker-compose run --rm app sh -c "python manage.py makemigrations && python manage.py migrate"
+elif [[ $1 == "load" ]]; then
+  shift
+  docker-compose run --rm app sh -c "python -m benchmarks.load $*"
 else
-  echo "argument: restart, test"
+  echo "argument: restart, test, reset, migrate, load"
 fi
\ No newline at end of file
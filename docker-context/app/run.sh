@@ -13,9 +13,26 @@ while ! nc $DB_HOST $DB_PORT; do
   sleep 1
 done
 
+# SERVER_MODE=dev (default): runserver, 기동할 때마다 migration
+# SERVER_MODE=prod: gunicorn, migration은 `./cmd.sh migrate`로 따로 실행 (RUN_MIGRATIONS=1이면 기동 시 실행)
+SERVER_MODE=${SERVER_MODE:-dev}
+if [ "$SERVER_MODE" = "prod" ]; then
+    RUN_MIGRATIONS=${RUN_MIGRATIONS:-0}
+else
+    RUN_MIGRATIONS=${RUN_MIGRATIONS:-1}
+fi
+
 # Apply database migrations
-python manage.py makemigrations
-python manage.py migrate
+if [ "$RUN_MIGRATIONS" = "1" ]; then
+    python manage.py makemigrations
+    python manage.py migrate
+    python manage.py ensure_fulltext_indexes
+    python manage.py backfill_token_activity
+fi
 
 # run server
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+if [ "$SERVER_MODE" = "prod" ]; then
+    exec gunicorn -c gunicorn.conf.py
+else
+    python manage.py runserver 0.0.0.0:8000
+fi